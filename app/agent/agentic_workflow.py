@@ -1,6 +1,14 @@
 
+import asyncio
+import time
+from contextlib import nullcontext
+from typing import Dict, List, Optional
 from ..utils.model_loader import ModelLoader
 from ..prompt_library.prompt import SYSTEM_PROMPT
+from ..utils.prompt_cache import ContextCache, PromptCacheStats
+from .history_trimmer import HistoryTrimmer
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, MessagesState, END, START
 from langgraph.prebuilt import ToolNode, tools_condition
 from ..tools.weather_info_tool import WeatherInfoTool
@@ -8,6 +16,11 @@ from ..tools.place_search_tool import PlaceSearchTool
 from ..tools.expense_calculator_tool import CalculatorTool
 from ..tools.currency_conversion_tool import CurrencyConverterTool
 
+class AgentState(MessagesState):
+    # Tokens the last agent step cut from its model input. The trimmed messages themselves
+    # are never stored in state, so checkpointed sessions only keep the full history once.
+    tokens_saved: int
+
 class GraphBuilder():
     def __init__(self,model_provider: str = "google"):
         self.model_loader = ModelLoader(model_provider=model_provider)
@@ -30,38 +43,122 @@ class GraphBuilder():
         self.graph = None
         
         self.system_prompt = SYSTEM_PROMPT
+        
+        # The system prompt and tool schemas are sent first and never change, so providers
+        # with implicit prefix caching can reuse them; Gemini can also cache them explicitly.
+        prompt_cache_config = self.model_loader.config.config.get("prompt_cache", {})
+        self.prompt_cache_stats = PromptCacheStats()
+        self.context_cache = None
+        if prompt_cache_config.get("explicit", False) and self.model_loader.supports_context_cache(self.llm):
+            self.context_cache = ContextCache(
+                self.model_loader, self.llm, self.system_prompt, self.tools,
+                ttl_seconds=prompt_cache_config.get("ttl_seconds", 3600)
+            )
+        
+        history_config = self.model_loader.config.config.get("history", {})
+        self.history_trimmer = HistoryTrimmer(
+            max_tokens=history_config.get("max_tokens", 8000),
+            tool_output_keep_chars=history_config.get("tool_output_keep_chars", 300)
+        )
     
     
-    def agent_function(self,state: MessagesState):
+    def _fallback_response(self, e: Exception) -> AIMessage:
+        """Turn an LLM/API error into a polite assistant message"""
+        # Handle rate limits and other API errors gracefully
+        error_message = f"I apologize, but I'm experiencing some technical difficulties: {str(e)}"
+        if "rate limit" in str(e).lower():
+            error_message = "I'm currently experiencing high demand. Please try again in a few moments."
+        elif "api" in str(e).lower():
+            error_message = "I'm having trouble connecting to my services. Please try again later."
+
+        # Create a simple text response when tools fail
+        return AIMessage(content=error_message)
+
+    def _model_input(self, messages, cached_llm=None):
+        """Pick the model and input: with a context cache the static prefix is already on the provider"""
+        if cached_llm is not None:
+            return cached_llm, list(messages)
+        return self.llm_with_tools, [self.system_prompt] + messages
+
+    def agent_function(self,state: AgentState):
         """Main agent function with error handling"""
-        user_question = state["messages"]
-        input_question = [self.system_prompt] + user_question
+        # Fit the conversation into the token budget for this call only; state keeps the full history
+        user_question, tokens_saved = self.history_trimmer.trim(state["messages"])
+        cached_llm = self.context_cache.get_llm() if self.context_cache else None
+        llm, input_question = self._model_input(user_question, cached_llm)
         
         try:
-            response = self.llm_with_tools.invoke(input_question)
-            return {"messages": [response]}
+            response = llm.invoke(input_question)
+            self.prompt_cache_stats.record(response)
+            return {"messages": [response], "tokens_saved": tokens_saved}
+        except Exception as e:
+            return {"messages": [self._fallback_response(e)], "tokens_saved": tokens_saved}
+
+    async def aagent_function(self, state: AgentState):
+        """Async agent function used when the graph runs via ainvoke/astream"""
+        user_question, tokens_saved = self.history_trimmer.trim(state["messages"])
+        cached_llm = await self.context_cache.aget_llm() if self.context_cache else None
+        llm, input_question = self._model_input(user_question, cached_llm)
+
+        try:
+            response = await llm.ainvoke(input_question)
+            self.prompt_cache_stats.record(response)
+            return {"messages": [response], "tokens_saved": tokens_saved}
         except Exception as e:
-            # Handle rate limits and other API errors gracefully
-            error_message = f"I apologize, but I'm experiencing some technical difficulties: {str(e)}"
-            if "rate limit" in str(e).lower():
-                error_message = "I'm currently experiencing high demand. Please try again in a few moments."
-            elif "api" in str(e).lower():
-                error_message = "I'm having trouble connecting to my services. Please try again later."
-            
-            # Create a simple text response when tools fail
-            from langchain_core.messages import AIMessage
-            fallback_response = AIMessage(content=error_message)
-            return {"messages": [fallback_response]}
-    def build_graph(self):
-        graph_builder=StateGraph(MessagesState)
-        graph_builder.add_node("agent", self.agent_function)
+            return {"messages": [self._fallback_response(e)], "tokens_saved": tokens_saved}
+
+    def build_graph(self, checkpointer=None):
+        graph_builder=StateGraph(AgentState)
+        # Sync invoke uses agent_function, ainvoke/astream use aagent_function
+        graph_builder.add_node("agent", RunnableLambda(self.agent_function, afunc=self.aagent_function))
         graph_builder.add_node("tools", ToolNode(tools=self.tools))
         graph_builder.add_edge(START,"agent")
         graph_builder.add_conditional_edges("agent",tools_condition)
         graph_builder.add_edge("tools","agent")
         graph_builder.add_edge("agent",END)
-        self.graph = graph_builder.compile()
-        return self.graph
+        compiled_graph = graph_builder.compile(checkpointer=checkpointer)
+        if checkpointer is None:
+            self.graph = compiled_graph
+        return compiled_graph
         
-    def __call__(self):
-        return self.build_graph()
+    async def abatch_conversations(self, conversations: List[List[Dict]], max_concurrency: int = 4,
+                                   item_timeout: Optional[float] = None, admission=None) -> List[Dict]:
+        """Run many independent conversations through the compiled graph with bounded concurrency.
+
+        Results come back in input order; a failing or timed-out conversation yields an
+        error entry instead of failing the whole batch. With an AdmissionController each
+        conversation holds its own run slot, so batches count against max_in_flight
+        exactly like single queries.
+        """
+        graph = self.graph or self.build_graph()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        batch_start = time.perf_counter()
+
+        async def run_one(index: int, messages: List[Dict]) -> Dict:
+            async with semaphore:
+                start = time.perf_counter()
+                result = {"index": index, "answer": None, "error": None,
+                          "queued_ms": round((start - batch_start) * 1000, 1)}
+                try:
+                    async with admission.slot() if admission is not None else nullcontext(0.0) as wait_seconds:
+                        # Time spent waiting for an admission slot is queueing, not run time
+                        result["queued_ms"] = round(result["queued_ms"] + wait_seconds * 1000, 1)
+                        start = time.perf_counter()
+                        output = await asyncio.wait_for(graph.ainvoke({"messages": messages}), timeout=item_timeout)
+                    result["answer"] = output["messages"][-1].content
+                except asyncio.TimeoutError:
+                    result["error"] = f"Timed out after {item_timeout}s"
+                except Exception as e:
+                    result["error"] = str(e)
+                result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+                return result
+
+        return list(await asyncio.gather(*(run_one(i, messages) for i, messages in enumerate(conversations))))
+
+    def batch_conversations(self, conversations: List[List[Dict]], max_concurrency: int = 4,
+                            item_timeout: Optional[float] = None, admission=None) -> List[Dict]:
+        """Blocking wrapper around abatch_conversations for scripts and offline jobs"""
+        return asyncio.run(self.abatch_conversations(conversations, max_concurrency, item_timeout, admission))
+
+    def __call__(self, checkpointer=None):
+        return self.build_graph(checkpointer=checkpointer)
@@ -0,0 +1,102 @@
+import threading
+from typing import Dict, Iterable, List, Optional
+from .agentic_workflow import GraphBuilder
+from ..logger.logging import logger
+
+class GraphRegistry:
+    """Process-wide registry of compiled agent graphs, one per model provider.
+
+    Building a graph loads the config, creates the LLM client, sets up the tool
+    wrappers, binds the tool schemas and compiles the StateGraph. The registry
+    does that once per provider and hands the same compiled graph to every
+    request; compiled graphs keep no per-run state and can be invoked concurrently.
+    """
+
+    def __init__(self, default_provider: str = "google"):
+        self.default_provider = default_provider
+        self._builders: Dict[str, GraphBuilder] = {}
+        self._graphs: Dict[str, object] = {}
+        self._session_graphs: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self.checkpointer = None
+
+    def get(self, provider: Optional[str] = None):
+        """Return the compiled graph for a provider, building it on first use"""
+        provider = provider or self.default_provider
+        graph = self._graphs.get(provider)
+        if graph is not None:
+            return graph
+
+        with self._lock:
+            # Another thread may have finished building while we waited
+            graph = self._graphs.get(provider)
+            if graph is None:
+                logger.info(f"Building agent graph for provider: {provider}")
+                builder = GraphBuilder(model_provider=provider)
+                graph = builder()
+                self._builders[provider] = builder
+                self._graphs[provider] = graph
+        return graph
+
+    def attach_checkpointer(self, checkpointer) -> None:
+        """Set the checkpointer used by session graphs; previously compiled session graphs are dropped"""
+        with self._lock:
+            self.checkpointer = checkpointer
+            self._session_graphs.clear()
+
+    def get_session_graph(self, provider: Optional[str] = None):
+        """Return the checkpointer-backed graph for a provider, compiled from the shared builder"""
+        if self.checkpointer is None:
+            raise RuntimeError("No checkpointer attached; sessions are not enabled")
+        provider = provider or self.default_provider
+        graph = self._session_graphs.get(provider)
+        if graph is not None:
+            return graph
+
+        builder = self.get_builder(provider)
+        with self._lock:
+            graph = self._session_graphs.get(provider)
+            if graph is None:
+                graph = builder(checkpointer=self.checkpointer)
+                self._session_graphs[provider] = graph
+        return graph
+
+    def peek_session_graph(self, provider: Optional[str] = None):
+        """Return the session graph for a provider if it is already built, else None"""
+        return self._session_graphs.get(provider or self.default_provider)
+
+    def peek(self, provider: Optional[str] = None):
+        """Return the compiled graph for a provider if it is already built, else None"""
+        return self._graphs.get(provider or self.default_provider)
+
+    def get_builder(self, provider: Optional[str] = None) -> GraphBuilder:
+        """Return the GraphBuilder that owns the compiled graph for a provider"""
+        provider = provider or self.default_provider
+        self.get(provider)
+        return self._builders[provider]
+
+    def warm_up(self, providers: Optional[Iterable[str]] = None) -> List[str]:
+        """Build graphs ahead of traffic; failures are logged and retried lazily on first request"""
+        warmed = []
+        for provider in providers or [self.default_provider]:
+            try:
+                self.get(provider)
+                warmed.append(provider)
+            except Exception as e:
+                logger.warning(f"Could not warm up graph for provider {provider}: {e}")
+        return warmed
+
+    def builders(self) -> Dict[str, GraphBuilder]:
+        """Snapshot of the builders for providers that have been built"""
+        return dict(self._builders)
+
+    def providers(self) -> List[str]:
+        """Providers that currently have a compiled graph"""
+        return list(self._graphs)
+
+    def clear(self) -> None:
+        """Drop all compiled graphs so the next request rebuilds them"""
+        with self._lock:
+            self._builders.clear()
+            self._graphs.clear()
+            self._session_graphs.clear()
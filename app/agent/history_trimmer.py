@@ -0,0 +1,71 @@
+import threading
+from typing import Dict, List, Tuple
+from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from ..logger.logging import logger
+
+class HistoryTrimmer:
+    """Keeps the model input within a token budget before every agent step.
+
+    The latest exchange (last user message and everything after it) is always sent
+    verbatim. When the input is over budget, bulky tool outputs from earlier turns
+    are cut down to a short excerpt first, then the oldest whole turns are dropped.
+    Inputs already within budget are passed through untouched so the prompt prefix
+    stays stable for provider-side caching.
+    """
+
+    def __init__(self, max_tokens: int = 8000, tool_output_keep_chars: int = 300):
+        self.max_tokens = max_tokens
+        self.tool_output_keep_chars = tool_output_keep_chars
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.trimmed_runs = 0
+        self.tokens_saved = 0
+
+    def _elide_tool_output(self, message: ToolMessage) -> ToolMessage:
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        if len(content) <= self.tool_output_keep_chars:
+            return message
+        elided = len(content) - self.tool_output_keep_chars
+        return message.model_copy(update={
+            "content": f"{content[:self.tool_output_keep_chars]}\n[... {elided} characters of earlier tool output elided]"
+        })
+
+    def trim(self, messages: List[BaseMessage]) -> Tuple[List[BaseMessage], int]:
+        """Return (messages to send to the model, tokens saved)"""
+        tokens_before = count_tokens_approximately(messages)
+        if tokens_before <= self.max_tokens:
+            self._record(0)
+            return messages, 0
+
+        # Start of the most recent exchange, which is kept verbatim
+        recent_start = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=0)
+        older = [self._elide_tool_output(m) if isinstance(m, ToolMessage) else m for m in messages[:recent_start]]
+        recent = messages[recent_start:]
+
+        # Drop the oldest turns whole (up to the next user message) so tool calls keep their results
+        budget = self.max_tokens - count_tokens_approximately(recent)
+        while older and count_tokens_approximately(older) > budget:
+            next_turn = next((i for i, m in enumerate(older) if i > 0 and isinstance(m, HumanMessage)), len(older))
+            older = older[next_turn:]
+
+        trimmed = older + recent
+        tokens_saved = tokens_before - count_tokens_approximately(trimmed)
+        self._record(tokens_saved)
+        logger.info(f"Trimmed model input from {tokens_before} tokens, saved {tokens_saved}")
+        return trimmed, tokens_saved
+
+    def _record(self, tokens_saved: int) -> None:
+        with self._lock:
+            self.runs += 1
+            if tokens_saved:
+                self.trimmed_runs += 1
+                self.tokens_saved += tokens_saved
+
+    def stats(self) -> Dict:
+        return {
+            "max_tokens": self.max_tokens,
+            "runs": self.runs,
+            "trimmed_runs": self.trimmed_runs,
+            "tokens_saved": self.tokens_saved,
+        }
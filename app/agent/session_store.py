@@ -0,0 +1,183 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from langgraph.checkpoint.memory import InMemorySaver
+from ..logger.logging import logger
+
+@asynccontextmanager
+async def open_checkpointer(session_config: Dict) -> AsyncIterator[object]:
+    """Open the LangGraph checkpointer configured under `sessions` in config.yaml"""
+    backend = session_config.get("backend", "sqlite")
+    if backend == "sqlite":
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        sqlite_path = session_config.get("sqlite_path", ".sessions/checkpoints.sqlite")
+        if os.path.dirname(sqlite_path):
+            os.makedirs(os.path.dirname(sqlite_path), exist_ok=True)
+        async with AsyncSqliteSaver.from_conn_string(sqlite_path) as checkpointer:
+            await checkpointer.setup()
+            yield checkpointer
+    elif backend == "memory":
+        yield InMemorySaver()
+    else:
+        raise ValueError(f"Unsupported session backend: {backend}")
+
+class SessionStore:
+    """Server-side conversation sessions kept in a LangGraph checkpointer.
+
+    Each session is a checkpointer thread. The store remembers when every thread
+    was last used and deletes threads that exceed the TTL or push the session
+    count over max_sessions (least recently used first), so storage stays bounded.
+    With several worker processes sharing one SQLite file, each worker tracks the
+    sessions it has seen and checks the latest checkpoint timestamp before treating
+    a session as unknown, expired or least recently used.
+    """
+
+    def __init__(self, checkpointer, ttl_seconds: float = 3600, max_sessions: int = 1000):
+        self.checkpointer = checkpointer
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._last_used: "OrderedDict[str, float]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.evicted = 0
+
+    async def load_existing(self) -> int:
+        """Track threads left in a persistent checkpointer by a previous process"""
+        conn = getattr(self.checkpointer, "conn", None)
+        if conn is None:
+            return 0
+        async with conn.execute("SELECT DISTINCT thread_id FROM checkpoints") as cursor:
+            rows = await cursor.fetchall()
+        # Seed from each thread's latest checkpoint so LRU order and TTL reflect real activity
+        for (thread_id,) in rows:
+            last_active = await self._last_checkpoint_time(thread_id)
+            if last_active is not None:
+                self._last_used[thread_id] = max(self._last_used.get(thread_id, 0), last_active)
+        self._sort_by_last_used()
+        await self._evict_overflow()
+        return len(rows)
+
+    def new_session(self) -> str:
+        """Create a new session id and start tracking it"""
+        session_id = uuid.uuid4().hex
+        self._last_used[session_id] = time.time()
+        return session_id
+
+    async def exists(self, session_id: str) -> bool:
+        """Whether a session is live, consulting the shared checkpointer for sessions other workers served"""
+        last_used = self._last_used.get(session_id)
+        if last_used is not None and time.time() - last_used <= self.ttl_seconds:
+            return True
+        last_active = await self._last_checkpoint_time(session_id)
+        if last_active is not None and time.time() - last_active <= self.ttl_seconds:
+            self._last_used[session_id] = last_active
+            self._sort_by_last_used()
+            return True
+        return False
+
+    async def _last_checkpoint_time(self, session_id: str) -> Optional[float]:
+        checkpoint_tuple = await self.checkpointer.aget_tuple(self.config(session_id))
+        if checkpoint_tuple is None:
+            return None
+        return datetime.fromisoformat(checkpoint_tuple.checkpoint["ts"]).timestamp()
+
+    def config(self, session_id: str) -> Dict:
+        """Graph run config that points the checkpointer at the session's thread"""
+        return {"configurable": {"thread_id": session_id}}
+
+    @asynccontextmanager
+    async def use(self, session_id: str) -> AsyncIterator[Dict]:
+        """Serialize runs on one session and refresh its LRU position; yields the run config"""
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            self._touch(session_id)
+            yield self.config(session_id)
+            self._touch(session_id)
+        await self._evict_overflow()
+
+    def _sort_by_last_used(self) -> None:
+        self._last_used = OrderedDict(sorted(self._last_used.items(), key=lambda item: item[1]))
+
+    def _touch(self, session_id: str) -> None:
+        self._last_used[session_id] = time.time()
+        self._last_used.move_to_end(session_id)
+
+    async def delete(self, session_id: str) -> bool:
+        """Delete a session and its checkpoints, including sessions only another worker served"""
+        if session_id not in self._last_used and await self._last_checkpoint_time(session_id) is None:
+            return False
+        await self._delete(session_id)
+        return True
+
+    async def _delete(self, session_id: str) -> None:
+        self._last_used.pop(session_id, None)
+        lock = self._locks.get(session_id)
+        if lock is None or not lock.locked():
+            self._locks.pop(session_id, None)
+        await self.checkpointer.adelete_thread(session_id)
+
+    async def _evict_overflow(self) -> None:
+        refreshed = set()
+        evicted = 0
+        while len(self._last_used) > self.max_sessions:
+            # Oldest first, skipping sessions with a run in progress
+            victim = next((session_id for session_id in self._last_used if not self._is_busy(session_id)), None)
+            if victim is None:
+                break
+            if victim not in refreshed:
+                # Another worker may have used the session since this one last saw it
+                refreshed.add(victim)
+                last_active = await self._last_checkpoint_time(victim)
+                if last_active is not None and last_active > self._last_used[victim]:
+                    self._last_used[victim] = last_active
+                    self._sort_by_last_used()
+                    continue
+            await self._delete(victim)
+            evicted += 1
+        self.evicted += evicted
+
+    async def sweep(self) -> List[str]:
+        """Delete every session idle for longer than the TTL"""
+        cutoff = time.time() - self.ttl_seconds
+        candidates = [session_id for session_id, last_used in self._last_used.items()
+                      if last_used < cutoff and not self._is_busy(session_id)]
+        expired = []
+        for session_id in candidates:
+            # Another worker may have used the session since this one last saw it
+            last_active = await self._last_checkpoint_time(session_id)
+            if last_active is not None and last_active >= cutoff:
+                self._last_used[session_id] = last_active
+                continue
+            await self._delete(session_id)
+            expired.append(session_id)
+        self._sort_by_last_used()
+        self.evicted += len(expired)
+        if expired:
+            logger.info(f"Evicted {len(expired)} expired sessions")
+        return expired
+
+    def _is_busy(self, session_id: str) -> bool:
+        lock = self._locks.get(session_id)
+        return lock is not None and lock.locked()
+
+    async def run_sweeper(self, interval_seconds: float) -> None:
+        """Background loop that sweeps expired sessions until cancelled"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.warning(f"Session sweep failed: {e}")
+
+    def stats(self) -> Dict:
+        return {
+            "active_sessions": len(self._last_used),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "evicted": self.evicted,
+        }
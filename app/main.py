@@ -1,19 +1,143 @@
 
-from fastapi import FastAPI
-from pydantic import BaseModel
-from .agent.agentic_workflow import GraphBuilder
-from fastapi.responses import JSONResponse
-import os
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Literal, Optional
+from fastapi import FastAPI, HTTPException, Request, Response
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+from .agent.graph_registry import GraphRegistry
+from .agent.session_store import SessionStore, open_checkpointer
+from .utils.config_loader import load_config
+from .utils.graph_image_cache import GraphImageCache
+from .utils.cache import shared_cache_stats
+from .utils.rate_limiter import rate_limiter_stats
+from .utils.single_flight import single_flight_stats
+from .utils.refresher import refresher_stats
+from .utils.http_client import aclose_async_client, get_http_client
+from .utils.admission_control import AdmissionController, AdmissionRejected
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from .logger.logging import log_endpoint, logger
 
 
-app = FastAPI()
+config = load_config()
+api_config = config.get("api", {})
+graph_registry = GraphRegistry(default_provider=api_config.get("default_provider", "google"))
+graph_image_cache = GraphImageCache(cache_dir=config.get("graph_image", {}).get("cache_dir"))
+
+admission_config = config.get("admission", {})
+admission = AdmissionController(
+    max_in_flight=admission_config.get("max_in_flight", 8),
+    max_queue=admission_config.get("max_queue", 32),
+    queue_timeout=admission_config.get("queue_timeout_seconds", 30),
+    retry_after=admission_config.get("retry_after_seconds", 5),
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the configured provider graphs once, before the first request arrives
+    warm_providers = api_config.get("warm_providers", [graph_registry.default_provider])
+    warmed = await run_in_threadpool(graph_registry.warm_up, warm_providers)
+    logger.info(f"Agent graphs ready for providers: {warmed}")
+    app.state.graph_registry = graph_registry
+
+    # Server-side sessions: graph state lives in a local checkpointer keyed by thread_id
+    session_config = config.get("sessions", {})
+    async with open_checkpointer(session_config) as checkpointer:
+        session_store = SessionStore(
+            checkpointer,
+            ttl_seconds=session_config.get("ttl_seconds", 3600),
+            max_sessions=session_config.get("max_sessions", 1000),
+        )
+        await session_store.load_existing()
+        graph_registry.attach_checkpointer(checkpointer)
+        app.state.session_store = session_store
+        sweeper = asyncio.create_task(session_store.run_sweeper(session_config.get("sweep_interval_seconds", 60)))
+        try:
+            yield
+        finally:
+            sweeper.cancel()
+            await aclose_async_client()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    logger.warning(f"Rejected {request.url.path}: {exc.detail} (queue depth {admission.queue_depth})")
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def admitted_stream(stream: AsyncIterator[str]) -> tuple:
+    """Acquire a run slot for a streaming response; returns (body iterator, background release)"""
+    await admission.acquire()
+    start = time.monotonic()
+    released = False
+
+    def release():
+        nonlocal released
+        if not released:
+            released = True
+            admission.release(time.monotonic() - start)
+
+    async def body():
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            release()
+
+    # The background task frees the slot if the body is never iterated (client gone before headers)
+    return body(), BackgroundTask(release)
+
+
+async def get_graph(provider: Optional[str] = None):
+    """Return the shared compiled graph, building it off the event loop if it is not warm yet"""
+    graph = graph_registry.peek(provider)
+    if graph is None:
+        graph = await run_in_threadpool(graph_registry.get, provider)
+    return graph
+
+
+async def get_session_graph(provider: Optional[str] = None):
+    """Return the checkpointer-backed graph used by session endpoints"""
+    graph = graph_registry.peek_session_graph(provider)
+    if graph is None:
+        graph = await run_in_threadpool(graph_registry.get_session_graph, provider)
+    return graph
+
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
 
+# Runtime counters: admission queue, sessions
+@app.get("/metrics")
+async def metrics(request: Request):
+    session_store = getattr(request.app.state, "session_store", None)
+    return {
+        "admission": admission.stats(),
+        "sessions": session_store.stats() if session_store else None,
+        "prompt_cache": {provider: builder.prompt_cache_stats.stats()
+                         for provider, builder in graph_registry.builders().items()},
+        "history": {provider: builder.history_trimmer.stats()
+                    for provider, builder in graph_registry.builders().items()},
+        "caches": shared_cache_stats(),
+        "rate_limits": rate_limiter_stats(),
+        "upstreams": get_http_client().stats(),
+        "coalescing": single_flight_stats(),
+        "refresh": refresher_stats(),
+    }
+
 # Default endpoint to show available endpoints
 @app.get("/")
 async def root():
@@ -21,12 +145,28 @@ async def root():
         "endpoints": [
             "/health",
             "/query",
+            "/query/stream",
+            "/query/batch",
+            "/session/query",
+            "/session/query/stream",
+            "/graph",
+            "/metrics",
             "/"
         ],
         "message": "Welcome to the Wand Agent API. See /docs for OpenAPI documentation."
     }
 
-from typing import List, Literal, Optional
+# Mermaid rendering of the agent graph, rendered once per topology and served with an ETag
+@app.get("/graph")
+async def graph_image(request: Request, provider: Optional[Literal["google", "groq", "openai"]] = None):
+    react_app = await get_graph(provider)
+    topology_key, png_graph = await run_in_threadpool(graph_image_cache.get_png, react_app)
+
+    etag = f'"{topology_key}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=png_graph, media_type="image/png", headers=headers)
 
 class Message(BaseModel):
     role: Literal["user", "assistant"]
@@ -34,25 +174,21 @@ class Message(BaseModel):
 
 class QueryRequest(BaseModel):
     messages: List[Message]
-    
+    provider: Optional[Literal["google", "groq", "openai"]] = None
+
 
 @app.post("/query")
 @log_endpoint
 async def query_travel_agent(query: QueryRequest):
     logger.info(f"Received query: {query}")
-    graph = GraphBuilder(model_provider="google")
-    react_app = graph()
-
-    png_graph = react_app.get_graph().draw_mermaid_png()
-    with open("my_graph.png", "wb") as f:
-        f.write(png_graph)
-
-    logger.info(f"Graph saved as 'my_graph.png' in {os.getcwd()}")
+    react_app = await get_graph(query.provider)
 
     # Pass the full conversation history to the agent
     messages = {"messages": [{"role": m.role, "content": m.content} for m in query.messages]}
 
-    output = react_app.invoke(messages)
+    # Async run: LLM calls and tool HTTP requests never block the event loop
+    async with admission.slot():
+        output = await react_app.ainvoke(messages)
 
     # If result is dict with messages:
     if isinstance(output, dict) and "messages" in output:
@@ -62,3 +198,164 @@ async def query_travel_agent(query: QueryRequest):
 
     logger.info(f"Returning answer: {final_output}")
     return {"answer": final_output}
+
+
+def _content_text(content) -> str:
+    """Flatten message content (plain string or list of content parts) to text"""
+    if isinstance(content, str):
+        return content
+    return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def stream_agent_events(react_app, inputs: dict, config: Optional[dict] = None, **run_kwargs) -> AsyncIterator[str]:
+    """Translate LangGraph run events into SSE: token, tool_start, tool_end, then done (or error)"""
+    final_output = ""
+    try:
+        async for event in react_app.astream_events(inputs, config=config, version="v2", **run_kwargs):
+            kind = event["event"]
+            if kind == "on_chat_model_stream" and event.get("metadata", {}).get("langgraph_node") == "agent":
+                text = _content_text(event["data"]["chunk"].content)
+                if text:
+                    yield _sse("token", {"content": text})
+            elif kind == "on_tool_start":
+                yield _sse("tool_start", {"name": event["name"], "input": event["data"].get("input")})
+            elif kind == "on_tool_end":
+                output = event["data"].get("output")
+                yield _sse("tool_end", {"name": event["name"], "output": _content_text(getattr(output, "content", str(output)))[:500]})
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                # Root run finished: its output is the final graph state
+                output = event["data"].get("output")
+                if isinstance(output, dict) and output.get("messages"):
+                    final_output = _content_text(output["messages"][-1].content)
+    except Exception as e:
+        logger.exception(f"Streaming run failed: {e}")
+        yield _sse("error", {"detail": str(e)})
+        return
+
+    logger.info(f"Streamed answer: {final_output}")
+    yield _sse("done", {"answer": final_output})
+
+
+@app.post("/query/stream")
+@log_endpoint
+async def stream_travel_agent(query: QueryRequest):
+    logger.info(f"Received streaming query: {query}")
+    react_app = await get_graph(query.provider)
+    messages = {"messages": [{"role": m.role, "content": m.content} for m in query.messages]}
+    body, release = await admitted_stream(stream_agent_events(react_app, messages))
+
+    return StreamingResponse(
+        body,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=release,
+    )
+
+
+class SessionQueryRequest(BaseModel):
+    message: str
+    session_id: Optional[str] = None
+    provider: Optional[Literal["google", "groq", "openai"]] = None
+
+async def _resolve_session(request: Request, session_id: Optional[str]) -> tuple:
+    """Return (session_store, session_id), creating a session when none is given"""
+    session_store: SessionStore = request.app.state.session_store
+    if session_id is None:
+        return session_store, session_store.new_session()
+    if not await session_store.exists(session_id):
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found or expired")
+    return session_store, session_id
+
+
+@app.post("/session/query")
+@log_endpoint
+async def session_query_travel_agent(query: SessionQueryRequest, request: Request):
+    session_store, session_id = await _resolve_session(request, query.session_id)
+    logger.info(f"Received session query for {session_id}: {query.message}")
+    react_app = await get_session_graph(query.provider)
+
+    # Only the new message is sent; earlier turns are restored from the checkpointer
+    messages = {"messages": [{"role": "user", "content": query.message}]}
+    async with admission.slot(), session_store.use(session_id) as run_config:
+        output = await react_app.ainvoke(messages, config=run_config, durability="exit")
+
+    final_output = _content_text(output["messages"][-1].content)
+    logger.info(f"Returning answer: {final_output}")
+    return {"answer": final_output, "session_id": session_id}
+
+
+@app.post("/session/query/stream")
+@log_endpoint
+async def session_stream_travel_agent(query: SessionQueryRequest, request: Request):
+    session_store, session_id = await _resolve_session(request, query.session_id)
+    logger.info(f"Received streaming session query for {session_id}: {query.message}")
+    react_app = await get_session_graph(query.provider)
+    messages = {"messages": [{"role": "user", "content": query.message}]}
+
+    async def event_stream():
+        yield _sse("session", {"session_id": session_id})
+        async with session_store.use(session_id) as run_config:
+            async for event in stream_agent_events(react_app, messages, run_config, durability="exit"):
+                yield event
+
+    body, release = await admitted_stream(event_stream())
+    return StreamingResponse(
+        body,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=release,
+    )
+
+
+@app.delete("/session/{session_id}")
+@log_endpoint
+async def delete_session(session_id: str, request: Request):
+    if not await request.app.state.session_store.delete(session_id):
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+    return {"deleted": session_id}
+
+
+batch_config = config.get("batch", {})
+
+class BatchQueryRequest(BaseModel):
+    conversations: List[List[Message]] = Field(..., min_length=1)
+    provider: Optional[Literal["google", "groq", "openai"]] = None
+    max_concurrency: Optional[int] = Field(default=None, ge=1)
+
+
+@app.post("/query/batch")
+@log_endpoint
+async def batch_query_travel_agent(query: BatchQueryRequest):
+    max_items = batch_config.get("max_items", 100)
+    if len(query.conversations) > max_items:
+        raise HTTPException(status_code=413, detail=f"Batch too large: at most {max_items} conversations per request")
+
+    logger.info(f"Received batch of {len(query.conversations)} conversations")
+    builder = await run_in_threadpool(graph_registry.get_builder, query.provider)
+
+    # Client may lower concurrency but never raise it above the configured ceiling
+    max_concurrency = min(query.max_concurrency or batch_config.get("max_concurrency", 4),
+                          batch_config.get("max_concurrency", 4))
+    conversations = [[{"role": m.role, "content": m.content} for m in conversation]
+                     for conversation in query.conversations]
+
+    # Every conversation takes its own admission slot, so batches cannot push runs past max_in_flight;
+    # max_concurrency only bounds how many of this batch's conversations queue for a slot at once
+    start = time.perf_counter()
+    results = await builder.abatch_conversations(
+        conversations,
+        max_concurrency=max_concurrency,
+        item_timeout=batch_config.get("item_timeout_seconds"),
+        admission=admission,
+    )
+    failed = sum(1 for result in results if result["error"])
+    logger.info(f"Batch finished: {len(results) - failed} succeeded, {failed} failed")
+    return {
+        "results": results,
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
@@ -1,6 +1,7 @@
 import streamlit as st
 import requests
 import datetime
+import json
 
 # from exception.exceptions import TradingBotException
 import sys
@@ -18,6 +19,20 @@ st.set_page_config(
 
 st.title("🌍 Travel Planner Agentic Application")
 
+
+def iter_sse(response):
+    """Yield (event, data) pairs from a Server-Sent Events response"""
+    event, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
 # Initialize chat history
 if "messages" not in st.session_state:
     st.session_state.messages = []
@@ -41,22 +56,54 @@ if submit_button and user_input.strip():
     try:
         # Add user message to conversation history
         st.session_state.messages.append({"role": "user", "content": user_input})
+        st.chat_message("user").write(user_input)
+
+        # Only the new message is sent; the server keeps the conversation in a session
+        payload = {"message": user_input, "session_id": st.session_state.get("session_id")}
+
+        # Stream tokens and tool activity into the chat as they arrive
+        with st.chat_message("assistant"):
+            status = st.empty()
+            placeholder = st.empty()
+            status.caption("Bot is thinking...")
+            answer, error = "", None
 
-        # Prepare payload with full conversation
-        payload = {"messages": st.session_state.messages}
+            response = requests.post(f"{BASE_URL}/session/query/stream", json=payload, stream=True)
+            if response.status_code == 404:
+                # Session expired on the server: start a new one
+                response.close()
+                payload["session_id"] = None
+                response = requests.post(f"{BASE_URL}/session/query/stream", json=payload, stream=True)
 
-        # Show thinking spinner while backend processes
-        with st.spinner("Bot is thinking..."):
-            response = requests.post(f"{BASE_URL}/query", json=payload)
+            with response:
+                if response.status_code != 200:
+                    error = response.text
+                else:
+                    for event, data in iter_sse(response):
+                        if event == "session":
+                            st.session_state.session_id = data["session_id"]
+                        elif event == "token":
+                            answer += data["content"]
+                            placeholder.markdown(answer + "▌")
+                        elif event == "tool_start":
+                            status.caption(f"🔧 Using {data['name']}...")
+                        elif event == "tool_end":
+                            status.caption(f"✅ {data['name']} finished")
+                            # Text streamed before a tool call was the agent thinking aloud
+                            answer = ""
+                            placeholder.empty()
+                        elif event == "done":
+                            answer = data.get("answer") or answer or "No answer returned."
+                        elif event == "error":
+                            error = data.get("detail")
 
-        if response.status_code == 200:
-            answer = response.json().get("answer", "No answer returned.")
+        if error is None:
             # Add assistant message to conversation history
             st.session_state.messages.append({"role": "assistant", "content": answer})
             # Rerun to show updated chat
             st.rerun()
         else:
-            st.error(" Bot failed to respond: " + response.text)
+            st.error(" Bot failed to respond: " + error)
 
     except Exception as e:
         st.error(f"The response failed due to {e}")
\ No newline at end of file
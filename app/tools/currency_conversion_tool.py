@@ -1,40 +1,79 @@
 from ..utils.currency_converter import CurrencyConverter
-from langchain.tools import tool
-from typing import List
+from langchain_core.tools import StructuredTool
+from typing import Dict, List
 
 class CurrencyConverterTool:
     def __init__(self):
         self.currency_converter = CurrencyConverter()
         self.currency_converter_tool_list = self._setup_tools()
-    
+
+    def _format_conversion(self, amount: float, from_currency: str, to_currency: str, converted_amount: float) -> str:
+        if converted_amount > 0:
+            return f"{amount} {from_currency.upper()} = {converted_amount:.2f} {to_currency.upper()}"
+        return f"Unable to convert {from_currency} to {to_currency}. Please check currency codes."
+
+    def _format_rate(self, from_currency: str, to_currency: str, rate: float) -> str:
+        if rate > 0:
+            return f"1 {from_currency.upper()} = {rate:.4f} {to_currency.upper()}"
+        return f"Unable to get exchange rate for {from_currency} to {to_currency}"
+
+    def _format_multiple(self, amount: float, from_currency: str, rates: Dict[str, float]) -> str:
+        result = f"Converting {amount} {from_currency.upper()}:\n"
+        for currency, rate in rates.items():
+            if rate > 0:
+                converted_amount = amount * rate
+                result += f"- {currency}: {converted_amount:.2f}\n"
+            else:
+                result += f"- {currency}: Unable to convert\n"
+        return result
+
+    def _format_bulk(self, result: Dict) -> str:
+        if not result["items"]:
+            reason = result.get("error") or "Please check the currency codes."
+            return f"Unable to convert the given amounts. {reason}"
+        failed = set(result["failed"])
+        lines = []
+        for i, item in enumerate(result["items"]):
+            if i in failed:
+                lines.append(f"- {item['amount']} {item['from']}: Unable to convert to {item['to']}")
+            else:
+                lines.append(f"- {item['amount']} {item['from']} = {item['converted']:.2f} {item['to']}")
+        totals = ", ".join(f"{total:.2f} {currency}" for currency, total in result["totals"].items())
+        return f"Converted {len(result['items'])} amounts:\n" + "\n".join(lines) + f"\nTotal: {totals or 'n/a'}"
+
     def _setup_tools(self) -> List:
         """Setup all currency converter tools"""
-        
-        @tool
+
         def convert_currency(amount: float, from_currency: str, to_currency: str) -> str:
             """Convert amount from one currency to another. Use 3-letter currency codes like USD, EUR, GBP, etc."""
             try:
                 converted_amount = self.currency_converter.convert_currency(amount, from_currency, to_currency)
-                if converted_amount > 0:
-                    return f"{amount} {from_currency.upper()} = {converted_amount:.2f} {to_currency.upper()}"
-                else:
-                    return f"Unable to convert {from_currency} to {to_currency}. Please check currency codes."
+                return self._format_conversion(amount, from_currency, to_currency, converted_amount)
+            except Exception as e:
+                return f"Error converting currency: {str(e)}"
+
+        async def aconvert_currency(amount: float, from_currency: str, to_currency: str) -> str:
+            try:
+                converted_amount = await self.currency_converter.aconvert_currency(amount, from_currency, to_currency)
+                return self._format_conversion(amount, from_currency, to_currency, converted_amount)
             except Exception as e:
                 return f"Error converting currency: {str(e)}"
-        
-        @tool
+
         def get_exchange_rate(from_currency: str, to_currency: str) -> str:
             """Get current exchange rate between two currencies"""
             try:
                 rate = self.currency_converter.get_exchange_rate(from_currency, to_currency)
-                if rate > 0:
-                    return f"1 {from_currency.upper()} = {rate:.4f} {to_currency.upper()}"
-                else:
-                    return f"Unable to get exchange rate for {from_currency} to {to_currency}"
+                return self._format_rate(from_currency, to_currency, rate)
+            except Exception as e:
+                return f"Error getting exchange rate: {str(e)}"
+
+        async def aget_exchange_rate(from_currency: str, to_currency: str) -> str:
+            try:
+                rate = await self.currency_converter.aget_exchange_rate(from_currency, to_currency)
+                return self._format_rate(from_currency, to_currency, rate)
             except Exception as e:
                 return f"Error getting exchange rate: {str(e)}"
-        
-        @tool
+
         def get_supported_currencies() -> str:
             """Get list of supported currencies with their full names"""
             try:
@@ -45,29 +84,48 @@ class CurrencyConverterTool:
                 return result
             except Exception as e:
                 return f"Error getting supported currencies: {str(e)}"
-        
-        @tool
+
+        async def aget_supported_currencies() -> str:
+            # Static list, no I/O involved
+            return get_supported_currencies()
+
         def convert_multiple_currencies(amount: float, from_currency: str, to_currencies: str) -> str:
             """Convert amount to multiple currencies. Provide to_currencies as comma-separated string (e.g., 'USD,EUR,GBP')"""
             try:
                 currency_list = [currency.strip() for currency in to_currencies.split(',')]
                 rates = self.currency_converter.get_multiple_rates(from_currency, currency_list)
-                
-                result = f"Converting {amount} {from_currency.upper()}:\n"
-                for currency, rate in rates.items():
-                    if rate > 0:
-                        converted_amount = amount * rate
-                        result += f"- {currency}: {converted_amount:.2f}\n"
-                    else:
-                        result += f"- {currency}: Unable to convert\n"
-                
-                return result
+                return self._format_multiple(amount, from_currency, rates)
+            except Exception as e:
+                return f"Error converting to multiple currencies: {str(e)}"
+
+        async def aconvert_multiple_currencies(amount: float, from_currency: str, to_currencies: str) -> str:
+            try:
+                currency_list = [currency.strip() for currency in to_currencies.split(',')]
+                rates = await self.currency_converter.aget_multiple_rates(from_currency, currency_list)
+                return self._format_multiple(amount, from_currency, rates)
             except Exception as e:
                 return f"Error converting to multiple currencies: {str(e)}"
-        
+
+        def convert_currency_bulk(amounts: List[float], from_currencies: List[str], to_currencies: List[str]) -> str:
+            """Convert many amounts at once, e.g. every line item of a budget, and total them per target currency.
+            Give from_currencies and to_currencies as one code for all amounts (e.g. ['EUR']) or one code per amount."""
+            try:
+                return self._format_bulk(self.currency_converter.convert_many(amounts, from_currencies, to_currencies))
+            except Exception as e:
+                return f"Error converting amounts: {str(e)}"
+
+        async def aconvert_currency_bulk(amounts: List[float], from_currencies: List[str],
+                                         to_currencies: List[str]) -> str:
+            try:
+                result = await self.currency_converter.aconvert_many(amounts, from_currencies, to_currencies)
+                return self._format_bulk(result)
+            except Exception as e:
+                return f"Error converting amounts: {str(e)}"
+
         return [
-            convert_currency,
-            get_exchange_rate,
-            get_supported_currencies,
-            convert_multiple_currencies
+            StructuredTool.from_function(func=convert_currency, coroutine=aconvert_currency),
+            StructuredTool.from_function(func=get_exchange_rate, coroutine=aget_exchange_rate),
+            StructuredTool.from_function(func=get_supported_currencies, coroutine=aget_supported_currencies),
+            StructuredTool.from_function(func=convert_multiple_currencies, coroutine=aconvert_multiple_currencies),
+            StructuredTool.from_function(func=convert_currency_bulk, coroutine=aconvert_currency_bulk)
         ]
@@ -1,6 +1,12 @@
 from ..utils.calculator import Calculator
-from langchain.tools import tool
-from typing import List
+from langchain_core.tools import StructuredTool
+from typing import Callable, List
+
+def _inline_coroutine(func: Callable) -> Callable:
+    """Async variant for CPU-only tools: runs inline on the event loop instead of in a worker thread"""
+    async def coroutine(*args, **kwargs):
+        return func(*args, **kwargs)
+    return coroutine
 
 class CalculatorTool:
     def __init__(self):
@@ -10,7 +16,6 @@ class CalculatorTool:
     def _setup_tools(self) -> List:
         """Setup all calculator tools"""
         
-        @tool
         def add_numbers(a: float, b: float) -> str:
             """Add two numbers together"""
             try:
@@ -19,7 +24,6 @@ class CalculatorTool:
             except Exception as e:
                 return f"Error: {str(e)}"
         
-        @tool
         def multiply_numbers(a: float, b: float) -> str:
             """Multiply two numbers"""
             try:
@@ -28,7 +32,6 @@ class CalculatorTool:
             except Exception as e:
                 return f"Error: {str(e)}"
         
-        @tool
         def calculate_percentage(value: float, percentage: float) -> str:
             """Calculate percentage of a value"""
             try:
@@ -37,7 +40,6 @@ class CalculatorTool:
             except Exception as e:
                 return f"Error: {str(e)}"
         
-        @tool
         def calculate_total_expenses(expenses: str) -> str:
             """Calculate total expenses from a comma-separated string of numbers"""
             try:
@@ -47,7 +49,6 @@ class CalculatorTool:
             except Exception as e:
                 return f"Error: {str(e)}"
         
-        @tool
         def calculate_per_person_cost(total_cost: float, num_people: int) -> str:
             """Calculate cost per person from total cost and number of people"""
             try:
@@ -56,7 +57,6 @@ class CalculatorTool:
             except Exception as e:
                 return f"Error: {str(e)}"
         
-        @tool
         def calculate_daily_budget(total_budget: float, num_days: int) -> str:
             """Calculate daily budget from total budget and number of days"""
             try:
@@ -66,10 +66,13 @@ class CalculatorTool:
                 return f"Error: {str(e)}"
         
         return [
-            add_numbers, 
-            multiply_numbers, 
-            calculate_percentage, 
-            calculate_total_expenses, 
-            calculate_per_person_cost, 
-            calculate_daily_budget
+            StructuredTool.from_function(func=func, coroutine=_inline_coroutine(func))
+            for func in (
+                add_numbers,
+                multiply_numbers,
+                calculate_percentage,
+                calculate_total_expenses,
+                calculate_per_person_cost,
+                calculate_daily_budget
+            )
         ]
@@ -1,47 +1,97 @@
 import os
 from ..utils.weather_info import WeatherForecastTool
-from langchain.tools import tool
-from typing import List
+from ..utils.place_info_search import PlaceInfoSearch
+from ..utils.config_loader import load_config
+from langchain_core.tools import StructuredTool
+from typing import Dict, List
 from dotenv import load_dotenv
 
 class WeatherInfoTool:
     def __init__(self):
         load_dotenv()
         self.api_key = os.environ.get("OPENWEATHERMAP_API_KEY")
-        self.weather_service = WeatherForecastTool(self.api_key)
+        # Resolve city names through the shared geocode cache used by the place tools
+        place_search = PlaceInfoSearch() if load_config().get("weather", {}).get("resolve_coordinates", True) else None
+        self.weather_service = WeatherForecastTool(self.api_key, place_search=place_search)
         self.weather_tool_list = self._setup_tools()
-    
+
+    def _format_current_weather(self, city: str, weather_data: dict) -> str:
+        if weather_data:
+            temp = weather_data.get('main', {}).get('temp', 'N/A')
+            desc = weather_data.get('weather', [{}])[0].get('description', 'N/A')
+            return f"Current weather in {city}: {temp}°C, {desc}"
+        return f"Could not fetch weather for {city}"
+
+    def _format_temperatures(self, day: Dict) -> str:
+        """min-max | mean columns of a daily row, N/A where the day had no readings"""
+        temp_min, temp_max, temp_mean = (day[key] if day[key] is not None else 'N/A'
+                                         for key in ('temp_min', 'temp_max', 'temp_mean'))
+        return f"{temp_min}-{temp_max} | {temp_mean}"
+
+    def _format_forecast(self, city: str, daily: List[Dict]) -> str:
+        if daily:
+            rows = [f"{d['date']} | {self._format_temperatures(d)} | "
+                    f"{d['precipitation_probability']}% | {d['precipitation_mm']} | {d['condition']}" for d in daily]
+            header = "date | min-max °C | mean °C | rain chance | rain mm | conditions"
+            return f"Daily weather forecast for {city} ({len(daily)} days):\n{header}\n" + "\n".join(rows)
+        return f"Could not fetch forecast for {city}"
+
+    def _format_multi_city(self, weather: Dict[str, Dict], days: int) -> str:
+        if not weather:
+            return "No cities given"
+        lines = [f"Weather for {len(weather)} cities", "Current conditions:", "city | temp °C | conditions"]
+        for city, data in weather.items():
+            current = data["current"]
+            if current:
+                temp = current.get('main', {}).get('temp', 'N/A')
+                desc = current.get('weather', [{}])[0].get('description', 'N/A')
+                lines.append(f"{city} | {temp} | {desc}")
+            else:
+                lines.append(f"{city} | Could not fetch weather")
+        if days > 0:
+            lines += ["Daily forecast:", "city | date | min-max °C | mean °C | rain chance | conditions"]
+            for city, data in weather.items():
+                if not data["daily"]:
+                    lines.append(f"{city} | Could not fetch forecast")
+                for d in data["daily"]:
+                    lines.append(f"{city} | {d['date']} | {self._format_temperatures(d)} | "
+                                 f"{d['precipitation_probability']}% | {d['condition']}")
+        return "\n".join(lines)
+
     def _setup_tools(self) -> List:
         """Setup all tools for the weather forecast tool"""
-        @tool
         def get_current_weather(city: str) -> str:
             """Get current weather for a city"""
-            weather_data = self.weather_service.get_current_weather(city)
-            if weather_data:
-                temp = weather_data.get('main', {}).get('temp', 'N/A')
-                desc = weather_data.get('weather', [{}])[0].get('description', 'N/A')
-                return f"Current weather in {city}: {temp}°C, {desc}"
-            return f"Could not fetch weather for {city}"
-        
-        @tool
-        def get_weather_forecast(city: str) -> str:
-            """Get weather forecast for a city"""
-            forecast_data = self.weather_service.get_forecast_weather(city)
-            if forecast_data and 'list' in forecast_data:
-                forecast_summary = []
-                for i in range(len(forecast_data['list'])):
-                    item = forecast_data['list'][i]
-                    date = item['dt_txt'].split(' ')[0]
-                    temp = item['main']['temp']
-                    desc = item['weather'][0]['description']
-                    forecast_summary.append(f"{date}: {temp} degree celcius , {desc}")
-                return f"Weather forecast for {city}:\n" + "\n".join(forecast_summary)
-            return f"Could not fetch forecast for {city}"
-    
-        return [get_current_weather, get_weather_forecast]
+            return self._format_current_weather(city, self.weather_service.get_current_weather(city))
+
+        async def aget_current_weather(city: str) -> str:
+            return self._format_current_weather(city, await self.weather_service.aget_current_weather(city))
+
+        def get_weather_forecast(city: str, days: int = 5) -> str:
+            """Get a daily weather forecast (min/max/mean temperature, rain chance, conditions) for a city.
+            Set days to the trip length; forecasts are available up to 5 days ahead."""
+            return self._format_forecast(city, self.weather_service.get_daily_forecast(city, days=days))
+
+        async def aget_weather_forecast(city: str, days: int = 5) -> str:
+            return self._format_forecast(city, await self.weather_service.aget_daily_forecast(city, days=days))
+
+        def get_multi_city_weather(cities: List[str], days: int = 5) -> str:
+            """Get current weather and daily forecasts for several cities (or "lat,lon" points) of an itinerary
+            in one call. Prefer this over calling get_current_weather or get_weather_forecast once per city.
+            Forecasts go up to 5 days ahead; set days to 0 for current conditions only."""
+            return self._format_multi_city(self.weather_service.get_weather_many(cities, days=days), days)
+
+        async def aget_multi_city_weather(cities: List[str], days: int = 5) -> str:
+            return self._format_multi_city(await self.weather_service.aget_weather_many(cities, days=days), days)
+
+        return [
+            StructuredTool.from_function(func=get_current_weather, coroutine=aget_current_weather),
+            StructuredTool.from_function(func=get_weather_forecast, coroutine=aget_weather_forecast),
+            StructuredTool.from_function(func=get_multi_city_weather, coroutine=aget_multi_city_weather)
+        ]
 
 if __name__ == "__main__":
     weather_tool = WeatherInfoTool()
     tools = weather_tool.weather_tool_list
     for tool in tools:
-        print(f"Tool: {tool.name}, Description: {tool.description}")
\ No newline at end of file
+        print(f"Tool: {tool.name}, Description: {tool.description}")
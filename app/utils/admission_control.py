@@ -0,0 +1,135 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+class AdmissionRejected(Exception):
+    """Raised when a run cannot be admitted; maps to an HTTP error with Retry-After"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """Caps concurrent agent runs per worker with a bounded FIFO wait queue.
+
+    Up to max_in_flight runs execute at once; up to max_queue more wait for a slot.
+    A request that finds the queue full is rejected immediately (429), and one that
+    waits longer than queue_timeout is rejected (503), both with a Retry-After hint.
+    """
+
+    def __init__(self, max_in_flight: int = 8, max_queue: int = 32,
+                 queue_timeout: float = 30.0, retry_after: int = 5):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        # Counters published through stats()
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.completed = 0
+        self.total_run_seconds = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _retry_after_hint(self) -> int:
+        """Seconds until a slot is likely free, from the average run time and current backlog"""
+        if not self.completed:
+            return self.retry_after
+        avg_run = self.total_run_seconds / self.completed
+        return max(1, math.ceil(avg_run * (self.queue_depth + 1) / self.max_in_flight))
+
+    async def acquire(self) -> float:
+        """Wait for a run slot and return the time spent queued, or raise AdmissionRejected"""
+        start = time.monotonic()
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            self._record_admit(0.0)
+            return 0.0
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise AdmissionRejected(429, "Too many requests queued, please retry later", self._retry_after_hint())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # release() hands its slot straight to the waiter, so _in_flight is not touched here
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self.rejected_timeout += 1
+            raise AdmissionRejected(503, "Server busy, timed out waiting for a free slot", self._retry_after_hint())
+        except BaseException:
+            # Cancelled (e.g. client went away); give the slot back if it was already handed over
+            self._discard(waiter)
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+        wait_seconds = time.monotonic() - start
+        self._record_admit(wait_seconds)
+        return wait_seconds
+
+    def release(self, run_seconds: Optional[float] = None) -> None:
+        """Free a slot, handing it to the oldest live waiter if there is one"""
+        if run_seconds is not None:
+            self.completed += 1
+            self.total_run_seconds += run_seconds
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[float]:
+        """Hold a run slot for the duration of the block; yields the queue wait in seconds"""
+        wait_seconds = await self.acquire()
+        start = time.monotonic()
+        try:
+            yield wait_seconds
+        finally:
+            self.release(time.monotonic() - start)
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _record_admit(self, wait_seconds: float) -> None:
+        self.admitted += 1
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "avg_wait_ms": round(self.total_wait_seconds / self.admitted * 1000, 1) if self.admitted else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 1),
+            "avg_run_ms": round(self.total_run_seconds / self.completed * 1000, 1) if self.completed else 0.0,
+        }
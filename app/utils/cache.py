@@ -0,0 +1,269 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from .config_loader import load_config
+
+class TTLCache:
+    """Thread-safe in-process LRU cache whose entries expire after a TTL.
+
+    Expired entries are kept for another stale_seconds so stale-while-revalidate
+    readers (get_entry(key, allow_stale=True)) can still be answered from them.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600, name: str = "cache",
+                 stale_seconds: float = 0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self.stale_seconds = stale_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_entry(self, key: str, allow_stale: bool = False) -> Optional[Tuple[float, Any]]:
+        """Return (expires_at, value) for a live entry (or a stale one if allowed), or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] + self.stale_seconds <= now:
+                del self._entries[key]
+                entry = None
+            if entry is None or (entry[0] <= now and not allow_stale):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        return default if entry is None else entry[1]
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None, expires_at: Optional[float] = None) -> None:
+        if expires_at is None:
+            expires_at = time.time() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+class SQLiteCache:
+    """On-disk JSON value cache with expiry and a size cap, shared by threads and worker processes.
+
+    Reads only write back the access time (used for LRU pruning) when it is more
+    than touch_interval seconds old, so hot rows do not turn every read into a write.
+    """
+
+    touch_interval = 300
+
+    def __init__(self, path: str, max_entries: int = 50000, ttl_seconds: float = 86400, name: str = "cache",
+                 stale_seconds: float = 0):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self.stale_seconds = stale_seconds
+        self._local = threading.local()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread and process; a forked worker must not reuse the parent's
+        conn_pid = getattr(self._local, "pid", None)
+        if conn_pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return self._local.conn
+
+    def get_entry(self, key: str, allow_stale: bool = False) -> Optional[Tuple[float, Any]]:
+        """Return (expires_at, value) for a live entry (or a stale one if allowed), or None"""
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute("SELECT value, expires_at, accessed_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] + (self.stale_seconds if allow_stale else 0) <= now:
+            self.misses += 1
+            return None
+        if now - row[2] > self.touch_interval:
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return row[1], json.loads(row[0])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        return default if entry is None else entry[1]
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None, expires_at: Optional[float] = None) -> None:
+        now = time.time()
+        if expires_at is None:
+            expires_at = now + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, separators=(",", ":")), expires_at, now),
+        )
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.prune()
+
+    def prune(self) -> None:
+        """Drop rows past their stale window, then the least recently used rows beyond max_entries"""
+        conn = self._connect()
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time() - self.stale_seconds,))
+        conn.execute(
+            "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def stats(self) -> Dict:
+        size = self._connect().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+class TieredCache:
+    """In-process LRU in front of an on-disk SQLite store; disk hits are promoted to memory.
+
+    The a-prefixed methods are for coroutines: the memory tier is answered inline
+    and the SQLite tier runs in a worker thread, so a busy database file never
+    stalls the event loop. refresh_ahead_seconds is read by the background refresher: hot entries this
+    close to expiry are reloaded before anyone sees a miss.
+    """
+
+    def __init__(self, memory: TTLCache, disk: Optional[SQLiteCache] = None, name: str = "cache",
+                 refresh_ahead_seconds: float = 0):
+        self.memory = memory
+        self.disk = disk
+        self.name = name
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+
+    def get_entry(self, key: str, allow_stale: bool = False) -> Optional[Tuple[float, Any]]:
+        entry = self.memory.get_entry(key, allow_stale)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get_entry(key, allow_stale)
+            if entry is not None:
+                self.memory.set(key, entry[1], expires_at=entry[0])
+        return entry
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        return default if entry is None else entry[1]
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None, expires_at: Optional[float] = None) -> None:
+        self.memory.set(key, value, ttl_seconds=ttl_seconds, expires_at=expires_at)
+        if self.disk is not None:
+            self.disk.set(key, value, ttl_seconds=ttl_seconds, expires_at=expires_at)
+
+    async def aget_entry(self, key: str, allow_stale: bool = False) -> Optional[Tuple[float, Any]]:
+        entry = self.memory.get_entry(key, allow_stale)
+        if entry is None and self.disk is not None:
+            entry = await asyncio.to_thread(self.disk.get_entry, key, allow_stale)
+            if entry is not None:
+                self.memory.set(key, entry[1], expires_at=entry[0])
+        return entry
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        entry = await self.aget_entry(key)
+        return default if entry is None else entry[1]
+
+    async def aset(self, key: str, value: Any, ttl_seconds: Optional[float] = None,
+                   expires_at: Optional[float] = None) -> None:
+        if expires_at is None:
+            # Fix the expiry before handing off so both tiers agree regardless of thread scheduling
+            expires_at = time.time() + (self.memory.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        self.memory.set(key, value, expires_at=expires_at)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, value, expires_at=expires_at)
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def stats(self) -> Dict:
+        return {
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
+
+_shared_caches: Dict[str, TieredCache] = {}
+_shared_caches_lock = threading.Lock()
+
+def get_shared_cache(name: str) -> TieredCache:
+    """Process-wide cache configured under `cache.<name>` in config.yaml, created on first use"""
+    cache = _shared_caches.get(name)
+    if cache is not None:
+        return cache
+    with _shared_caches_lock:
+        cache = _shared_caches.get(name)
+        if cache is None:
+            cache_config = load_config().get("cache", {}).get(name, {})
+            ttl_seconds = cache_config.get("ttl_seconds", 3600)
+            stale_seconds = cache_config.get("stale_seconds", 0)
+            memory = TTLCache(cache_config.get("max_entries", 1024), ttl_seconds, name=name,
+                              stale_seconds=stale_seconds)
+            disk = None
+            if cache_config.get("disk_path"):
+                disk = SQLiteCache(cache_config["disk_path"], cache_config.get("disk_max_entries", 50000),
+                                   ttl_seconds, name=name, stale_seconds=stale_seconds)
+            cache = TieredCache(memory, disk, name=name,
+                                refresh_ahead_seconds=cache_config.get("refresh_ahead_seconds", 0))
+            _shared_caches[name] = cache
+    return cache
+
+def shared_cache_stats() -> Dict:
+    """Stats for every shared cache created so far"""
+    return {name: cache.stats() for name, cache in _shared_caches.items()}
+
+def normalize_key(*parts) -> str:
+    """Case- and whitespace-insensitive cache key from the given parts"""
+    return "|".join(" ".join(str(part).lower().split()) for part in parts)
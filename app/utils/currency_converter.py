@@ -1,48 +1,196 @@
-import requests
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Union
+from functools import partial
 import json
+import numpy as np
+from .cache import get_shared_cache
+from .http_client import get_http_client
+from .rate_table import RateTable
+from .refresher import get_refresher
+from .single_flight import get_single_flight
 
 class CurrencyConverter:
-    """Currency converter using free exchangerate-api.com API"""
-    
+    """Currency converter using free exchangerate-api.com API.
+
+    Only the anchor currency's rate table is downloaded; every other pair is a
+    cross rate derived locally from it, so after the first fetch (and until the
+    cached table expires) conversions never leave the process.
+    """
+
+    anchor_currency = "USD"
+
     def __init__(self, api_key: Optional[str] = None):
         # Using free tier which doesn't require API key
         self.base_url = "https://api.exchangerate-api.com/v4/latest"
         self.api_key = api_key
-        
+        self.http = get_http_client()
+        self.flights = get_single_flight("exchange_rates")
+        # The anchor rate table, reloaded in the background before it expires while in use
+        self.cache = get_shared_cache("exchange_rates")
+        self.refresher = get_refresher("exchange_rates")
+        self._table: Optional[tuple] = None  # (cached rates dict, RateTable built from it)
+
+    def _request_rates(self, base_currency: str) -> Optional[Dict[str, float]]:
+        response = self.http.get(f"{self.base_url}/{base_currency}")
+        if response.status_code == 200:
+            rates = response.json().get('rates', {})
+            self.cache.set(base_currency, rates)
+            return rates
+        return None
+
+    async def _arequest_rates(self, base_currency: str) -> Optional[Dict[str, float]]:
+        response = await self.http.aget(f"{self.base_url}/{base_currency}")
+        if response.status_code == 200:
+            rates = response.json().get('rates', {})
+            await self.cache.aset(base_currency, rates)
+            return rates
+        return None
+
+    def _load_rates(self, base_currency: str) -> Optional[Dict[str, float]]:
+        # Concurrent requests for the same base share one upstream call
+        return self.flights.do(base_currency, self._request_rates, base_currency)
+
+    def _fetch_rates(self, base_currency: str) -> Optional[Dict[str, float]]:
+        """Rate table for a base currency, from cache when possible, or None on a non-200 response"""
+        base_currency = base_currency.upper()
+        cached = self.refresher.lookup(self.cache, base_currency, partial(self._load_rates, base_currency))
+        if cached is not None:
+            return cached
+        return self._load_rates(base_currency)
+
+    async def _afetch_rates(self, base_currency: str) -> Optional[Dict[str, float]]:
+        """Async variant of _fetch_rates"""
+        base_currency = base_currency.upper()
+        cached = await self.refresher.alookup(self.cache, base_currency, partial(self._load_rates, base_currency))
+        if cached is not None:
+            return cached
+        return await self.flights.ado(base_currency, self._arequest_rates, base_currency)
+
+    def _as_table(self, rates: Optional[Dict[str, float]]) -> Optional[RateTable]:
+        """RateTable for the anchor rates, rebuilt only when the cached table object changes"""
+        if rates is None:
+            return None
+        memo = self._table
+        if memo is None or memo[0] is not rates:
+            memo = self._table = (rates, RateTable(self.anchor_currency, rates))
+        return memo[1]
+
+    def _rate_table(self) -> Optional[RateTable]:
+        return self._as_table(self._fetch_rates(self.anchor_currency))
+
+    async def _arate_table(self) -> Optional[RateTable]:
+        return self._as_table(await self._afetch_rates(self.anchor_currency))
+
     def get_exchange_rate(self, from_currency: str, to_currency: str) -> float:
         """Get exchange rate between two currencies"""
         try:
-            url = f"{self.base_url}/{from_currency.upper()}"
-            response = requests.get(url)
-            
-            if response.status_code == 200:
-                data = response.json()
-                rates = data.get('rates', {})
-                return rates.get(to_currency.upper(), 0.0)
-            else:
+            table = self._rate_table()
+            if table is None:
+                return 0.0
+            return table.rate(from_currency, to_currency)
+
+        except Exception as e:
+            print(f"Error fetching exchange rate: {e}")
+            return 0.0
+
+    async def aget_exchange_rate(self, from_currency: str, to_currency: str) -> float:
+        """Async variant of get_exchange_rate"""
+        try:
+            table = await self._arate_table()
+            if table is None:
                 return 0.0
-                
+            return table.rate(from_currency, to_currency)
+
         except Exception as e:
             print(f"Error fetching exchange rate: {e}")
             return 0.0
-    
+
     def convert_currency(self, amount: float, from_currency: str, to_currency: str) -> float:
         """Convert amount from one currency to another"""
         try:
             if from_currency.upper() == to_currency.upper():
                 return amount
-                
+
             rate = self.get_exchange_rate(from_currency, to_currency)
             if rate > 0:
                 return amount * rate
             else:
                 return 0.0
-                
+
+        except Exception as e:
+            print(f"Error converting currency: {e}")
+            return 0.0
+
+    async def aconvert_currency(self, amount: float, from_currency: str, to_currency: str) -> float:
+        """Async variant of convert_currency"""
+        try:
+            if from_currency.upper() == to_currency.upper():
+                return amount
+
+            rate = await self.aget_exchange_rate(from_currency, to_currency)
+            if rate > 0:
+                return amount * rate
+            else:
+                return 0.0
+
         except Exception as e:
             print(f"Error converting currency: {e}")
             return 0.0
-    
+
+    def _expand(self, currencies: Union[str, List[str]], n: int, argument: str) -> List[str]:
+        """One currency code per item; a single code (or a one-element list) applies to every item"""
+        if isinstance(currencies, str):
+            currencies = [currencies]
+        if len(currencies) == 1:
+            return list(currencies) * n
+        if len(currencies) != n:
+            raise ValueError(f"{argument}: expected 1 or {n} currency codes, got {len(currencies)}")
+        return list(currencies)
+
+    def _convert_many(self, table: Optional[RateTable], amounts: List[float],
+                      from_currencies: Union[str, List[str]], to_currencies: Union[str, List[str]]) -> Dict:
+        n = len(amounts)
+        sources = [code.upper() for code in self._expand(from_currencies, n, "from_currencies")]
+        targets = [code.upper() for code in self._expand(to_currencies, n, "to_currencies")]
+        converted = table.convert(amounts, sources, targets) if table is not None else np.full(n, np.nan)
+        failed = np.isnan(converted)
+
+        # Totals per target currency: bincount over each item's position among the distinct targets
+        currencies, target_index = np.unique(np.array(targets, dtype=str), return_inverse=True)
+        sums = np.bincount(target_index[~failed], weights=converted[~failed], minlength=len(currencies))
+        totals = {str(currencies[i]): round(float(sums[i]), 2)
+                  for i in np.unique(target_index[~failed])}
+        return {
+            "items": [{"amount": amount, "from": source, "to": target,
+                       "converted": 0.0 if bad else round(float(value), 2)}
+                      for amount, source, target, value, bad in zip(amounts, sources, targets, converted, failed)],
+            "totals": totals,
+            "failed": [int(i) for i in np.flatnonzero(failed)],
+        }
+
+    def convert_many(self, amounts: List[float], from_currencies: Union[str, List[str]],
+                     to_currencies: Union[str, List[str]]) -> Dict:
+        """Convert a list of amounts in one pass over the cached rate table.
+
+        from_currencies and to_currencies are either one code for every amount or
+        one code per amount. Returns {"items": [{amount, from, to, converted}],
+        "totals": {target currency: sum}, "failed": [indexes that could not be converted]};
+        when the whole batch fails, items is empty and "error" says why.
+        """
+        try:
+            return self._convert_many(self._rate_table(), amounts, from_currencies, to_currencies)
+        except Exception as e:
+            print(f"Error converting amounts: {e}")
+            return {"items": [], "totals": {}, "failed": list(range(len(amounts))), "error": str(e)}
+
+    async def aconvert_many(self, amounts: List[float], from_currencies: Union[str, List[str]],
+                            to_currencies: Union[str, List[str]]) -> Dict:
+        """Async variant of convert_many"""
+        try:
+            return self._convert_many(await self._arate_table(), amounts, from_currencies, to_currencies)
+        except Exception as e:
+            print(f"Error converting amounts: {e}")
+            return {"items": [], "totals": {}, "failed": list(range(len(amounts))), "error": str(e)}
+
     def get_supported_currencies(self) -> Dict[str, str]:
         """Get list of commonly supported currencies"""
         # Common currencies - this is a static list for free tier
@@ -68,22 +216,22 @@ class CurrencyConverter:
             "ZAR": "South African Rand",
             "THB": "Thai Baht"
         }
-    
+
+    def _pick_rates(self, table: Optional[RateTable], from_currency: str, to_currencies: list) -> Dict[str, float]:
+        return table.rates_from(from_currency, to_currencies) if table is not None else {}
+
     def get_multiple_rates(self, from_currency: str, to_currencies: list) -> Dict[str, float]:
         """Get exchange rates for multiple target currencies"""
-        rates = {}
         try:
-            url = f"{self.base_url}/{from_currency.upper()}"
-            response = requests.get(url)
-            
-            if response.status_code == 200:
-                data = response.json()
-                api_rates = data.get('rates', {})
-                
-                for currency in to_currencies:
-                    rates[currency.upper()] = api_rates.get(currency.upper(), 0.0)
-                    
+            return self._pick_rates(self._rate_table(), from_currency, to_currencies)
+        except Exception as e:
+            print(f"Error fetching multiple rates: {e}")
+            return {}
+
+    async def aget_multiple_rates(self, from_currency: str, to_currencies: list) -> Dict[str, float]:
+        """Async variant of get_multiple_rates"""
+        try:
+            return self._pick_rates(await self._arate_table(), from_currency, to_currencies)
         except Exception as e:
             print(f"Error fetching multiple rates: {e}")
-            
-        return rates
+            return {}
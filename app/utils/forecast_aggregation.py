@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from typing import Dict, List
+import numpy as np
+
+# OpenWeatherMap's 5 day / 3 hour forecast returns at most 40 entries, 8 per day
+ENTRIES_PER_DAY = 8
+MAX_FORECAST_ENTRIES = 40
+
+def forecast_entries_for_days(days: int) -> int:
+    """Number of 3-hourly entries (OpenWeatherMap `cnt`) covering the given number of days"""
+    return min(MAX_FORECAST_ENTRIES, max(1, days) * ENTRIES_PER_DAY)
+
+def _local_dates(entries: List[Dict], tz_offset_seconds: int) -> List[str]:
+    dates = []
+    for item in entries:
+        if "dt" in item:
+            local = datetime.fromtimestamp(item["dt"] + tz_offset_seconds, tz=timezone.utc)
+            dates.append(local.strftime("%Y-%m-%d"))
+        else:
+            dates.append(item.get("dt_txt", "").split(" ")[0])
+    return dates
+
+def aggregate_daily(forecast_data: Dict) -> List[Dict]:
+    """Collapse a 3-hourly OpenWeatherMap forecast into one row per local calendar day.
+
+    Each row has min/max/mean temperature (None when the day has no readings),
+    the highest precipitation probability, total rain and snow in mm and the
+    most frequent condition of the day.
+    """
+    entries = forecast_data.get("list") or []
+    if not entries:
+        return []
+
+    tz_offset = (forecast_data.get("city") or {}).get("timezone", 0)
+    day_labels, day_index = np.unique(_local_dates(entries, tz_offset), return_inverse=True)
+    n_days = len(day_labels)
+
+    mains = [item.get("main", {}) for item in entries]
+    temp = np.array([m.get("temp", np.nan) for m in mains], dtype=float)
+    temp_min = np.array([m.get("temp_min", m.get("temp", np.nan)) for m in mains], dtype=float)
+    temp_max = np.array([m.get("temp_max", m.get("temp", np.nan)) for m in mains], dtype=float)
+    pop = np.array([item.get("pop", 0.0) for item in entries], dtype=float)
+    precip = np.array([(item.get("rain") or {}).get("3h", 0.0) + (item.get("snow") or {}).get("3h", 0.0)
+                       for item in entries], dtype=float)
+
+    daily_min = np.full(n_days, np.inf)
+    daily_max = np.full(n_days, -np.inf)
+    daily_pop = np.zeros(n_days)
+    # fmin/fmax skip missing temperatures instead of letting NaN take over the day
+    np.fmin.at(daily_min, day_index, temp_min)
+    np.fmax.at(daily_max, day_index, temp_max)
+    np.maximum.at(daily_pop, day_index, pop)
+    # Missing temperatures are left out of the mean rather than counted as 0
+    has_temp = ~np.isnan(temp)
+    temp_counts = np.bincount(day_index[has_temp], minlength=n_days)
+    temp_sums = np.bincount(day_index[has_temp], weights=temp[has_temp], minlength=n_days)
+    daily_mean = np.divide(temp_sums, temp_counts, out=np.full(n_days, np.nan), where=temp_counts > 0)
+    daily_precip = np.bincount(day_index, weights=precip, minlength=n_days)
+
+    # Dominant condition: count (day, condition) pairs and take the most frequent per day
+    descriptions = [(item.get("weather") or [{}])[0].get("description", "unknown") for item in entries]
+    condition_labels, condition_index = np.unique(descriptions, return_inverse=True)
+    pair_counts = np.bincount(day_index * len(condition_labels) + condition_index,
+                              minlength=n_days * len(condition_labels)).reshape(n_days, len(condition_labels))
+    dominant = condition_labels[pair_counts.argmax(axis=1)]
+
+    return [
+        {
+            "date": str(day_labels[i]),
+            "temp_min": round(float(daily_min[i]), 1) if np.isfinite(daily_min[i]) else None,
+            "temp_max": round(float(daily_max[i]), 1) if np.isfinite(daily_max[i]) else None,
+            "temp_mean": round(float(daily_mean[i]), 1) if temp_counts[i] else None,
+            "precipitation_probability": int(round(daily_pop[i] * 100)),
+            "precipitation_mm": round(float(daily_precip[i]), 1),
+            "condition": str(dominant[i]),
+        }
+        for i in range(n_days)
+    ]
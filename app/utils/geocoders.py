@@ -0,0 +1,154 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from .cache import normalize_key
+from .http_client import get_http_client
+
+USER_AGENT = 'AI_Trip_Planner/1.0 (educational_project)'
+
+class Geocoder(ABC):
+    """Backend that turns a free-text query into Nominatim-shaped search results.
+
+    search returns the raw result dicts (display_name, lat, lon, class, type,
+    importance, address), or None when the backend answered with an error so the
+    caller does not cache it. search_many resolves several queries in one pass;
+    backends without a batch endpoint fan out up to max_concurrency requests.
+    """
+
+    name = "geocoder"
+    max_concurrency = 1
+
+    @abstractmethod
+    def search(self, query: str, limit: int) -> Optional[List[Dict]]:
+        ...
+
+    async def asearch(self, query: str, limit: int) -> Optional[List[Dict]]:
+        return self.search(query, limit)
+
+    def search_many(self, queries: List[str], limit: int) -> List[Optional[List[Dict]]]:
+        if self.max_concurrency <= 1 or len(queries) <= 1:
+            return [self.search(query, limit) for query in queries]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(queries))) as pool:
+            return list(pool.map(lambda query: self.search(query, limit), queries))
+
+    async def asearch_many(self, queries: List[str], limit: int) -> List[Optional[List[Dict]]]:
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def bounded(query):
+            async with semaphore:
+                return await self.asearch(query, limit)
+
+        return list(await asyncio.gather(*(bounded(query) for query in queries)))
+
+class NominatimGeocoder(Geocoder):
+    """Public OpenStreetMap Nominatim; one request at a time, paced by the host rate limiter"""
+
+    name = "nominatim"
+
+    def __init__(self, base_url: str = "https://nominatim.openstreetmap.org", user_agent: str = USER_AGENT):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {'User-Agent': user_agent}
+        self.http = get_http_client()
+
+    def _params(self, query: str, limit: int) -> Dict:
+        """Build the Nominatim /search query parameters"""
+        return {
+            'q': query,
+            'format': 'json',
+            'limit': limit,
+            'addressdetails': 1
+        }
+
+    def search(self, query: str, limit: int) -> Optional[List[Dict]]:
+        response = self.http.get(f"{self.base_url}/search", params=self._params(query, limit), headers=self.headers)
+        return response.json() if response.status_code == 200 else None
+
+    async def asearch(self, query: str, limit: int) -> Optional[List[Dict]]:
+        response = await self.http.aget(f"{self.base_url}/search", params=self._params(query, limit),
+                                        headers=self.headers)
+        return response.json() if response.status_code == 200 else None
+
+class SelfHostedNominatimGeocoder(NominatimGeocoder):
+    """A Nominatim instance we run ourselves: same API, no public usage policy, so batches run concurrently"""
+
+    name = "self_hosted"
+
+    def __init__(self, base_url: str, user_agent: str = USER_AGENT, max_concurrency: int = 8):
+        super().__init__(base_url, user_agent)
+        self.max_concurrency = max_concurrency
+
+class PhotonGeocoder(SelfHostedNominatimGeocoder):
+    """Photon (komoot) geocoder; its GeoJSON answers are converted to the Nominatim result shape"""
+
+    name = "photon"
+
+    def _params(self, query: str, limit: int) -> Dict:
+        return {'q': query, 'limit': limit}
+
+    def _to_nominatim(self, payload: Dict) -> List[Dict]:
+        results = []
+        for feature in payload.get('features', []):
+            props = feature.get('properties', {})
+            lon, lat = feature.get('geometry', {}).get('coordinates', [None, None])[:2]
+            parts = [props.get(k) for k in ('name', 'city', 'state', 'country') if props.get(k)]
+            results.append({
+                'display_name': ", ".join(dict.fromkeys(parts)) or 'Unknown',
+                'lat': lat,
+                'lon': lon,
+                'class': props.get('osm_key', 'Unknown'),
+                'type': props.get('osm_value', 'Unknown'),
+                'address': {k: props[k] for k in ('city', 'state', 'country', 'street') if props.get(k)},
+            })
+        return results
+
+    def search(self, query: str, limit: int) -> Optional[List[Dict]]:
+        response = self.http.get(f"{self.base_url}/api", params=self._params(query, limit), headers=self.headers)
+        return self._to_nominatim(response.json()) if response.status_code == 200 else None
+
+    async def asearch(self, query: str, limit: int) -> Optional[List[Dict]]:
+        response = await self.http.aget(f"{self.base_url}/api", params=self._params(query, limit),
+                                        headers=self.headers)
+        return self._to_nominatim(response.json()) if response.status_code == 200 else None
+
+class FixtureGeocoder(Geocoder):
+    """In-process geocoder backed by a dict (or JSON file) of query -> Nominatim-shaped results.
+
+    Useful for tests and offline demos; the whole batch is answered in one pass.
+    """
+
+    name = "fixture"
+
+    def __init__(self, places: Optional[Dict[str, List[Dict]]] = None, path: Optional[str] = None):
+        if path:
+            with open(path, encoding="utf-8") as f:
+                places = json.load(f)
+        self.places = {normalize_key(query): results for query, results in (places or {}).items()}
+        self.calls = 0
+
+    def search(self, query: str, limit: int) -> Optional[List[Dict]]:
+        self.calls += 1
+        return self.places.get(normalize_key(query), [])[:limit]
+
+    def search_many(self, queries: List[str], limit: int) -> List[Optional[List[Dict]]]:
+        self.calls += 1
+        return [self.places.get(normalize_key(query), [])[:limit] for query in queries]
+
+    async def asearch_many(self, queries: List[str], limit: int) -> List[Optional[List[Dict]]]:
+        return self.search_many(queries, limit)
+
+def create_geocoder(geocoder_config: Dict) -> Geocoder:
+    """Build the geocoder selected by `geocoder.backend` in config.yaml"""
+    backend = geocoder_config.get("backend", "nominatim")
+    user_agent = geocoder_config.get("user_agent", USER_AGENT)
+    if backend == "nominatim":
+        return NominatimGeocoder(geocoder_config.get("base_url", "https://nominatim.openstreetmap.org"), user_agent)
+    if backend == "self_hosted":
+        return SelfHostedNominatimGeocoder(geocoder_config["base_url"], user_agent,
+                                           geocoder_config.get("max_concurrency", 8))
+    if backend == "photon":
+        return PhotonGeocoder(geocoder_config["base_url"], user_agent, geocoder_config.get("max_concurrency", 8))
+    if backend == "fixture":
+        return FixtureGeocoder(path=geocoder_config.get("fixture_path"))
+    raise ValueError(f"Unsupported geocoder backend: {backend}")
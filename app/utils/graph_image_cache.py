@@ -0,0 +1,69 @@
+import hashlib
+import os
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+class GraphImageCache:
+    """Renders Mermaid PNGs of compiled graphs once per topology and caches the bytes"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        # Optional on-disk copy so other processes (e.g. visualize_graph.py) reuse the render
+        self.cache_dir = cache_dir
+        self._images: Dict[str, bytes] = {}
+        self._keys = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._render_locks: Dict[str, threading.Lock] = {}
+
+    def topology_key(self, compiled_graph) -> str:
+        """Hash of the graph's Mermaid source, which changes only when nodes or edges change"""
+        key = self._keys.get(compiled_graph)
+        if key is None:
+            mermaid_source = compiled_graph.get_graph().draw_mermaid()
+            key = hashlib.sha256(mermaid_source.encode("utf-8")).hexdigest()
+            self._keys[compiled_graph] = key
+        return key
+
+    def get_png(self, compiled_graph) -> Tuple[str, bytes]:
+        """Return (topology key, PNG bytes), rendering only on the first call for a topology"""
+        key = self.topology_key(compiled_graph)
+        png = self._images.get(key)
+        if png is not None:
+            return key, png
+
+        with self._lock:
+            render_lock = self._render_locks.setdefault(key, threading.Lock())
+
+        # Concurrent callers for the same topology wait for a single render
+        with render_lock:
+            png = self._images.get(key)
+            if png is None:
+                png = self._read_disk(key)
+                if png is None:
+                    png = compiled_graph.get_graph().draw_mermaid_png()
+                    self._write_disk(key, png)
+                self._images[key] = png
+        return key, png
+
+    def _disk_path(self, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"graph-{key}.png")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._disk_path(key)
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                return f.read()
+        return None
+
+    def _write_disk(self, key: str, png: bytes) -> None:
+        path = self._disk_path(key)
+        if not path:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial image
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(png)
+        os.replace(tmp_path, path)
@@ -0,0 +1,206 @@
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from .config_loader import load_config
+from .rate_limiter import get_rate_limiter
+
+# One AsyncClient per running event loop: httpx connection pools are bound to the
+# loop that opened them, and the API server, tests and scripts may run several loops.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+def get_async_client(max_connections: int = 100) -> httpx.AsyncClient:
+    """Return the shared AsyncClient for the current event loop, creating it on first use"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=min(20, max_connections)),
+        )
+        _async_clients[loop] = client
+    return client
+
+async def aclose_async_client() -> None:
+    """Close the shared AsyncClient of the current event loop, if one was created"""
+    client: Optional[httpx.AsyncClient] = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class HostStats:
+    """Latency and error counters for one upstream host, safe to update from worker threads"""
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, error: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            if error:
+                self.errors += 1
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "errors": self.errors,
+                "avg_latency_ms": round(self.total_seconds / self.requests * 1000, 1) if self.requests else 0.0,
+                "max_latency_ms": round(self.max_seconds * 1000, 1),
+            }
+
+class HttpClient:
+    """Shared HTTP layer for the upstream utilities (Nominatim, OpenWeatherMap, exchange rates).
+
+    Sync calls go through one pooled requests.Session per host and async calls
+    through the shared AsyncClient. Every GET gets connect/read timeouts, waits
+    on the host's rate limiter when one is configured, and is retried a bounded
+    number of times with jittered exponential backoff on connection errors,
+    timeouts and 429/5xx responses. The last response is returned as-is so
+    callers keep their own status handling; the last exception is re-raised.
+    """
+
+    def __init__(self, connect_timeout: float = 5.0, read_timeout: float = 10.0, max_retries: int = 2,
+                 backoff_base: float = 0.5, backoff_max: float = 4.0, pool_maxsize: int = 20, gzip: bool = True):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_maxsize = pool_maxsize
+        self.gzip = gzip
+        self._sessions: Dict[str, requests.Session] = {}
+        self._sessions_pid = os.getpid()
+        self._host_stats: Dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, http_config: Dict) -> "HttpClient":
+        return cls(
+            connect_timeout=http_config.get("connect_timeout_seconds", 5.0),
+            read_timeout=http_config.get("read_timeout_seconds", 10.0),
+            max_retries=http_config.get("max_retries", 2),
+            backoff_base=http_config.get("backoff_base_seconds", 0.5),
+            backoff_max=http_config.get("backoff_max_seconds", 4.0),
+            pool_maxsize=http_config.get("pool_maxsize", 20),
+            gzip=http_config.get("gzip", True),
+        )
+
+    def _session(self, host: str) -> requests.Session:
+        with self._lock:
+            # Sockets must not be shared with the parent after a fork
+            if self._sessions_pid != os.getpid():
+                self._sessions, self._sessions_pid = {}, os.getpid()
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def _stats_for(self, host: str) -> HostStats:
+        stats = self._host_stats.get(host)
+        if stats is None:
+            with self._lock:
+                stats = self._host_stats.setdefault(host, HostStats())
+        return stats
+
+    def _headers(self, headers: Optional[Dict]) -> Dict:
+        headers = dict(headers or {})
+        if not self.gzip:
+            headers.setdefault("Accept-Encoding", "identity")
+        return headers
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps retries from many workers from arriving in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> requests.Response:
+        """GET with pooling, timeouts, rate limiting and bounded retries"""
+        host = urlparse(url).hostname
+        stats = self._stats_for(host)
+        limiter = get_rate_limiter(host)
+        session = self._session(host)
+        for attempt in range(self.max_retries + 1):
+            if limiter:
+                limiter.acquire()
+            start = time.monotonic()
+            try:
+                response = session.get(url, params=params, headers=self._headers(headers),
+                                       timeout=(self.connect_timeout, self.read_timeout))
+            except (requests.ConnectionError, requests.Timeout):
+                stats.record(time.monotonic() - start, error=True)
+                if attempt == self.max_retries:
+                    raise
+            else:
+                retryable = response.status_code in RETRY_STATUSES
+                stats.record(time.monotonic() - start, error=retryable)
+                if not retryable or attempt == self.max_retries:
+                    return response
+            stats.record_retry()
+            time.sleep(self._backoff(attempt))
+
+    async def aget(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> httpx.Response:
+        """Async variant of get using the shared AsyncClient"""
+        host = urlparse(url).hostname
+        stats = self._stats_for(host)
+        limiter = get_rate_limiter(host)
+        timeout = httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+        for attempt in range(self.max_retries + 1):
+            if limiter:
+                await limiter.aacquire()
+            start = time.monotonic()
+            try:
+                response = await get_async_client(self.pool_maxsize).get(url, params=params, headers=self._headers(headers),
+                                                         timeout=timeout)
+            except httpx.TransportError:
+                stats.record(time.monotonic() - start, error=True)
+                if attempt == self.max_retries:
+                    raise
+            else:
+                retryable = response.status_code in RETRY_STATUSES
+                stats.record(time.monotonic() - start, error=retryable)
+                if not retryable or attempt == self.max_retries:
+                    return response
+            stats.record_retry()
+            await asyncio.sleep(self._backoff(attempt))
+
+    def stats(self) -> Dict:
+        return {host: stats.stats() for host, stats in self._host_stats.items()}
+
+_http_client: Optional[HttpClient] = None
+_http_client_lock = threading.Lock()
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide HttpClient configured from the `http` section of config.yaml"""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = HttpClient.from_config(load_config().get("http", {}))
+    return _http_client
@@ -5,7 +5,7 @@ from pydantic import BaseModel, Field
 from .config_loader import load_config
 from langchain_groq import ChatGroq
 from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_google_genai import ChatGoogleGenerativeAI, create_context_cache
 
 
 class ConfigLoader:
@@ -107,3 +107,22 @@ class ModelLoader(BaseModel):
         except Exception as e:
             print(f"❌ Failed to load OpenAI: {str(e)}")
             raise
+    
+    def supports_context_cache(self, llm) -> bool:
+        """Explicit prefix caching is available for Gemini models (not for a Groq fallback)"""
+        return isinstance(llm, ChatGoogleGenerativeAI)
+    
+    def create_context_cache(self, llm, system_prompt, tools, ttl_seconds: int) -> str:
+        """Cache the system prompt and tool schemas on the provider side and return the cache name"""
+        return create_context_cache(llm, [system_prompt], ttl=f"{ttl_seconds}s", tools=tools)
+    
+    def load_cached_llm(self, cache_name: str):
+        """Load a Gemini model that reads its system prompt and tools from a context cache"""
+        model_name = self.config["llm"]["google"]["model_name"]
+        # Tools and system instruction live in the cache, so this model must not be bound to tools again
+        return ChatGoogleGenerativeAI(
+            model=model_name,
+            google_api_key=os.getenv("GOOGLE_API_KEY"),
+            temperature=0.7,
+            cached_content=cache_name
+        )
@@ -1,161 +1,351 @@
-import requests
+import asyncio
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, List, Optional
-import time
+from .geocoders import Geocoder, create_geocoder
+from .single_flight import get_single_flight
+from .refresher import get_refresher
+from .cache import get_shared_cache, normalize_key
+from .place_record import PlaceRecord
+from .config_loader import load_config
+from .poi_index import get_poi_index
+from ..logger.logging import logger
+
+# Shared pool for get_travel_info legs; not a context manager so a timed-out leg never blocks the caller
+_fanout_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="travel-info")
 
 class PlaceInfoSearch:
-    """Place information search using free OpenStreetMap Nominatim API"""
-    
-    def __init__(self):
-        self.base_url = "https://nominatim.openstreetmap.org"
-        self.headers = {
-            'User-Agent': 'AI_Trip_Planner/1.0 (educational_project)'
-        }
-        
-    def search_place(self, query: str, limit: int = 5) -> List[Dict]:
+    """Place information search on top of a geocoder backend (public Nominatim by default,
+    or self-hosted Nominatim, Photon or a fixture, chosen under `geocoder` in config.yaml).
+
+    With places.backend set to "poi_index", attractions, restaurants and hotels are
+    answered from an offline spatial index (see app/utils/poi_index.py) around the
+    geocoded place instead of Nominatim free-text queries.
+    """
+
+    def __init__(self, leg_timeout: Optional[float] = None, geocoder: Optional[Geocoder] = None):
+        config = load_config()
+        self.geocoder = geocoder or create_geocoder(config.get("geocoder", {}))
+        # Shared by every instance in the process, backed by SQLite across restarts and workers
+        self.cache = get_shared_cache("geocode")
+        self.flights = get_single_flight("geocoder")
+        # Serves stale geocodes while reloading them, and reloads popular places before they expire
+        self.refresher = get_refresher("geocode")
+        places_config = config.get("places", {})
+        if leg_timeout is None:
+            leg_timeout = places_config.get("leg_timeout_seconds", 10)
+        self.leg_timeout = leg_timeout
+        # Optional offline index for attractions, restaurants and hotels; the place itself is still geocoded
+        self.poi_index = None
+        self.poi_radius_km = places_config.get("poi_radius_km", 10)
+        if places_config.get("backend", "nominatim") == "poi_index":
+            try:
+                self.poi_index = get_poi_index(places_config["poi_index_path"])
+            except Exception as e:
+                logger.warning(f"POI index unavailable, using Nominatim text search: {e}")
+
+    def _cached(self, key: str, query: str, limit: int) -> Optional[List]:
+        """Cached rows for a search (possibly stale while a background reload runs), or None"""
+        return self.refresher.lookup(self.cache, key, partial(self.flights.do, key, self._fetch, key, query, limit))
+
+    async def _acached(self, key: str, query: str, limit: int) -> Optional[List]:
+        """Async variant of _cached"""
+        return await self.refresher.alookup(self.cache, key,
+                                            partial(self.flights.do, key, self._fetch, key, query, limit))
+
+    def _search(self, query: str, limit: int) -> List[PlaceRecord]:
+        """Run a geocoder search and return the matching places, served from cache when possible"""
+        key = normalize_key(query, limit)
+        cached = self._cached(key, query, limit)
+        if cached is not None:
+            return [PlaceRecord.from_row(row) for row in cached]
+        # Concurrent misses for the same query share one upstream call
+        return self.flights.do(key, self._fetch, key, query, limit)
+
+    async def _asearch(self, query: str, limit: int) -> List[PlaceRecord]:
+        """Async variant of _search"""
+        key = normalize_key(query, limit)
+        cached = await self._acached(key, query, limit)
+        if cached is not None:
+            return [PlaceRecord.from_row(row) for row in cached]
+        return await self.flights.ado(key, self._afetch, key, query, limit)
+
+    def _parse(self, key: str, results: Optional[List[Dict]]) -> List[PlaceRecord]:
+        """Project raw results onto PlaceRecords and cache them"""
+        places = [PlaceRecord.from_nominatim(result) for result in results or []]
+        # Empty results and backend errors are not cached so a transient miss is retried next time
+        if places:
+            self.cache.set(key, [place.to_row() for place in places])
+        return places
+
+    async def _aparse(self, key: str, results: Optional[List[Dict]]) -> List[PlaceRecord]:
+        """Async variant of _parse"""
+        places = [PlaceRecord.from_nominatim(result) for result in results or []]
+        if places:
+            await self.cache.aset(key, [place.to_row() for place in places])
+        return places
+
+    def _fetch(self, key: str, query: str, limit: int) -> List[PlaceRecord]:
+        return self._parse(key, self.geocoder.search(query, limit))
+
+    async def _afetch(self, key: str, query: str, limit: int) -> List[PlaceRecord]:
+        return await self._aparse(key, await self.geocoder.asearch(query, limit))
+
+    def search_place(self, query: str, limit: int = 5) -> List[PlaceRecord]:
         """Search for places using query"""
         try:
-            url = f"{self.base_url}/search"
-            params = {
-                'q': query,
-                'format': 'json',
-                'limit': limit,
-                'addressdetails': 1,
-                'extratags': 1
-            }
-            
-            response = requests.get(url, params=params, headers=self.headers)
-            time.sleep(1)  # Be respectful to free API
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return []
-                
+            return self._search(query, limit)
         except Exception as e:
             print(f"Error searching place: {e}")
             return []
-    
-    def get_place_details(self, place_name: str) -> Dict:
-        """Get detailed information about a place"""
+
+    async def asearch_place(self, query: str, limit: int = 5) -> List[PlaceRecord]:
+        """Async variant of search_place"""
+        try:
+            return await self._asearch(query, limit)
+        except Exception as e:
+            print(f"Error searching place: {e}")
+            return []
+
+    def get_place_details(self, place_name: str) -> Optional[PlaceRecord]:
+        """Get detailed information about a place (the best match), or None if not found"""
         try:
             places = self.search_place(place_name, limit=1)
-            if places:
-                place = places[0]
-                return {
-                    'name': place.get('display_name', 'Unknown'),
-                    'latitude': place.get('lat', ''),
-                    'longitude': place.get('lon', ''),
-                    'type': place.get('type', 'Unknown'),
-                    'category': place.get('class', 'Unknown'),
-                    'importance': place.get('importance', 0),
-                    'address': place.get('address', {}),
-                    'country': place.get('address', {}).get('country', 'Unknown'),
-                    'state': place.get('address', {}).get('state', 'Unknown'),
-                    'city': place.get('address', {}).get('city', 'Unknown')
-                }
-            else:
-                return {}
-                
+            return places[0] if places else None
         except Exception as e:
             print(f"Error getting place details: {e}")
-            return {}
-    
-    def search_nearby_attractions(self, place_name: str) -> List[Dict]:
-        """Search for tourist attractions near a place"""
+            return None
+
+    async def aget_place_details(self, place_name: str) -> Optional[PlaceRecord]:
+        """Async variant of get_place_details"""
+        try:
+            places = await self.asearch_place(place_name, limit=1)
+            return places[0] if places else None
+        except Exception as e:
+            print(f"Error getting place details: {e}")
+            return None
+
+    def _distinct_keys(self, place_names: List[str]) -> Dict[str, str]:
+        """Normalized key -> first spelling of each distinct place name, in input order"""
+        keys: Dict[str, str] = {}
+        for name in place_names:
+            keys.setdefault(normalize_key(name, 1), name)
+        return keys
+
+    def cached_place_details(self, place_name: str) -> Optional[PlaceRecord]:
+        """Best match for a place if it is already in the geocode cache; never calls the geocoder"""
+        rows = self.cache.get(normalize_key(place_name, 1))
+        return PlaceRecord.from_row(rows[0]) if rows else None
+
+    async def acached_place_details(self, place_name: str) -> Optional[PlaceRecord]:
+        """Async variant of cached_place_details"""
+        rows = await self.cache.aget(normalize_key(place_name, 1))
+        return PlaceRecord.from_row(rows[0]) if rows else None
+
+    def _split_cached(self, keys: Dict[str, str], cached: List[Optional[List]]):
+        """Split distinct keys into cached best matches and the names still to geocode"""
+        found: Dict[str, Optional[PlaceRecord]] = {}
+        missing: Dict[str, str] = {}
+        for (key, name), rows in zip(keys.items(), cached):
+            if rows is not None:
+                found[key] = PlaceRecord.from_row(rows[0])
+            else:
+                missing[key] = name
+        return found, missing
+
+    def _cached_or_missing(self, place_names: List[str]):
+        """Split place names into cached best matches and the distinct normalized names still to geocode"""
+        keys = self._distinct_keys(place_names)
+        return self._split_cached(keys, [self._cached(key, name, 1) for key, name in keys.items()])
+
+    async def _acached_or_missing(self, place_names: List[str]):
+        """Async variant of _cached_or_missing"""
+        keys = self._distinct_keys(place_names)
+        cached = await asyncio.gather(*(self._acached(key, name, 1) for key, name in keys.items()))
+        return self._split_cached(keys, cached)
+
+    def _geocoded(self, place_names: List[str], found: Dict, missing: Dict,
+                  parsed: List[List[PlaceRecord]]) -> Dict[str, Optional[PlaceRecord]]:
+        for key, places in zip(missing, parsed):
+            found[key] = places[0] if places else None
+        return {name: found[normalize_key(name, 1)] for name in place_names}
+
+    def geocode_many(self, place_names: List[str]) -> Dict[str, Optional[PlaceRecord]]:
+        """Geocode several places (e.g. itinerary stops) in one pass.
+
+        Cached places are served locally; the rest go to the backend as one batch.
+        Returns {place name: best match or None}.
+        """
+        try:
+            found, missing = self._cached_or_missing(place_names)
+            results = self.geocoder.search_many(list(missing.values()), 1) if missing else []
+            parsed = [self._parse(key, raw) for key, raw in zip(missing, results)]
+            return self._geocoded(place_names, found, missing, parsed)
+        except Exception as e:
+            print(f"Error geocoding places: {e}")
+            return {name: None for name in place_names}
+
+    async def ageocode_many(self, place_names: List[str]) -> Dict[str, Optional[PlaceRecord]]:
+        """Async variant of geocode_many"""
+        try:
+            found, missing = await self._acached_or_missing(place_names)
+            results = await self.geocoder.asearch_many(list(missing.values()), 1) if missing else []
+            parsed = await asyncio.gather(*(self._aparse(key, raw) for key, raw in zip(missing, results)))
+            return self._geocoded(place_names, found, missing, parsed)
+        except Exception as e:
+            print(f"Error geocoding places: {e}")
+            return {name: None for name in place_names}
+
+    def _has_coordinates(self, place_details: Optional[PlaceRecord]) -> bool:
+        return place_details is not None and place_details.has_coordinates
+
+    def _index_query(self, category: str, place_details: Optional[PlaceRecord]) -> List[PlaceRecord]:
+        """POIs of a category around the geocoded place, from the offline index"""
+        if not self._has_coordinates(place_details):
+            return []
+        return self.poi_index.query(place_details.lat, place_details.lon, category,
+                                    radius_km=self.poi_radius_km, limit=10)
+
+    def search_nearby_attractions(self, place_name: str, place_details: Optional[PlaceRecord] = None) -> List[PlaceRecord]:
+        """Search for tourist attractions near a place; pass place_details to skip geocoding again"""
         try:
             # First get the place coordinates
-            place_details = self.get_place_details(place_name)
-            if not place_details:
+            if place_details is None:
+                place_details = self.get_place_details(place_name)
+            if not self._has_coordinates(place_details):
                 return []
-            
-            lat = place_details.get('latitude')
-            lon = place_details.get('longitude')
-            
-            if not lat or not lon:
-                return []
-            
+            if self.poi_index is not None:
+                return self._index_query('attraction', place_details)
+
             # Search for tourist attractions nearby
-            url = f"{self.base_url}/search"
-            params = {
-                'q': f'tourist attraction near {place_name}',
-                'format': 'json',
-                'limit': 10,
-                'addressdetails': 1
-            }
-            
-            response = requests.get(url, params=params, headers=self.headers)
-            time.sleep(1)  # Be respectful to free API
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
+            return self._search(f'tourist attraction near {place_name}', limit=10)
+        except Exception as e:
+            print(f"Error searching nearby attractions: {e}")
+            return []
+
+    async def asearch_nearby_attractions(self, place_name: str, place_details: Optional[PlaceRecord] = None) -> List[PlaceRecord]:
+        """Async variant of search_nearby_attractions"""
+        try:
+            if place_details is None:
+                place_details = await self.aget_place_details(place_name)
+            if not self._has_coordinates(place_details):
                 return []
-                
+            if self.poi_index is not None:
+                return self._index_query('attraction', place_details)
+
+            return await self._asearch(f'tourist attraction near {place_name}', limit=10)
         except Exception as e:
             print(f"Error searching nearby attractions: {e}")
             return []
-    
-    def search_restaurants(self, place_name: str) -> List[Dict]:
+
+    def search_restaurants(self, place_name: str, place_details: Optional[PlaceRecord] = None) -> List[PlaceRecord]:
         """Search for restaurants in a place"""
         try:
-            url = f"{self.base_url}/search"
-            params = {
-                'q': f'restaurant {place_name}',
-                'format': 'json',
-                'limit': 10,
-                'addressdetails': 1
-            }
-            
-            response = requests.get(url, params=params, headers=self.headers)
-            time.sleep(1)  # Be respectful to free API
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return []
-                
+            if self.poi_index is not None:
+                return self._index_query('restaurant', place_details or self.get_place_details(place_name))
+            return self._search(f'restaurant {place_name}', limit=10)
+        except Exception as e:
+            print(f"Error searching restaurants: {e}")
+            return []
+
+    async def asearch_restaurants(self, place_name: str, place_details: Optional[PlaceRecord] = None) -> List[PlaceRecord]:
+        """Async variant of search_restaurants"""
+        try:
+            if self.poi_index is not None:
+                return self._index_query('restaurant', place_details or await self.aget_place_details(place_name))
+            return await self._asearch(f'restaurant {place_name}', limit=10)
         except Exception as e:
             print(f"Error searching restaurants: {e}")
             return []
-    
-    def search_hotels(self, place_name: str) -> List[Dict]:
+
+    def search_hotels(self, place_name: str, place_details: Optional[PlaceRecord] = None) -> List[PlaceRecord]:
         """Search for hotels in a place"""
         try:
-            url = f"{self.base_url}/search"
-            params = {
-                'q': f'hotel {place_name}',
-                'format': 'json',
-                'limit': 10,
-                'addressdetails': 1
-            }
-            
-            response = requests.get(url, params=params, headers=self.headers)
-            time.sleep(1)  # Be respectful to free API
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return []
-                
+            if self.poi_index is not None:
+                return self._index_query('hotel', place_details or self.get_place_details(place_name))
+            return self._search(f'hotel {place_name}', limit=10)
         except Exception as e:
             print(f"Error searching hotels: {e}")
             return []
-    
+
+    async def asearch_hotels(self, place_name: str, place_details: Optional[PlaceRecord] = None) -> List[PlaceRecord]:
+        """Async variant of search_hotels"""
+        try:
+            if self.poi_index is not None:
+                return self._index_query('hotel', place_details or await self.aget_place_details(place_name))
+            return await self._asearch(f'hotel {place_name}', limit=10)
+        except Exception as e:
+            print(f"Error searching hotels: {e}")
+            return []
+
+    def _travel_info(self, place_details: Optional[PlaceRecord], legs: Dict[str, List[PlaceRecord]],
+                     timed_out: List[str]) -> Dict:
+        info = {'place_details': place_details}
+        for category in ('attractions', 'restaurants', 'hotels'):
+            info[category] = legs.get(category, [])[:5]  # Top 5 of each
+        if timed_out:
+            info['timed_out'] = timed_out
+        return info
+
     def get_travel_info(self, place_name: str) -> Dict:
-        """Get comprehensive travel information about a place"""
+        """Get comprehensive travel information about a place.
+
+        The place is geocoded once; the category searches then run concurrently
+        (paced by the host rate limiter) and any leg that exceeds leg_timeout is
+        reported in 'timed_out' with an empty result instead of failing the lookup.
+        A place that cannot be geocoded returns empty categories without further lookups.
+        """
         try:
             place_details = self.get_place_details(place_name)
-            attractions = self.search_nearby_attractions(place_name)
-            restaurants = self.search_restaurants(place_name)
-            hotels = self.search_hotels(place_name)
-            
-            return {
-                'place_details': place_details,
-                'attractions': attractions[:5],  # Top 5 attractions
-                'restaurants': restaurants[:5],  # Top 5 restaurants
-                'hotels': hotels[:5]  # Top 5 hotels
+            if place_details is None:
+                # Not found; the legs would only geocode the same name again
+                return self._travel_info(None, {}, [])
+            futures = {
+                'attractions': _fanout_executor.submit(self.search_nearby_attractions, place_name, place_details),
+                'restaurants': _fanout_executor.submit(self.search_restaurants, place_name, place_details),
+                'hotels': _fanout_executor.submit(self.search_hotels, place_name, place_details),
             }
-            
+            wait(futures.values(), timeout=self.leg_timeout)
+
+            legs, timed_out = {}, []
+            for category, future in futures.items():
+                if future.done():
+                    legs[category] = future.result()
+                else:
+                    future.cancel()
+                    timed_out.append(category)
+            return self._travel_info(place_details, legs, timed_out)
+
+        except Exception as e:
+            print(f"Error getting travel info: {e}")
+            return {}
+
+    async def aget_travel_info(self, place_name: str) -> Dict:
+        """Async variant of get_travel_info"""
+        try:
+            place_details = await self.aget_place_details(place_name)
+            if place_details is None:
+                return self._travel_info(None, {}, [])
+            legs = {
+                'attractions': self.asearch_nearby_attractions(place_name, place_details),
+                'restaurants': self.asearch_restaurants(place_name, place_details),
+                'hotels': self.asearch_hotels(place_name, place_details),
+            }
+            results = await asyncio.gather(
+                *(asyncio.wait_for(leg, timeout=self.leg_timeout) for leg in legs.values()),
+                return_exceptions=True,
+            )
+
+            completed, timed_out = {}, []
+            for category, result in zip(legs, results):
+                if isinstance(result, asyncio.TimeoutError):
+                    timed_out.append(category)
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    completed[category] = result
+            return self._travel_info(place_details, completed, timed_out)
+
         except Exception as e:
             print(f"Error getting travel info: {e}")
             return {}
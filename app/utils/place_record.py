@@ -0,0 +1,65 @@
+from typing import Dict, List, Optional
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+class PlaceRecord:
+    """A place reduced to the fields the tools use.
+
+    Nominatim results are projected onto this record as soon as they are parsed,
+    so the nested address/extratags dicts are never kept around. Records are
+    serialized to a flat list for the caches.
+    """
+
+    __slots__ = ("name", "lat", "lon", "type", "category", "importance", "city", "state", "country", "road")
+
+    def __init__(self, name: str, lat: Optional[float], lon: Optional[float], type: str = "Unknown",
+                 category: str = "Unknown", importance: float = 0.0, city: str = "Unknown",
+                 state: str = "Unknown", country: str = "Unknown", road: str = ""):
+        self.name = name
+        self.lat = lat
+        self.lon = lon
+        self.type = type
+        self.category = category
+        self.importance = importance
+        self.city = city
+        self.state = state
+        self.country = country
+        self.road = road
+
+    @classmethod
+    def from_nominatim(cls, result: Dict) -> "PlaceRecord":
+        address = result.get('address') or {}
+        return cls(
+            name=result.get('display_name', 'Unknown'),
+            lat=_to_float(result.get('lat')),
+            lon=_to_float(result.get('lon')),
+            type=result.get('type', 'Unknown'),
+            category=result.get('class', 'Unknown'),
+            importance=_to_float(result.get('importance')) or 0.0,
+            city=address.get('city', 'Unknown'),
+            state=address.get('state', 'Unknown'),
+            country=address.get('country', 'Unknown'),
+            road=address.get('road', address.get('street', '')),
+        )
+
+    @property
+    def has_coordinates(self) -> bool:
+        return self.lat is not None and self.lon is not None
+
+    def to_row(self) -> List:
+        """Flat list form used for cache storage"""
+        return [getattr(self, field) for field in self.__slots__]
+
+    @classmethod
+    def from_row(cls, row: List) -> "PlaceRecord":
+        return cls(*row)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PlaceRecord) and self.to_row() == other.to_row()
+
+    def __repr__(self) -> str:
+        return f"PlaceRecord(name={self.name!r}, lat={self.lat}, lon={self.lon}, type={self.type!r})"
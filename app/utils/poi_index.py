@@ -0,0 +1,302 @@
+import argparse
+import csv
+import json
+import math
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from .place_record import PlaceRecord
+from ..logger.logging import logger
+
+CATEGORIES = ("attraction", "restaurant", "hotel")
+
+# OSM tag values that place a POI in one of the categories above
+_OSM_CATEGORIES = {
+    ("tourism", "attraction"): "attraction",
+    ("tourism", "museum"): "attraction",
+    ("tourism", "viewpoint"): "attraction",
+    ("tourism", "gallery"): "attraction",
+    ("tourism", "artwork"): "attraction",
+    ("tourism", "theme_park"): "attraction",
+    ("tourism", "zoo"): "attraction",
+    ("amenity", "restaurant"): "restaurant",
+    ("amenity", "cafe"): "restaurant",
+    ("amenity", "fast_food"): "restaurant",
+    ("amenity", "food_court"): "restaurant",
+    ("tourism", "hotel"): "hotel",
+    ("tourism", "hostel"): "hotel",
+    ("tourism", "guest_house"): "hotel",
+    ("tourism", "motel"): "hotel",
+}
+
+EARTH_RADIUS_KM = 6371.0
+
+def classify(tags: Dict) -> Optional[Tuple[str, str]]:
+    """Return (category, osm type) for a tag dict, or None if the POI is not indexed"""
+    if tags.get("category") in CATEGORIES:
+        return tags["category"], tags.get("type") or tags["category"]
+    for (key, value), category in _OSM_CATEGORIES.items():
+        if tags.get(key) == value:
+            return category, value
+    if tags.get("historic"):
+        return "attraction", tags["historic"]
+    return None
+
+def read_pois(path: str) -> Iterable[Dict]:
+    """Yield {name, lat, lon, category, type, road} from a GeoJSON or CSV extract.
+
+    GeoJSON features need Point geometry and OSM tags as properties. CSV rows need
+    name, lat and lon columns plus either a category column or OSM tag columns
+    (tourism, amenity, historic).
+    """
+    if path.endswith((".geojson", ".json")):
+        with open(path, encoding="utf-8") as f:
+            features = json.load(f).get("features", [])
+        rows = []
+        for feature in features:
+            geometry = feature.get("geometry") or {}
+            if geometry.get("type") != "Point":
+                continue
+            props = dict(feature.get("properties") or {})
+            # Points without usable coordinates are left to the lat/lon check below
+            coordinates = geometry.get("coordinates") or []
+            if len(coordinates) >= 2:
+                props["lon"], props["lat"] = coordinates[:2]
+            rows.append(props)
+    else:
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+
+    skipped = 0
+    for row in rows:
+        name = row.get("name")
+        match = classify(row)
+        if not name or match is None:
+            continue
+        try:
+            lat, lon = float(row.get("lat")), float(row.get("lon"))
+        except (TypeError, ValueError):
+            skipped += 1
+            continue
+        yield {
+            "name": name,
+            "lat": lat,
+            "lon": lon,
+            "category": match[0],
+            "type": match[1],
+            "road": row.get("addr:street") or row.get("road") or "",
+        }
+    if skipped:
+        logger.warning(f"Skipped {skipped} POIs with missing or malformed coordinates in {path}")
+
+class PackedStrings:
+    """A read-only list of strings stored as one UTF-8 buffer plus an offsets array.
+
+    Every string costs its own length in bytes, unlike a fixed-width numpy string
+    array where each row is as wide as the longest one.
+    """
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_list(cls, strings: Iterable[str]) -> "PackedStrings":
+        encoded = [str(value).encode("utf-8") for value in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + self.offsets.nbytes
+
+def _grid_columns(cell_size: float) -> int:
+    """Number of grid columns spanning 360 degrees of longitude"""
+    return int(math.ceil(360 / cell_size))
+
+def _cell_ids(lat, lon, cell_size: float) -> np.ndarray:
+    row = np.floor((np.asarray(lat, dtype=np.float64) + 90) / cell_size).astype(np.int64)
+    col = np.floor((np.asarray(lon, dtype=np.float64) + 180) / cell_size).astype(np.int64)
+    # One spare column for points exactly on +180
+    return row * (_grid_columns(cell_size) + 1) + col
+
+class POIIndex:
+    """Grid index over POI coordinates held in flat numpy arrays.
+
+    Points are bucketed into cells of cell_size degrees and stored sorted by cell,
+    so a radius query only looks at the handful of cells overlapping the search
+    box (binary search per cell row, wrapping across the antimeridian) and ranks
+    the candidates with a vectorised haversine distance. Names, types and roads
+    are PackedStrings.
+    """
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, category: np.ndarray, names: PackedStrings,
+                 types: PackedStrings, roads: PackedStrings, cell_size: float = 0.05):
+        """Columns must already be sorted by grid cell; from_records and load take care of that"""
+        self.cell_size = cell_size
+        self._lon_cols = _grid_columns(cell_size)
+        self._cols = self._lon_cols + 1
+        self.cells = _cell_ids(lat, lon, cell_size)
+        self.lat = lat
+        self.lon = lon
+        self.category = category
+        self.names = names
+        self.types = types
+        self.roads = roads
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], cell_size: float = 0.05) -> "POIIndex":
+        records = list(records)
+        lat = np.array([r["lat"] for r in records], dtype=np.float32)
+        lon = np.array([r["lon"] for r in records], dtype=np.float32)
+        order = np.argsort(_cell_ids(lat, lon, cell_size), kind="stable")
+        records = [records[i] for i in order]
+        return cls(
+            lat[order],
+            lon[order],
+            np.array([CATEGORIES.index(r["category"]) for r in records], dtype=np.uint8),
+            PackedStrings.from_list(r["name"] for r in records),
+            PackedStrings.from_list(r["type"] for r in records),
+            PackedStrings.from_list(r.get("road", "") for r in records),
+            cell_size=cell_size,
+        )
+
+    def save(self, path: str) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        columns = {}
+        for field in ("names", "types", "roads"):
+            packed = getattr(self, field)
+            columns[f"{field}_data"], columns[f"{field}_offsets"] = packed.data, packed.offsets
+        # Write through a file handle so np.savez does not append .npz and load(path) finds the same file
+        with open(path, "wb") as f:
+            np.savez(f, lat=self.lat, lon=self.lon, category=self.category,
+                     cell_size=np.float64(self.cell_size), **columns)
+
+    @classmethod
+    def load(cls, path: str) -> "POIIndex":
+        with np.load(path) as data:
+            strings = [PackedStrings(data[f"{field}_data"], data[f"{field}_offsets"])
+                       for field in ("names", "types", "roads")]
+            return cls(data["lat"], data["lon"], data["category"], *strings, cell_size=float(data["cell_size"]))
+
+    def _column_ranges(self, col_lo: int, col_hi: int) -> List[Tuple[int, int]]:
+        """Split a column range that crosses the antimeridian into ranges inside the grid"""
+        n = self._lon_cols
+        if col_hi - col_lo >= n - 1:
+            return [(0, n)]
+        if col_lo < 0:
+            return [(col_lo + n, n), (0, col_hi)]
+        if col_hi >= n:
+            return [(col_lo, n), (0, col_hi - n)]
+        return [(col_lo, col_hi)]
+
+    def query(self, lat: float, lon: float, category: str, radius_km: float = 10.0,
+              limit: int = 10) -> List[PlaceRecord]:
+        """POIs of a category within radius_km of (lat, lon), nearest first"""
+        lat_span = radius_km / 111.0
+        lon_span = radius_km / (111.0 * max(math.cos(math.radians(lat)), 0.01))
+        row_lo, row_hi = (int(math.floor((v + 90) / self.cell_size)) for v in (lat - lat_span, lat + lat_span))
+        col_lo, col_hi = (int(math.floor((v + 180) / self.cell_size)) for v in (lon - lon_span, lon + lon_span))
+        column_ranges = self._column_ranges(col_lo, col_hi)
+
+        # Cells in one grid row are contiguous ids, so each row is a single sorted slice per column range
+        slices = []
+        for row in range(row_lo, row_hi + 1):
+            for first, last in column_ranges:
+                start = np.searchsorted(self.cells, row * self._cols + first, side="left")
+                end = np.searchsorted(self.cells, row * self._cols + last, side="right")
+                if end > start:
+                    slices.append(np.arange(start, end))
+        if not slices:
+            return []
+        candidates = np.concatenate(slices)
+        candidates = candidates[self.category[candidates] == CATEGORIES.index(category)]
+        if not len(candidates):
+            return []
+
+        distances = self._haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        within = distances <= radius_km
+        candidates, distances = candidates[within], distances[within]
+        nearest = np.argsort(distances)[:limit]
+        return [self._record(candidates[i]) for i in nearest]
+
+    @staticmethod
+    def _haversine_km(lat, lon, lats, lons):
+        lat1, lon1 = math.radians(lat), math.radians(lon)
+        lat2, lon2 = np.radians(lats.astype(np.float64)), np.radians(lons.astype(np.float64))
+        a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+    def _record(self, i: int) -> PlaceRecord:
+        return PlaceRecord(
+            name=self.names[i],
+            lat=round(float(self.lat[i]), 5),  # float32 storage is good to about a metre
+            lon=round(float(self.lon[i]), 5),
+            type=self.types[i],
+            category=CATEGORIES[self.category[i]],
+            road=self.roads[i],
+        )
+
+_indexes: Dict[str, POIIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_poi_index(path: str) -> POIIndex:
+    """Load an index file once per process"""
+    index = _indexes.get(path)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(path)
+            if index is None:
+                index = _indexes[path] = POIIndex.load(path)
+    return index
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build or query the offline POI index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Build an index from an OSM GeoJSON or CSV extract")
+    build.add_argument("source", help="Path to a .geojson/.json or .csv extract")
+    build.add_argument("output", help="Path of the .npz index to write")
+    build.add_argument("--cell-size", type=float, default=0.05, help="Grid cell size in degrees (default: 0.05)")
+
+    query = subparsers.add_parser("query", help="Query an index")
+    query.add_argument("index")
+    query.add_argument("lat", type=float)
+    query.add_argument("lon", type=float)
+    query.add_argument("category", choices=CATEGORIES)
+    query.add_argument("--radius-km", type=float, default=10.0)
+    query.add_argument("--limit", type=int, default=10)
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        start = time.perf_counter()
+        index = POIIndex.from_records(read_pois(args.source), cell_size=args.cell_size)
+        index.save(args.output)
+        counts = {c: int((index.category == i).sum()) for i, c in enumerate(CATEGORIES)}
+        print(f"Indexed {len(index)} POIs {counts} into {args.output} in {time.perf_counter() - start:.1f}s")
+    else:
+        index = POIIndex.load(args.index)
+        start = time.perf_counter()
+        results = index.query(args.lat, args.lon, args.category, args.radius_km, args.limit)
+        elapsed_us = (time.perf_counter() - start) * 1e6
+        for place in results:
+            print(f"{place.name} ({place.type}) at {place.lat:.5f}, {place.lon:.5f}")
+        print(f"{len(results)} results in {elapsed_us:.0f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+from ..logger.logging import logger
+
+class PromptCacheStats:
+    """Counts how much of the model input was served from the provider's prompt cache"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.cache_hits = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+
+    def record(self, response) -> None:
+        """Read token usage from an AIMessage; providers report cached input as input_token_details.cache_read"""
+        usage = getattr(response, "usage_metadata", None) or {}
+        cache_read = (usage.get("input_token_details") or {}).get("cache_read") or 0
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += usage.get("input_tokens", 0) or 0
+            self.cached_tokens += cache_read
+            if cache_read:
+                self.cache_hits += 1
+
+    def stats(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "hit_rate": round(self.cache_hits / self.calls, 3) if self.calls else 0.0,
+            "input_tokens": self.input_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cached_token_ratio": round(self.cached_tokens / self.input_tokens, 3) if self.input_tokens else 0.0,
+        }
+
+class ContextCache:
+    """Explicit provider-side cache of the static prompt prefix (system prompt plus tool schemas).
+
+    The cache is created with a TTL and recreated shortly before it expires. Any
+    failure leaves the caller on the regular uncached path.
+    """
+
+    def __init__(self, model_loader, llm, system_prompt, tools, ttl_seconds: int = 3600,
+                 refresh_margin_seconds: int = 60):
+        self.model_loader = model_loader
+        self.llm = llm
+        self.system_prompt = system_prompt
+        self.tools = tools
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.cache_name: Optional[str] = None
+        self._cached_llm = None
+        self._expires_at = 0.0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def _needs_refresh(self) -> bool:
+        now = time.monotonic()
+        return now >= self._expires_at - self.refresh_margin_seconds and now >= self._retry_at
+
+    def _refresh(self) -> None:
+        with self._lock:
+            if not self._needs_refresh():
+                return
+            try:
+                self.cache_name = self.model_loader.create_context_cache(
+                    self.llm, self.system_prompt, self.tools, self.ttl_seconds
+                )
+                self._cached_llm = self.model_loader.load_cached_llm(self.cache_name)
+                self._expires_at = time.monotonic() + self.ttl_seconds
+                logger.info(f"Created prompt context cache {self.cache_name}")
+            except Exception as e:
+                # e.g. prefix below the provider's minimum cacheable size; retry later
+                logger.warning(f"Prompt context cache unavailable, using uncached prompts: {e}")
+                self._cached_llm = None
+                self._retry_at = time.monotonic() + self.ttl_seconds
+
+    def get_llm(self):
+        """Return an LLM bound to the cached prefix, or None if no valid cache exists"""
+        if self._needs_refresh():
+            self._refresh()
+        return self._cached_llm if time.monotonic() < self._expires_at else None
+
+    async def aget_llm(self):
+        """Async variant of get_llm; cache creation runs off the event loop"""
+        if self._needs_refresh():
+            await asyncio.to_thread(self._refresh)
+        return self._cached_llm if time.monotonic() < self._expires_at else None
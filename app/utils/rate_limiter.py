@@ -0,0 +1,144 @@
+import asyncio
+import os
+import struct
+import threading
+import time
+from typing import Dict, Optional
+from .config_loader import load_config
+from ..logger.logging import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: buckets are shared between threads only
+    fcntl = None
+
+_STATE = struct.Struct("dd")  # tokens, last refill time
+
+class TokenBucket:
+    """Token-bucket rate limiter for one upstream host.
+
+    Callers reserve a token and only sleep when the bucket is empty, for exactly as
+    long as it takes to refill. Reservations may drive the balance negative, so
+    concurrent callers queue up behind each other instead of all waking at once.
+    With a state_path the balance lives in a small file guarded by flock, which
+    makes the budget shared by every worker process on the machine.
+    """
+
+    def __init__(self, rate_per_second: float, burst: float = 1, state_path: Optional[str] = None,
+                 name: str = "bucket"):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.state_path = state_path if fcntl is not None else None
+        self.name = name
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last = time.time()
+        self._fd: Optional[int] = None
+        self._fd_pid: Optional[int] = None
+        if self.state_path and os.path.dirname(self.state_path):
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+
+        self.acquired = 0
+        self.delayed = 0
+        self.total_wait_seconds = 0.0
+
+    def _state_fd(self) -> int:
+        # Reopen after fork so each worker holds its own descriptor (and lock)
+        if self._fd is None or self._fd_pid != os.getpid():
+            self._fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._fd_pid = os.getpid()
+        return self._fd
+
+    def _take(self, tokens: float, last: float, now: float, queue: bool = True):
+        tokens = min(self.burst, tokens + max(0.0, now - last) * self.rate_per_second)
+        if tokens < 1 and not queue:
+            return tokens, None
+        tokens -= 1
+        wait = -tokens / self.rate_per_second if tokens < 0 else 0.0
+        return tokens, wait
+
+    def _reserve(self, queue: bool) -> Optional[float]:
+        now = time.time()
+        with self._lock:
+            if not self.state_path:
+                self._tokens, wait = self._take(self._tokens, self._last, now, queue)
+                self._last = now
+            else:
+                fd = self._state_fd()
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    raw = os.pread(fd, _STATE.size, 0)
+                    tokens, last = _STATE.unpack(raw) if len(raw) == _STATE.size else (float(self.burst), now)
+                    tokens, wait = self._take(tokens, last, now, queue)
+                    os.pwrite(fd, _STATE.pack(tokens, now), 0)
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+            if wait is not None:
+                self._record(wait)
+        return wait
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait before using it"""
+        return self._reserve(queue=True)
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now; never waits or queues"""
+        return self._reserve(queue=False) is not None
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns the time waited"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self) -> float:
+        """Async variant of acquire; waits without blocking the event loop"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _record(self, wait: float) -> None:
+        self.acquired += 1
+        if wait > 0:
+            self.delayed += 1
+            self.total_wait_seconds += wait
+
+    def stats(self) -> Dict:
+        return {
+            "rate_per_second": self.rate_per_second,
+            "burst": self.burst,
+            "shared_across_processes": bool(self.state_path),
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "total_wait_ms": round(self.total_wait_seconds * 1000, 1),
+        }
+
+_limiters: Dict[str, Optional[TokenBucket]] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(host: str) -> Optional[TokenBucket]:
+    """Process-wide limiter for a host as configured under `rate_limits.hosts`, or None if unlimited"""
+    if host in _limiters:
+        return _limiters[host]
+    with _limiters_lock:
+        if host not in _limiters:
+            rate_config = load_config().get("rate_limits", {})
+            host_config = rate_config.get("hosts", {}).get(host)
+            limiter = None
+            if host_config:
+                state_dir = rate_config.get("state_dir")
+                limiter = TokenBucket(
+                    host_config["rate_per_second"],
+                    host_config.get("burst", 1),
+                    os.path.join(state_dir, f"{host}.bucket") if state_dir else None,
+                    name=host,
+                )
+                logger.info(f"Rate limiting {host} to {limiter.rate_per_second}/s (burst {limiter.burst})")
+            _limiters[host] = limiter
+    return _limiters[host]
+
+def rate_limiter_stats() -> Dict:
+    """Stats for every configured limiter created so far"""
+    return {host: limiter.stats() for host, limiter in _limiters.items() if limiter is not None}
@@ -0,0 +1,56 @@
+from typing import Dict, Iterable, Sequence
+import numpy as np
+
+class RateTable:
+    """One base currency's full rate table held as a vector, for local cross-rate derivation.
+
+    rates[c] is the price of one unit of base in currency c, so the rate from A
+    to B is rates[B] / rates[A] whatever the base is. Unknown currencies give 0.0,
+    matching what the converter returns for a failed lookup.
+    """
+
+    __slots__ = ("base", "index", "values")
+
+    def __init__(self, base: str, rates: Dict[str, float]):
+        self.base = base.upper()
+        rates = {self.base: 1.0, **{code.upper(): rate for code, rate in rates.items()}}
+        self.index = {code: i for i, code in enumerate(rates)}
+        self.values = np.fromiter(rates.values(), dtype=np.float64, count=len(rates))
+
+    def __contains__(self, currency: str) -> bool:
+        return currency.upper() in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Units of to_currency per unit of from_currency, or 0.0 if either is unknown"""
+        i = self.index.get(from_currency.upper())
+        j = self.index.get(to_currency.upper())
+        if i is None or j is None or self.values[i] <= 0:
+            return 0.0
+        return float(self.values[j] / self.values[i])
+
+    def rates_from(self, from_currency: str, to_currencies: Iterable[str]) -> Dict[str, float]:
+        """Cross rates from one currency to several, keyed by upper-cased target code"""
+        return {currency.upper(): self.rate(from_currency, currency) for currency in to_currencies}
+
+    def _positions(self, currencies: Sequence[str]) -> np.ndarray:
+        # -1 marks a currency missing from the table
+        return np.array([self.index.get(currency.upper(), -1) for currency in currencies], dtype=np.int64)
+
+    def convert(self, amounts: Sequence[float], from_currencies: Sequence[str],
+                to_currencies: Sequence[str]) -> np.ndarray:
+        """Convert amounts[i] from from_currencies[i] to to_currencies[i] in one vectorized pass.
+
+        The three sequences must have the same length. Items with an unknown
+        currency come back as NaN so they can be told apart from zero amounts.
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        src, dst = self._positions(from_currencies), self._positions(to_currencies)
+        known = (src >= 0) & (dst >= 0)
+        src_values = self.values[np.where(known, src, 0)]
+        known &= src_values > 0
+        rates = np.divide(self.values[np.where(known, dst, 0)], src_values,
+                          out=np.full_like(amounts, np.nan), where=known)
+        return amounts * rates
@@ -0,0 +1,149 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from .config_loader import load_config
+from .rate_limiter import TokenBucket
+from ..logger.logging import logger
+
+# Refreshes of every cache share a couple of daemon workers; they are I/O bound and rare
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+
+class Refresher:
+    """Stale-while-revalidate and refresh-ahead for one shared cache.
+
+    Lookups are counted per key over a sliding window of two generations. When
+    a stale entry is read (expired, but inside the cache's stale_seconds) it is
+    returned immediately and reloaded in the background. Hot keys (at least
+    min_hits lookups in the window) are also reloaded once they are within the
+    cache's refresh_ahead_seconds of expiry, so frequent readers never see a miss.
+    Background loads draw from a token bucket, the refresh budget; when it is
+    empty nothing is scheduled and a stale entry is reported as a miss, so the
+    caller fetches in the foreground as it would without a refresher.
+    """
+
+    def __init__(self, name: str = "refresher", min_hits: int = 2, window_seconds: float = 3600,
+                 budget: Optional[TokenBucket] = None):
+        self.name = name
+        self.min_hits = min_hits
+        self.window_seconds = window_seconds
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+        self._previous_counts: Dict[str, int] = {}
+        self._window_start = time.time()
+        self._pending = set()
+
+        self.stale_served = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.over_budget = 0
+
+    def _record_access(self, key: str, now: float) -> int:
+        """Count a lookup and return the key's lookups over the current and previous window"""
+        with self._lock:
+            if now - self._window_start >= self.window_seconds:
+                self._previous_counts, self._counts = self._counts, {}
+                self._window_start = now
+            count = self._counts[key] = self._counts.get(key, 0) + 1
+            return count + self._previous_counts.get(key, 0)
+
+    def lookup(self, cache, key: str, load: Callable[[], Any]) -> Any:
+        """Cached value for key, possibly stale, or None on a miss.
+
+        load must fetch the value and write it back to the cache; it runs on a
+        background thread when the entry is stale, or hot and about to expire.
+        """
+        now = time.time()
+        hits = self._record_access(key, now)
+        return self._serve(cache, key, load, cache.get_entry(key, allow_stale=True), now, hits)
+
+    async def alookup(self, cache, key: str, load: Callable[[], Any]) -> Any:
+        """Async variant of lookup; the cache's disk tier is read off the event loop"""
+        now = time.time()
+        hits = self._record_access(key, now)
+        return self._serve(cache, key, load, await cache.aget_entry(key, allow_stale=True), now, hits)
+
+    def _serve(self, cache, key: str, load: Callable[[], Any], entry, now: float, hits: int) -> Any:
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= now:
+            if not self._schedule(key, load):
+                return None
+            self.stale_served += 1
+        elif expires_at - now <= cache.refresh_ahead_seconds and hits >= self.min_hits:
+            self._schedule(key, load)
+        return value
+
+    def _schedule(self, key: str, load: Callable[[], Any]) -> bool:
+        """Start a background load unless one is already running; False if over budget"""
+        with self._lock:
+            if key in self._pending:
+                return True
+            if self.budget is not None and not self.budget.try_acquire():
+                self.over_budget += 1
+                return False
+            self._pending.add(key)
+            self.refreshes += 1
+        _executor.submit(self._run, key, load)
+        return True
+
+    def _run(self, key: str, load: Callable[[], Any]) -> None:
+        try:
+            load()
+        except Exception as e:
+            self.refresh_failures += 1
+            logger.warning(f"Background refresh of {self.name} key {key!r} failed: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def stats(self) -> Dict:
+        return {
+            "tracked_keys": len(self._counts),
+            "pending": len(self._pending),
+            "stale_served": self.stale_served,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "over_budget": self.over_budget,
+        }
+
+_refreshers: Dict[str, Refresher] = {}
+_refreshers_lock = threading.Lock()
+
+def get_refresher(name: str) -> Refresher:
+    """Process-wide refresher for the shared cache `cache.<name>`, with its budget from config.yaml.
+
+    The budget bucket lives under `rate_limits.state_dir` like the host limiters, so
+    refresh_budget_per_minute is shared by every worker process, not granted to each.
+    """
+    refresher = _refreshers.get(name)
+    if refresher is not None:
+        return refresher
+    with _refreshers_lock:
+        refresher = _refreshers.get(name)
+        if refresher is None:
+            config = load_config()
+            cache_config = config.get("cache", {}).get(name, {})
+            per_minute = cache_config.get("refresh_budget_per_minute", 10)
+            state_dir = config.get("rate_limits", {}).get("state_dir")
+            budget = TokenBucket(
+                per_minute / 60.0,
+                burst=max(1, per_minute // 6),
+                state_path=os.path.join(state_dir, f"refresh-{name}.bucket") if state_dir else None,
+                name=f"refresh-{name}",
+            )
+            refresher = Refresher(
+                name,
+                min_hits=cache_config.get("refresh_min_hits", 2),
+                window_seconds=cache_config.get("refresh_window_seconds", 3600),
+                budget=budget,
+            )
+            _refreshers[name] = refresher
+    return refresher
+
+def refresher_stats() -> Dict:
+    """Stats for every refresher created so far"""
+    return {name: refresher.stats() for name, refresher in _refreshers.items()}
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+class _Call:
+    """One in-flight sync call that followers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+class SingleFlight:
+    """Coalesces concurrent identical calls so only one reaches the upstream.
+
+    The first caller for a key (the leader) runs the function; callers that arrive
+    with the same key while it is in flight wait for it and receive the same
+    result or exception. Nothing is remembered once the call completes, so this
+    complements the caches rather than replacing them.
+    """
+
+    def __init__(self, name: str = "flight"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        # Futures are bound to their event loop, so async calls are grouped per loop
+        self._async_calls: Dict[Tuple[int, str], asyncio.Future] = {}
+
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs), or wait for an identical in-flight call and share its result"""
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: str, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Async variant of do for coroutine functions.
+
+        The shared call runs as its own task and every caller, the first one
+        included, awaits it through a shield: a caller that is cancelled (a leg
+        timeout, a client disconnect) only stops waiting and never cancels the
+        call other conversations are waiting on.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            self.calls += 1
+            task = self._async_calls.get(flight_key)
+            if task is not None:
+                self.coalesced += 1
+            else:
+                task = self._async_calls[flight_key] = asyncio.ensure_future(fn(*args, **kwargs))
+                self.executions += 1
+                task.add_done_callback(lambda done: self._finish_async(flight_key, done))
+        return await asyncio.shield(task)
+
+    def _finish_async(self, flight_key: Tuple[int, str], task: asyncio.Future) -> None:
+        with self._lock:
+            if self._async_calls.get(flight_key) is task:
+                del self._async_calls[flight_key]
+        # Mark retrieved so an error nobody is waiting for any more is not logged as never retrieved
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls) + len(self._async_calls),
+        }
+
+_flights: Dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Process-wide SingleFlight group for an upstream, created on first use"""
+    flight = _flights.get(name)
+    if flight is None:
+        with _flights_lock:
+            flight = _flights.setdefault(name, SingleFlight(name))
+    return flight
+
+def single_flight_stats() -> Dict:
+    """Stats for every SingleFlight group created so far"""
+    return {name: flight.stats() for name, flight in _flights.items()}
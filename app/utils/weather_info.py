@@ -1,81 +1,282 @@
-import requests
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+from .cache import get_shared_cache, normalize_key
+from .config_loader import load_config
+from .forecast_aggregation import aggregate_daily, forecast_entries_for_days
+from .http_client import get_http_client
+from .refresher import get_refresher
+from .single_flight import get_single_flight
 
 class WeatherForecastTool:
-    def __init__(self, api_key: str = None):
+    """OpenWeatherMap current weather and forecasts.
+
+    Lookups take a place name or coordinates. With a place_search (PlaceInfoSearch),
+    a place name that the place tools have already geocoded is looked up by its cached
+    coordinates, so OpenWeatherMap is not asked to guess an ambiguous name. Weather
+    lookups never geocode themselves: the geocoder is paced to about one request per
+    second across all workers, so on a cache miss OpenWeatherMap's own name lookup
+    (q=) is used instead of waiting in that queue.
+    """
+
+    def __init__(self, api_key: str = None, place_search=None):
         self.api_key = api_key
+        self.place_search = place_search
         self.base_url = "https://api.openweathermap.org/data/2.5"
+        self.http = get_http_client()
+        self.flights = get_single_flight("openweathermap")
+        # Shared across requests; entries for an endpoint expire together at the end of its time bucket
+        self.cache = get_shared_cache("weather")
+        # Right after a bucket ends the previous answer is served while the new one loads
+        self.refresher = get_refresher("weather")
+        weather_cache_config = load_config().get("cache", {}).get("weather", {})
+        self.endpoint_ttls = {"weather": 600, "forecast": 10800,
+                              **weather_cache_config.get("endpoint_ttl_seconds", {})}
+
+    def _bucket_end(self, endpoint: str) -> float:
+        """Time the current bucket of an endpoint ends, when its cached responses expire"""
+        ttl = self.endpoint_ttls[endpoint]
+        return (int(time.time() // ttl) + 1) * ttl
+
+    def _request_json(self, key: str, expires_at: float, url: str, params: dict) -> dict:
+        response = self.http.get(url, params=params)
+        if response.status_code != 200:
+            return {}
+        data = response.json()
+        self.cache.set(key, data, expires_at=expires_at)
+        return data
+
+    async def _arequest_json(self, key: str, expires_at: float, url: str, params: dict) -> dict:
+        response = await self.http.aget(url, params=params)
+        if response.status_code != 200:
+            return {}
+        data = response.json()
+        await self.cache.aset(key, data, expires_at=expires_at)
+        return data
+
+    def _location(self, place: Optional[str], lat: Optional[float], lon: Optional[float]) -> Tuple[str, dict]:
+        """Cache key part and OpenWeatherMap location parameters; coordinates win over the name"""
+        if lat is not None and lon is not None:
+            # ~1 km grid, far finer than OpenWeatherMap's own resolution
+            return f"{lat:.2f},{lon:.2f}", {"lat": lat, "lon": lon}
+        return place, {"q": place}
+
+    def _resolve(self, place: Optional[str], lat: Optional[float], lon: Optional[float]) -> Tuple[str, dict]:
+        if (lat is None or lon is None) and place and self.place_search is not None:
+            details = self.place_search.cached_place_details(place)
+            if details is not None and details.has_coordinates:
+                lat, lon = details.lat, details.lon
+        return self._location(place, lat, lon)
+
+    async def _aresolve(self, place: Optional[str], lat: Optional[float], lon: Optional[float]) -> Tuple[str, dict]:
+        if (lat is None or lon is None) and place and self.place_search is not None:
+            details = await self.place_search.acached_place_details(place)
+            if details is not None and details.has_coordinates:
+                lat, lon = details.lat, details.lon
+        return self._location(place, lat, lon)
+
+    def _load_json(self, endpoint: str, key: str, params: dict) -> dict:
+        """Fetch and cache until the end of the current bucket; concurrent misses share one upstream call"""
+        return self.flights.do(key, self._request_json, key, self._bucket_end(endpoint),
+                               f"{self.base_url}/{endpoint}", params)
+
+    def _get_json(self, endpoint: str, location: str, params: dict) -> dict:
+        """GET an endpoint for a location, cached per time bucket"""
+        key = normalize_key(endpoint, location, params.get("cnt", ""))
+        cached = self.refresher.lookup(self.cache, key, partial(self._load_json, endpoint, key, params))
+        if cached is not None:
+            return cached
+        return self._load_json(endpoint, key, params)
+
+    async def _aget_json(self, endpoint: str, location: str, params: dict) -> dict:
+        """Async variant of _get_json"""
+        key = normalize_key(endpoint, location, params.get("cnt", ""))
+        cached = await self.refresher.alookup(self.cache, key, partial(self._load_json, endpoint, key, params))
+        if cached is not None:
+            return cached
+        return await self.flights.ado(key, self._arequest_json, key, self._bucket_end(endpoint),
+                                      f"{self.base_url}/{endpoint}", params)
+
+    def _current_params(self, location_params: dict) -> dict:
+        return {
+            **location_params,
+            "appid": self.api_key,
+            "units": "metric"  # Added units for Celsius
+        }
 
-    def get_current_weather(self, place: str):
-        """Get current weather of a place"""
+    def _forecast_params(self, location_params: dict, cnt: int = 10) -> dict:
+        return {
+            **location_params,
+            "appid": self.api_key,
+            "cnt": cnt,
+            "units": "metric"
+        }
+
+    def _mock_current_weather(self, place: str) -> dict:
+        """Mock data used when no API key is configured"""
+        return {
+            "name": place,
+            "main": {"temp": 25, "feels_like": 27, "humidity": 65},
+            "weather": [{"description": "partly cloudy", "main": "Clouds"}],
+            "wind": {"speed": 3.5}
+        }
+
+    def _fallback_current_weather(self, place: str) -> dict:
+        """Fallback data returned instead of raising on request errors"""
+        return {
+            "name": place,
+            "main": {"temp": 22, "feels_like": 24, "humidity": 60},
+            "weather": [{"description": "clear sky", "main": "Clear"}],
+            "wind": {"speed": 2.5}
+        }
+
+    def _mock_forecast_weather(self) -> dict:
+        """Mock forecast data used when no API key is configured"""
+        return {
+            "list": [
+                {
+                    "dt_txt": "2025-01-01 12:00:00",
+                    "main": {"temp": 24},
+                    "weather": [{"description": "sunny"}]
+                },
+                {
+                    "dt_txt": "2025-01-02 12:00:00",
+                    "main": {"temp": 26},
+                    "weather": [{"description": "partly cloudy"}]
+                },
+                {
+                    "dt_txt": "2025-01-03 12:00:00",
+                    "main": {"temp": 23},
+                    "weather": [{"description": "light rain"}]
+                }
+            ]
+        }
+
+    def _fallback_forecast_weather(self) -> dict:
+        """Fallback forecast data returned instead of raising on request errors"""
+        return {
+            "list": [
+                {
+                    "dt_txt": "2025-01-01 12:00:00",
+                    "main": {"temp": 22},
+                    "weather": [{"description": "moderate weather"}]
+                }
+            ]
+        }
+
+    def _display_name(self, place: Optional[str], lat: Optional[float], lon: Optional[float]) -> str:
+        return place or f"{lat},{lon}"
+
+    def get_current_weather(self, place: Optional[str] = None, lat: Optional[float] = None,
+                            lon: Optional[float] = None):
+        """Get current weather of a place, by name or coordinates"""
         try:
             if not self.api_key:
                 # Return mock data if no API key
-                return {
-                    "name": place,
-                    "main": {"temp": 25, "feels_like": 27, "humidity": 65},
-                    "weather": [{"description": "partly cloudy", "main": "Clouds"}],
-                    "wind": {"speed": 3.5}
-                }
-            
-            url = f"{self.base_url}/weather"
-            params = {
-                "q": place,
-                "appid": self.api_key,
-                "units": "metric"  # Added units for Celsius
-            }
-            response = requests.get(url, params=params)
-            return response.json() if response.status_code == 200 else {}
+                return self._mock_current_weather(self._display_name(place, lat, lon))
+
+            location, location_params = self._resolve(place, lat, lon)
+            return self._get_json("weather", location, self._current_params(location_params))
         except Exception as e:
             # Return fallback data instead of raising exception
-            return {
-                "name": place,
-                "main": {"temp": 22, "feels_like": 24, "humidity": 60},
-                "weather": [{"description": "clear sky", "main": "Clear"}],
-                "wind": {"speed": 2.5}
-            }
-    
-    def get_forecast_weather(self, place: str):
-        """Get weather forecast of a place"""
+            return self._fallback_current_weather(self._display_name(place, lat, lon))
+
+    async def aget_current_weather(self, place: Optional[str] = None, lat: Optional[float] = None,
+                                   lon: Optional[float] = None):
+        """Async variant of get_current_weather"""
+        try:
+            if not self.api_key:
+                return self._mock_current_weather(self._display_name(place, lat, lon))
+
+            location, location_params = await self._aresolve(place, lat, lon)
+            return await self._aget_json("weather", location, self._current_params(location_params))
+        except Exception as e:
+            return self._fallback_current_weather(self._display_name(place, lat, lon))
+
+    def get_forecast_weather(self, place: Optional[str] = None, lat: Optional[float] = None,
+                             lon: Optional[float] = None, days: Optional[int] = None):
+        """Get weather forecast of a place, by name or coordinates; days sizes the horizon (max 5)"""
         try:
             if not self.api_key:
                 # Return mock forecast data if no API key
-                return {
-                    "list": [
-                        {
-                            "dt_txt": "2025-01-01 12:00:00",
-                            "main": {"temp": 24},
-                            "weather": [{"description": "sunny"}]
-                        },
-                        {
-                            "dt_txt": "2025-01-02 12:00:00", 
-                            "main": {"temp": 26},
-                            "weather": [{"description": "partly cloudy"}]
-                        },
-                        {
-                            "dt_txt": "2025-01-03 12:00:00",
-                            "main": {"temp": 23},
-                            "weather": [{"description": "light rain"}]
-                        }
-                    ]
-                }
-            
-            url = f"{self.base_url}/forecast"
-            params = {
-                "q": place,
-                "appid": self.api_key,
-                "cnt": 10,
-                "units": "metric"
-            }
-            response = requests.get(url, params=params)
-            return response.json() if response.status_code == 200 else {}
+                return self._mock_forecast_weather()
+
+            cnt = forecast_entries_for_days(days) if days else 10
+            location, location_params = self._resolve(place, lat, lon)
+            return self._get_json("forecast", location, self._forecast_params(location_params, cnt))
         except Exception as e:
             # Return fallback forecast data
-            return {
-                "list": [
-                    {
-                        "dt_txt": "2025-01-01 12:00:00",
-                        "main": {"temp": 22},
-                        "weather": [{"description": "moderate weather"}]
-                    }
-                ]
-            }
\ No newline at end of file
+            return self._fallback_forecast_weather()
+
+    async def aget_forecast_weather(self, place: Optional[str] = None, lat: Optional[float] = None,
+                                    lon: Optional[float] = None, days: Optional[int] = None):
+        """Async variant of get_forecast_weather"""
+        try:
+            if not self.api_key:
+                return self._mock_forecast_weather()
+
+            cnt = forecast_entries_for_days(days) if days else 10
+            location, location_params = await self._aresolve(place, lat, lon)
+            return await self._aget_json("forecast", location, self._forecast_params(location_params, cnt))
+        except Exception as e:
+            return self._fallback_forecast_weather()
+
+    def get_daily_forecast(self, place: Optional[str] = None, lat: Optional[float] = None,
+                           lon: Optional[float] = None, days: int = 5) -> list:
+        """Forecast aggregated to one row per day for the next `days` days"""
+        return aggregate_daily(self.get_forecast_weather(place, lat, lon, days=days))[:days]
+
+    async def aget_daily_forecast(self, place: Optional[str] = None, lat: Optional[float] = None,
+                                  lon: Optional[float] = None, days: int = 5) -> list:
+        """Async variant of get_daily_forecast"""
+        return aggregate_daily(await self.aget_forecast_weather(place, lat, lon, days=days))[:days]
+
+    def _parse_coordinates(self, location: str) -> Optional[Tuple[float, float]]:
+        """Parse a "lat,lon" string, or return None for a place name"""
+        parts = location.split(",")
+        if len(parts) != 2:
+            return None
+        try:
+            return float(parts[0]), float(parts[1])
+        except ValueError:
+            return None
+
+    def _split_locations(self, locations: List[str]) -> Dict[str, Tuple]:
+        """Distinct locations mapped to (place, lat, lon) lookup arguments"""
+        resolved = {}
+        for location in dict.fromkeys(locations):
+            coordinates = self._parse_coordinates(location)
+            resolved[location] = (None, *coordinates) if coordinates is not None else (location, None, None)
+        return resolved
+
+    def get_weather_many(self, locations: List[str], days: int = 5) -> Dict[str, Dict]:
+        """Current conditions and daily forecasts for several cities or "lat,lon" strings in one pass.
+
+        Every lookup runs concurrently through the weather cache; names resolve through
+        the geocode cache like single lookups. With days=0 only current conditions are
+        fetched. Returns {location: {"current": ..., "daily": [...]}} in input order.
+        """
+        resolved = self._split_locations(locations)
+        with ThreadPoolExecutor(max_workers=min(8, max(1, 2 * len(resolved)))) as pool:
+            current = {location: pool.submit(self.get_current_weather, *args) for location, args in resolved.items()}
+            daily = {location: pool.submit(self.get_daily_forecast, *args, days=days)
+                     for location, args in resolved.items() if days > 0}
+            return {location: {"current": current[location].result(),
+                               "daily": daily[location].result() if location in daily else []}
+                    for location in resolved}
+
+    async def aget_weather_many(self, locations: List[str], days: int = 5) -> Dict[str, Dict]:
+        """Async variant of get_weather_many"""
+        resolved = self._split_locations(locations)
+
+        async def one(args):
+            if days <= 0:
+                return {"current": await self.aget_current_weather(*args), "daily": []}
+            current, daily = await asyncio.gather(self.aget_current_weather(*args),
+                                                  self.aget_daily_forecast(*args, days=days))
+            return {"current": current, "daily": daily}
+
+        results = await asyncio.gather(*(one(args) for args in resolved.values()))
+        return dict(zip(resolved, results))
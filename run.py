@@ -24,6 +24,49 @@ def run_api_server():
     
     uvicorn.run(app, host="0.0.0.0", port=8000)
 
+def run_production_server(args):
+    """Run the FastAPI backend with several pre-forked worker processes"""
+    import multiprocessing
+    from gunicorn.app.base import BaseApplication
+    from app.utils.config_loader import load_config
+
+    server_config = load_config().get("server", {})
+
+    def setting(name, default):
+        # CLI flags win over config.yaml, which wins over built-in defaults
+        value = getattr(args, name, None)
+        return value if value is not None else server_config.get(name, default)
+
+    workers = setting("workers", 0) or multiprocessing.cpu_count()
+    host, port = setting("host", "0.0.0.0"), setting("port", 8000)
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "uvicorn_worker.UvicornWorker",
+        "preload_app": True,
+        "keepalive": setting("keep_alive", 5),
+        "backlog": setting("backlog", 2048),
+        "graceful_timeout": setting("graceful_timeout", 30),
+        "timeout": setting("timeout", 120),
+    }
+
+    class WandAgentServer(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Runs once in the master before forking: workers inherit the compiled
+            # graphs, LLM clients and tool wrappers instead of each building their own
+            from app.main import app, graph_registry, api_config
+            warmed = graph_registry.warm_up(api_config.get("warm_providers", [graph_registry.default_provider]))
+            print(f"🔥 Preloaded agent graphs for: {warmed}")
+            return app
+
+    print(f"🚀 Starting Wand Agent API Server with {workers} workers...")
+    print(f"📍 API will be available at: http://{host}:{port}")
+    WandAgentServer().run()
+
 def run_streamlit_app():
     """Run the Streamlit web interface"""
     import subprocess
@@ -40,14 +83,24 @@ def main():
     parser = argparse.ArgumentParser(description="Wand Agent Application")
     parser.add_argument(
         "mode", 
-        choices=["api", "web", "streamlit"], 
-        help="Run mode: 'api' for FastAPI server, 'web' or 'streamlit' for Streamlit interface"
+        choices=["api", "prod", "web", "streamlit"], 
+        help="Run mode: 'api' for FastAPI server, 'prod' for multi-worker FastAPI server, 'web' or 'streamlit' for Streamlit interface"
     )
+    # Production server tuning (defaults come from the `server` section of config.yaml)
+    parser.add_argument("--workers", type=int, help="Worker processes (0 = one per CPU core)")
+    parser.add_argument("--host", help="Bind address")
+    parser.add_argument("--port", type=int, help="Bind port")
+    parser.add_argument("--keep-alive", dest="keep_alive", type=int, help="Seconds to hold idle keep-alive connections")
+    parser.add_argument("--backlog", type=int, help="Maximum pending connections")
+    parser.add_argument("--graceful-timeout", dest="graceful_timeout", type=int, help="Seconds workers get to finish requests on shutdown")
+    parser.add_argument("--timeout", type=int, help="Seconds before a silent worker is killed and restarted")
     
     args = parser.parse_args()
     
     if args.mode == "api":
         run_api_server()
+    elif args.mode == "prod":
+        run_production_server(args)
     elif args.mode in ["web", "streamlit"]:
         run_streamlit_app()
 
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test cases for admission control in front of the agent
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class TestAdmissionController(unittest.TestCase):
+    """Test cases for AdmissionController"""
+
+    def test_queue_full_rejected_with_429(self):
+        """Test that requests beyond in-flight plus queue capacity fail fast"""
+        from app.utils.admission_control import AdmissionController, AdmissionRejected
+
+        async def scenario():
+            controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=5, retry_after=7)
+            await controller.acquire()
+            queued = asyncio.ensure_future(controller.acquire())
+            await asyncio.sleep(0)
+            with self.assertRaises(AdmissionRejected) as context:
+                await controller.acquire()
+            controller.release()
+            await queued
+            return controller, context.exception
+
+        controller, rejection = asyncio.run(scenario())
+        self.assertEqual(rejection.status_code, 429)
+        self.assertEqual(rejection.retry_after, 7)
+        self.assertEqual(controller.stats()["rejected_queue_full"], 1)
+        self.assertEqual(controller.stats()["in_flight"], 1)
+
+    def test_queue_timeout_rejected_with_503(self):
+        """Test that a request waiting past queue_timeout is rejected"""
+        from app.utils.admission_control import AdmissionController, AdmissionRejected
+
+        async def scenario():
+            controller = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout=0.01)
+            await controller.acquire()
+            with self.assertRaises(AdmissionRejected) as context:
+                await controller.acquire()
+            return controller, context.exception
+
+        controller, rejection = asyncio.run(scenario())
+        self.assertEqual(rejection.status_code, 503)
+        self.assertEqual(controller.stats()["queue_depth"], 0)
+
+    def test_slots_handed_over_in_fifo_order(self):
+        """Test that released slots go to the oldest waiter"""
+        from app.utils.admission_control import AdmissionController
+
+        async def scenario():
+            controller = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout=5)
+            order = []
+
+            async def run(name):
+                async with controller.slot():
+                    order.append(name)
+                    await asyncio.sleep(0.001)
+
+            await asyncio.gather(*(run(name) for name in ["a", "b", "c"]))
+            return controller, order
+
+        controller, order = asyncio.run(scenario())
+        self.assertEqual(order, ["a", "b", "c"])
+        self.assertEqual(controller.stats()["in_flight"], 0)
+        self.assertEqual(controller.stats()["admitted"], 3)
+
+class TestAdmissionEndpoint(unittest.TestCase):
+    """Test cases for overload responses from /query"""
+
+    def test_query_rejected_with_retry_after(self):
+        """Test that /query returns 429 with Retry-After when the queue is full"""
+        from fastapi.testclient import TestClient
+        from app import main
+        from app.utils.admission_control import AdmissionController
+
+        full = AdmissionController(max_in_flight=0, max_queue=0, retry_after=3)
+        with patch.object(main, "admission", full), \
+             patch.object(main.graph_registry, "peek", return_value=object()):
+            response = TestClient(main.app).post("/query", json={"messages": [{"role": "user", "content": "Hi"}]})
+            metrics = TestClient(main.app).get("/metrics").json()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["retry-after"], "3")
+        self.assertEqual(metrics["admission"]["rejected_queue_full"], 1)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test cases for the FastAPI endpoints using a stubbed agent graph
+"""
+
+import json
+import os
+import sys
+import unittest
+from unittest.mock import patch, MagicMock
+
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel, GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class ScriptedChatModel(FakeMessagesListChatModel):
+    """Fake chat model that replays whole responses and accepts bind_tools"""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+class StreamingChatModel(GenericFakeChatModel):
+    """Fake chat model that streams its response token by token"""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+class FakeGraphTestCase(unittest.TestCase):
+    """Provides a stand-in for a compiled graph that renders a fixed Mermaid diagram"""
+
+    def make_fake_graph(self):
+        fake_graph = MagicMock()
+        fake_graph.get_graph.return_value.draw_mermaid.return_value = "graph TD; agent --> tools;"
+        fake_graph.get_graph.return_value.draw_mermaid_png.return_value = b"\x89PNG fake"
+        return fake_graph
+
+class TestGraphEndpoint(FakeGraphTestCase):
+    """Test cases for the cached /graph endpoint"""
+
+    def setUp(self):
+        from fastapi.testclient import TestClient
+        from app import main
+        from app.utils.graph_image_cache import GraphImageCache
+
+        self.fake_graph = self.make_fake_graph()
+        self.patches = [
+            patch.object(main.graph_registry, "peek", return_value=self.fake_graph),
+            patch.object(main, "graph_image_cache", GraphImageCache()),
+        ]
+        for p in self.patches:
+            p.start()
+        self.client = TestClient(main.app)
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_graph_rendered_once_and_served_with_etag(self):
+        """Test that the PNG is rendered once and repeated requests reuse it"""
+        first = self.client.get("/graph")
+        second = self.client.get("/graph")
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers["content-type"], "image/png")
+        self.assertEqual(first.content, b"\x89PNG fake")
+        self.assertEqual(first.headers["etag"], second.headers["etag"])
+        self.fake_graph.get_graph.return_value.draw_mermaid_png.assert_called_once()
+
+    def test_graph_not_modified(self):
+        """Test that a matching If-None-Match returns 304 without a body"""
+        etag = self.client.get("/graph").headers["etag"]
+        response = self.client.get("/graph", headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+class TestStreamEndpoint(unittest.TestCase):
+    """Test cases for the /query/stream SSE endpoint"""
+
+    def build_graph(self, llm):
+        """Compile a real agent graph around a fake LLM"""
+        from app.agent.agentic_workflow import GraphBuilder
+
+        with patch('app.agent.agentic_workflow.ModelLoader.load_llm', return_value=llm):
+            return GraphBuilder(model_provider="groq")()
+
+    def parse_sse(self, body):
+        """Split an SSE body into (event, data) pairs"""
+        events = []
+        for block in body.strip().split("\n\n"):
+            lines = dict(line.split(": ", 1) for line in block.splitlines())
+            events.append((lines["event"], json.loads(lines["data"])))
+        return events
+
+    def stream(self, graph):
+        from fastapi.testclient import TestClient
+        from app import main
+
+        with patch.object(main.graph_registry, "peek", return_value=graph):
+            response = TestClient(main.app).post(
+                "/query/stream", json={"messages": [{"role": "user", "content": "What's 100 + 200?"}]}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        return self.parse_sse(response.text)
+
+    def test_streams_tokens_then_done(self):
+        """Test that LLM tokens arrive as token events before the final answer"""
+        graph = self.build_graph(StreamingChatModel(messages=iter([AIMessage(content="The total is 300")])))
+        events = self.stream(graph)
+
+        tokens = "".join(data["content"] for event, data in events if event == "token")
+        self.assertEqual(tokens, "The total is 300")
+        self.assertEqual(events[-1], ("done", {"answer": "The total is 300"}))
+
+    def test_streams_tool_events(self):
+        """Test that tool start/end events are emitted around tool execution"""
+        tool_call = AIMessage(content="", tool_calls=[{"name": "add_numbers", "args": {"a": 100, "b": 200}, "id": "call-1"}])
+        graph = self.build_graph(ScriptedChatModel(responses=[tool_call, AIMessage(content="The total is 300")]))
+        events = self.stream(graph)
+
+        names = [event for event, _ in events]
+        self.assertLess(names.index("tool_start"), names.index("tool_end"))
+        self.assertIn("300", dict(events)["tool_end"]["output"])
+        self.assertEqual(events[-1], ("done", {"answer": "The total is 300"}))
+
+class TestGraphImageCache(FakeGraphTestCase):
+    """Test cases for the on-disk render cache shared with visualize_graph.py"""
+
+    def test_disk_cache_shared_between_instances(self):
+        """Test that a second cache instance reads the PNG from disk instead of rendering"""
+        import tempfile
+        from app.utils.graph_image_cache import GraphImageCache
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            key, png = GraphImageCache(cache_dir=cache_dir).get_png(self.make_fake_graph())
+
+            other_graph = self.make_fake_graph()
+            other_key, other_png = GraphImageCache(cache_dir=cache_dir).get_png(other_graph)
+
+            self.assertEqual((key, png), (other_key, other_png))
+            other_graph.get_graph.return_value.draw_mermaid_png.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
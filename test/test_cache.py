@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test cases for the in-process and on-disk caches and the geocoding cache
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class TestTTLCache(unittest.TestCase):
+    """Test cases for TTLCache"""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        from app.utils.cache import TTLCache
+
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_expiry(self):
+        """Test that expired entries are treated as misses"""
+        from app.utils.cache import TTLCache
+
+        cache = TTLCache(ttl_seconds=10)
+        with patch("app.utils.cache.time.time", return_value=1000.0):
+            cache.set("a", 1)
+        with patch("app.utils.cache.time.time", return_value=1011.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_stale_window(self):
+        """Test that expired entries stay readable with allow_stale until the stale window ends"""
+        from app.utils.cache import TTLCache
+
+        cache = TTLCache(ttl_seconds=10, stale_seconds=5)
+        with patch("app.utils.cache.time.time", return_value=1000.0):
+            cache.set("a", 1)
+        with patch("app.utils.cache.time.time", return_value=1012.0):
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(cache.get_entry("a", allow_stale=True), (1010.0, 1))
+        with patch("app.utils.cache.time.time", return_value=1016.0):
+            self.assertIsNone(cache.get_entry("a", allow_stale=True))
+        self.assertEqual(len(cache), 0)
+
+class TestTieredCache(unittest.TestCase):
+    """Test cases for the memory plus SQLite cache"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "cache.sqlite")
+
+    def test_disk_survives_new_memory_tier(self):
+        """Test that a fresh process (new memory tier) is served from disk"""
+        from app.utils.cache import SQLiteCache, TieredCache, TTLCache
+
+        TieredCache(TTLCache(), SQLiteCache(self.path)).set("goa", [{"lat": "15.3"}])
+
+        cache = TieredCache(TTLCache(), SQLiteCache(self.path))
+        self.assertEqual(cache.get("goa"), [{"lat": "15.3"}])
+        # Promoted to memory, so the second lookup does not touch disk
+        self.assertEqual(cache.get("goa"), [{"lat": "15.3"}])
+        self.assertEqual(cache.stats()["disk"]["hits"], 1)
+        self.assertEqual(cache.stats()["memory"]["hits"], 1)
+
+    def test_disk_prune_caps_size(self):
+        """Test that prune keeps only the most recently used rows"""
+        import time
+        from app.utils.cache import SQLiteCache
+
+        now = time.time()
+        cache = SQLiteCache(self.path, max_entries=3)
+        for i in range(5):
+            with patch("app.utils.cache.time.time", return_value=now + i):
+                cache.set(f"k{i}", i, ttl_seconds=3600)
+        cache.prune()
+
+        self.assertEqual(cache.stats()["size"], 3)
+        self.assertIsNone(cache.get("k0"))
+        self.assertEqual(cache.get("k4"), 4)
+
+    def test_async_disk_tier_runs_off_the_loop(self):
+        """Test that aget/aset reach SQLite from a worker thread, never the event loop thread"""
+        import asyncio
+        import threading
+        from app.utils.cache import SQLiteCache, TieredCache, TTLCache
+
+        disk = SQLiteCache(self.path)
+        threads = []
+
+        def recording(method):
+            def call(*args, **kwargs):
+                threads.append(threading.current_thread())
+                return method(*args, **kwargs)
+            return call
+
+        disk.get_entry, disk.set = recording(disk.get_entry), recording(disk.set)
+
+        async def run():
+            await TieredCache(TTLCache(), disk).aset("goa", [15.3])
+            return await TieredCache(TTLCache(), disk).aget("goa"), threading.current_thread()
+
+        value, loop_thread = asyncio.run(run())
+
+        self.assertEqual(value, [15.3])
+        self.assertEqual(len(threads), 2)
+        self.assertTrue(all(thread is not loop_thread for thread in threads))
+
+    def test_reads_only_touch_stale_access_times(self):
+        """Test that a disk read skips the access-time write unless the row was last touched long ago"""
+        import time
+        from app.utils.cache import SQLiteCache
+
+        now = time.time()
+        cache = SQLiteCache(self.path)
+        with patch("app.utils.cache.time.time", return_value=now):
+            cache.set("goa", 1, ttl_seconds=3600)
+        accessed_at = lambda: cache._connect().execute("SELECT accessed_at FROM cache").fetchone()[0]
+
+        with patch("app.utils.cache.time.time", return_value=now + 10):
+            cache.get("goa")
+        self.assertEqual(accessed_at(), now)
+        with patch("app.utils.cache.time.time", return_value=now + cache.touch_interval + 1):
+            cache.get("goa")
+        self.assertEqual(accessed_at(), now + cache.touch_interval + 1)
+
+class TestGeocodeCache(unittest.TestCase):
+    """Test cases for caching underneath PlaceInfoSearch.search_place"""
+
+    def setUp(self):
+        from app.utils.cache import TieredCache, TTLCache
+        from app.utils.place_info_search import PlaceInfoSearch
+
+        self.search = PlaceInfoSearch()
+        self.search.cache = TieredCache(TTLCache())
+        self.search.geocoder.http = MagicMock()
+
+    def test_repeated_query_hits_cache(self):
+        """Test that the same normalized query only reaches Nominatim once"""
+        mock_response = MagicMock(status_code=200)
+        mock_response.json.return_value = [{"display_name": "Goa, India", "lat": "15.3", "lon": "74.1"}]
+
+        search = self.search
+        search.geocoder.http.get.return_value = mock_response
+        mock_get = search.geocoder.http.get
+        first = search.search_place("Goa")
+        second = search.search_place("  goa ")
+        details = search.get_place_details("GOA")
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_get.call_count, 2)  # limit=5 and limit=1 are separate keys
+        self.assertEqual(details.lat, 15.3)
+        self.assertEqual(search.get_place_details("goa").lat, 15.3)
+        self.assertEqual(mock_get.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test cases for the exchange-rate table, local cross rates and bulk conversion
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+USD_RATES = {"USD": 1.0, "EUR": 0.8, "INR": 80.0, "JPY": 150.0}
+
+class TestRateTable(unittest.TestCase):
+    """Test cases for RateTable"""
+
+    def test_cross_rates(self):
+        """Test that A->B is derived as rate[B] / rate[A] and unknown codes give 0.0"""
+        from app.utils.rate_table import RateTable
+
+        table = RateTable("usd", {"EUR": 0.8, "INR": 80.0})
+        self.assertAlmostEqual(table.rate("EUR", "INR"), 100.0)
+        self.assertAlmostEqual(table.rate("inr", "usd"), 0.0125)
+        self.assertEqual(table.rate("EUR", "EUR"), 1.0)
+        self.assertEqual(table.rate("EUR", "XYZ"), 0.0)
+        self.assertIn("USD", table)
+        self.assertEqual(len(table), 3)
+
+    def test_vectorized_convert(self):
+        """Test that convert handles mixed pairs in one call and marks unknown currencies as NaN"""
+        import math
+        from app.utils.rate_table import RateTable
+
+        table = RateTable("USD", {"EUR": 0.8, "INR": 80.0})
+        converted = table.convert([10, 5, 1], ["EUR", "usd", "XYZ"], ["INR", "EUR", "INR"])
+
+        self.assertAlmostEqual(converted[0], 1000.0)
+        self.assertAlmostEqual(converted[1], 4.0)
+        self.assertTrue(math.isnan(converted[2]))
+
+class TestCurrencyConverter(unittest.TestCase):
+    """Test cases for CurrencyConverter on top of the anchor rate table"""
+
+    def setUp(self):
+        self.converter = self.make_converter()
+
+    def make_converter(self):
+        """CurrencyConverter with a private cache and a mocked HTTP client serving the USD table"""
+        from app.utils.cache import TieredCache, TTLCache
+        from app.utils.currency_converter import CurrencyConverter
+
+        converter = CurrencyConverter()
+        converter.cache = TieredCache(TTLCache())
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"base": "USD", "rates": USD_RATES}
+        converter.http = MagicMock()
+        converter.http.get.return_value = response
+        return converter
+
+    def test_one_fetch_for_every_pair(self):
+        """Test that any pair is answered from the single anchor table download"""
+        converter = self.converter
+
+        self.assertAlmostEqual(converter.convert_currency(10, "EUR", "INR"), 1000.0)
+        self.assertAlmostEqual(converter.get_exchange_rate("JPY", "EUR"), 0.8 / 150.0)
+        rates = converter.get_multiple_rates("inr", ["usd", "EUR", "XYZ"])
+        self.assertAlmostEqual(rates["USD"], 0.0125)
+        self.assertAlmostEqual(rates["EUR"], 0.01)
+        self.assertEqual(rates["XYZ"], 0.0)
+
+        self.assertEqual(converter.http.get.call_count, 1)
+        self.assertTrue(converter.http.get.call_args.args[0].endswith("/USD"))
+
+    def test_table_built_once_per_download(self):
+        """Test that the vector form of the table is reused until the cached table changes"""
+        converter = self.converter
+
+        converter.get_exchange_rate("EUR", "INR")
+        table = converter._rate_table()
+        self.assertIs(converter._rate_table(), table)
+
+    def test_async_and_failure(self):
+        """Test the async path and that a failed download yields 0.0 and no rates"""
+        converter = self.converter
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"rates": USD_RATES}
+        converter.http.aget = MagicMock(side_effect=lambda *args, **kwargs: asyncio.sleep(0, result=response))
+
+        self.assertAlmostEqual(asyncio.run(converter.aconvert_currency(2, "EUR", "JPY")), 375.0)
+
+        failing = self.make_converter()
+        failing.http.get.return_value = MagicMock(status_code=503)
+        self.assertEqual(failing.get_exchange_rate("EUR", "INR"), 0.0)
+        self.assertEqual(failing.get_multiple_rates("EUR", ["INR"]), {})
+
+    def test_convert_many_totals(self):
+        """Test bulk conversion with one source code for all items, per-target totals and failures"""
+        converter = self.converter
+
+        result = converter.convert_many([100, 50, -20, 7], ["EUR"], ["INR", "INR", "INR", "XYZ"])
+
+        self.assertEqual([item["converted"] for item in result["items"]], [10000.0, 5000.0, -2000.0, 0.0])
+        self.assertEqual(result["totals"], {"INR": 13000.0})
+        self.assertEqual(result["failed"], [3])
+        self.assertEqual(converter.http.get.call_count, 1)
+
+    def test_convert_many_mismatched_lengths(self):
+        """Test that a currency list that is neither one code nor one per amount fails every item"""
+        converter = self.converter
+
+        result = converter.convert_many([1, 2, 3], ["EUR", "USD"], "INR")
+
+        self.assertEqual(result["failed"], [0, 1, 2])
+        self.assertEqual(result["totals"], {})
+        self.assertEqual(result["error"], "from_currencies: expected 1 or 3 currency codes, got 2")
+
+    def test_bulk_tool_output(self):
+        """Test that the bulk tool lists every item and the totals in one answer"""
+        from app.tools.currency_conversion_tool import CurrencyConverterTool
+
+        tool = CurrencyConverterTool()
+        tool.currency_converter = self.converter
+        bulk = next(t for t in tool.currency_converter_tool_list if t.name == "convert_currency_bulk")
+
+        output = bulk.invoke({"amounts": [100, 3], "from_currencies": ["EUR", "XYZ"], "to_currencies": ["INR"]})
+
+        self.assertIn("- 100.0 EUR = 10000.00 INR", output)
+        self.assertIn("- 3.0 XYZ: Unable to convert to INR", output)
+        self.assertTrue(output.endswith("Total: 10000.00 INR"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test cases for daily forecast aggregation
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DAY = 86400
+
+def entry(dt, temp, description, pop=0.0, rain=None, temp_min=None, temp_max=None):
+    item = {"dt": dt, "main": {"temp": temp, "temp_min": temp_min or temp, "temp_max": temp_max or temp},
+            "weather": [{"description": description}], "pop": pop}
+    if rain is not None:
+        item["rain"] = {"3h": rain}
+    return item
+
+# 2025-01-01 00:00 UTC
+START = 1735689600
+
+FORECAST = {
+    "city": {"timezone": 0},
+    "list": [
+        entry(START, 24, "clear sky", temp_min=23),
+        entry(START + 3 * 3600, 28, "few clouds", pop=0.2),
+        entry(START + 6 * 3600, 31, "few clouds", temp_max=32),
+        entry(START + 9 * 3600, 27, "clear sky"),
+        entry(START + 12 * 3600, 25, "few clouds"),
+        entry(START + DAY, 22, "light rain", pop=0.8, rain=1.5),
+        entry(START + DAY + 3 * 3600, 26, "light rain", pop=0.6, rain=0.7),
+        entry(START + DAY + 6 * 3600, 27, "overcast clouds"),
+    ],
+}
+
+class TestForecastAggregation(unittest.TestCase):
+    """Test cases for aggregate_daily"""
+
+    def test_daily_rows(self):
+        """Test min/max/mean, precipitation and dominant condition per day"""
+        from app.utils.forecast_aggregation import aggregate_daily
+
+        day1, day2 = aggregate_daily(FORECAST)
+
+        self.assertEqual(day1["date"], "2025-01-01")
+        self.assertEqual((day1["temp_min"], day1["temp_max"], day1["temp_mean"]), (23.0, 32.0, 27.0))
+        self.assertEqual(day1["precipitation_probability"], 20)
+        self.assertEqual(day1["condition"], "few clouds")
+        self.assertEqual(day2["precipitation_mm"], 2.2)
+        self.assertEqual(day2["precipitation_probability"], 80)
+        self.assertEqual(day2["condition"], "light rain")
+
+    def test_local_timezone_and_dt_txt_fallback(self):
+        """Test that days follow the city's local time, and dt_txt is used when dt is missing"""
+        from app.utils.forecast_aggregation import aggregate_daily
+
+        shifted = dict(FORECAST, city={"timezone": 12 * 3600})
+        self.assertEqual([d["date"] for d in aggregate_daily(shifted)], ["2025-01-01", "2025-01-02"])
+        # The 12:00 UTC entry is already the next local day
+        self.assertEqual(aggregate_daily(shifted)[0]["temp_mean"], 27.5)
+
+        legacy = {"list": [{"dt_txt": "2025-01-01 12:00:00", "main": {"temp": 24}, "weather": [{"description": "sunny"}]}]}
+        self.assertEqual(aggregate_daily(legacy)[0]["temp_max"], 24.0)
+        self.assertEqual(aggregate_daily({}), [])
+
+    def test_missing_temperature_left_out_of_mean(self):
+        """Test that an entry without a temperature does not count as 0 degrees or blank out min/max"""
+        from app.tools.weather_info_tool import WeatherInfoTool
+        from app.utils.forecast_aggregation import aggregate_daily
+
+        forecast = {"list": [
+            entry(START, 20, "clear sky"),
+            {"dt": START + 3 * 3600, "main": {"temp_min": 18, "temp_max": 22}, "weather": [{"description": "clear sky"}]},
+            {"dt": START + 4 * 3600, "main": {}, "weather": [{"description": "clear sky"}]},
+            entry(START + 6 * 3600, 24, "clear sky"),
+            {"dt": START + DAY, "main": {"temp_min": 15, "temp_max": 17}, "weather": [{"description": "fog"}]},
+            {"dt": START + 2 * DAY, "main": {}, "weather": [{"description": "fog"}]},
+        ]}
+
+        day1, day2, day3 = aggregate_daily(forecast)
+        self.assertEqual((day1["temp_min"], day1["temp_max"], day1["temp_mean"]), (18.0, 24.0, 22.0))
+        self.assertEqual((day2["temp_min"], day2["temp_max"]), (15.0, 17.0))
+        self.assertIsNone(day2["temp_mean"])
+        self.assertEqual((day3["temp_min"], day3["temp_max"], day3["temp_mean"]), (None, None, None))
+
+        tool = WeatherInfoTool.__new__(WeatherInfoTool)
+        self.assertIn("| N/A-N/A | N/A |", tool._format_forecast("Goa", [day3]))
+
+    def test_forecast_horizon_sized_to_days(self):
+        """Test that the forecast request asks for 8 entries per day, capped at 40"""
+        from app.utils.cache import TieredCache, TTLCache
+        from app.utils.weather_info import WeatherForecastTool
+
+        weather = WeatherForecastTool(api_key="test")
+        weather.cache = TieredCache(TTLCache())
+        response = MagicMock(status_code=200)
+        response.json.return_value = FORECAST
+        weather.http = MagicMock()
+        weather.http.get.return_value = response
+
+        daily = weather.get_daily_forecast("Goa", days=1)
+        self.assertEqual(weather.http.get.call_args.kwargs["params"]["cnt"], 8)
+        self.assertEqual(len(daily), 1)
+
+        weather.get_daily_forecast("Goa", days=9)
+        self.assertEqual(weather.http.get.call_args.kwargs["params"]["cnt"], 40)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test cases for the pluggable geocoder backends and batch geocoding
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PLACES = {
+    "Goa": [{"display_name": "Goa, India", "lat": "15.3", "lon": "74.1"}],
+    "Mumbai": [{"display_name": "Mumbai, India", "lat": "19.07", "lon": "72.87"}],
+    "Pune": [{"display_name": "Pune, India", "lat": "18.52", "lon": "73.85"}],
+}
+
+class TestGeocoderFactory(unittest.TestCase):
+    """Test cases for create_geocoder"""
+
+    def test_backend_selected_from_config(self):
+        """Test that each configured backend maps to its implementation"""
+        from app.utils.geocoders import (create_geocoder, FixtureGeocoder, NominatimGeocoder,
+                                         PhotonGeocoder, SelfHostedNominatimGeocoder)
+
+        self.assertIsInstance(create_geocoder({}), NominatimGeocoder)
+        self_hosted = create_geocoder({"backend": "self_hosted", "base_url": "http://geo.internal:8080/"})
+        self.assertIsInstance(self_hosted, SelfHostedNominatimGeocoder)
+        self.assertEqual(self_hosted.base_url, "http://geo.internal:8080")
+        self.assertIsInstance(create_geocoder({"backend": "photon", "base_url": "http://photon"}), PhotonGeocoder)
+        self.assertIsInstance(create_geocoder({"backend": "fixture"}), FixtureGeocoder)
+        with self.assertRaises(ValueError):
+            create_geocoder({"backend": "carrier-pigeon"})
+
+    def test_backend_without_search_fails_at_construction(self):
+        """Test that a backend missing search cannot be instantiated"""
+        from app.utils.geocoders import Geocoder
+
+        class IncompleteGeocoder(Geocoder):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            IncompleteGeocoder()
+
+    def test_photon_results_converted(self):
+        """Test that Photon GeoJSON is mapped onto the Nominatim result shape"""
+        from app.utils.geocoders import PhotonGeocoder
+
+        geocoder = PhotonGeocoder("http://photon")
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"features": [{
+            "geometry": {"coordinates": [73.82, 15.49]},
+            "properties": {"name": "Panaji", "state": "Goa", "country": "India",
+                           "osm_key": "place", "osm_value": "city"}}]}
+        geocoder.http = MagicMock()
+        geocoder.http.get.return_value = response
+
+        results = geocoder.search("Panaji", 1)
+
+        self.assertEqual(geocoder.http.get.call_args.args[0], "http://photon/api")
+        self.assertEqual(results[0]["display_name"], "Panaji, Goa, India")
+        self.assertEqual((results[0]["lat"], results[0]["lon"]), (15.49, 73.82))
+        self.assertEqual(results[0]["type"], "city")
+
+class TestGeocodeMany(unittest.TestCase):
+    """Test cases for PlaceInfoSearch.geocode_many"""
+
+    def make_search(self, geocoder):
+        from app.utils.cache import TieredCache, TTLCache
+        from app.utils.place_info_search import PlaceInfoSearch
+
+        search = PlaceInfoSearch(geocoder=geocoder)
+        search.cache = TieredCache(TTLCache())
+        return search
+
+    def test_resolves_stops_in_one_batch(self):
+        """Test that distinct uncached stops go to the backend in one call and are cached"""
+        from app.utils.geocoders import FixtureGeocoder
+
+        geocoder = FixtureGeocoder(PLACES)
+        search = self.make_search(geocoder)
+        search.get_place_details("Goa")
+        geocoder.calls = 0
+
+        stops = search.geocode_many(["Mumbai", "goa", "Pune", "mumbai ", "Atlantis"])
+
+        self.assertEqual(geocoder.calls, 1)
+        self.assertEqual(stops["Mumbai"].lat, 19.07)
+        self.assertEqual(stops["mumbai "], stops["Mumbai"])
+        self.assertEqual(stops["goa"].name, "Goa, India")
+        self.assertIsNone(stops["Atlantis"])
+        # Resolved stops are now cached for single lookups
+        self.assertEqual(search.get_place_details("Pune").lon, 73.85)
+        self.assertEqual(geocoder.calls, 1)
+
+    def test_async_batch_fans_out_concurrently(self):
+        """Test that self-hosted backends resolve a batch with concurrent requests"""
+        from app.utils.geocoders import SelfHostedNominatimGeocoder
+
+        geocoder = SelfHostedNominatimGeocoder("http://geo.internal", max_concurrency=4)
+        in_flight, peak = 0, 0
+
+        async def fake_aget(url, params=None, headers=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            response = MagicMock(status_code=200)
+            response.json.return_value = PLACES[params["q"]]
+            return response
+
+        geocoder.http = MagicMock()
+        geocoder.http.aget.side_effect = fake_aget
+
+        stops = asyncio.run(self.make_search(geocoder).ageocode_many(["Goa", "Mumbai", "Pune"]))
+
+        self.assertEqual(peak, 3)
+        self.assertEqual([stops[name].lat for name in ("Goa", "Mumbai", "Pune")], [15.3, 19.07, 18.52])
+
+if __name__ == '__main__':
+    unittest.main()
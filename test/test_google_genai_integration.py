@@ -148,8 +148,8 @@ class TestGoogleGenAIIntegration(unittest.TestCase):
             graph_builder = GraphBuilder()
             self.assertGreater(len(graph_builder.tools), 0, 
                              "GraphBuilder should load tools")
-            self.assertEqual(len(graph_builder.tools), 17,
-                           "Should load all 17 tools")
+            self.assertEqual(len(graph_builder.tools), 19,
+                           "Should load all 19 tools")
     
     def test_requirements_includes_google_genai(self):
         """Test that requirements.txt includes Google Generative AI package"""
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test cases for the GraphRegistry that shares compiled agent graphs across requests
+"""
+
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class TestGraphRegistry(unittest.TestCase):
+    """Test cases for GraphRegistry class"""
+
+    @patch('app.agent.graph_registry.GraphBuilder')
+    def test_graph_built_once_per_provider(self, mock_builder_cls):
+        """Test that repeated lookups reuse the same compiled graph"""
+        from app.agent.graph_registry import GraphRegistry
+
+        mock_builder_cls.side_effect = lambda model_provider: MagicMock(return_value=f"graph-{model_provider}")
+
+        registry = GraphRegistry(default_provider="google")
+        self.assertEqual(registry.get(), "graph-google")
+        self.assertEqual(registry.get("google"), "graph-google")
+        self.assertEqual(registry.get("groq"), "graph-groq")
+
+        self.assertEqual(mock_builder_cls.call_count, 2)
+        self.assertEqual(sorted(registry.providers()), ["google", "groq"])
+
+    @patch('app.agent.graph_registry.GraphBuilder')
+    def test_concurrent_get_builds_once(self, mock_builder_cls):
+        """Test that concurrent first requests do not build the graph twice"""
+        from app.agent.graph_registry import GraphRegistry
+
+        mock_builder_cls.return_value = MagicMock(return_value="graph")
+        registry = GraphRegistry()
+
+        threads = [threading.Thread(target=registry.get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mock_builder_cls.assert_called_once()
+
+    @patch('app.agent.graph_registry.GraphBuilder')
+    def test_warm_up_skips_failing_provider(self, mock_builder_cls):
+        """Test that warm up logs failures instead of raising"""
+        from app.agent.graph_registry import GraphRegistry
+
+        def build(model_provider):
+            if model_provider == "openai":
+                raise ValueError("OPENAI_API_KEY not found in environment variables")
+            return MagicMock(return_value="graph")
+
+        mock_builder_cls.side_effect = build
+        registry = GraphRegistry()
+
+        self.assertEqual(registry.warm_up(["google", "openai"]), ["google"])
+        self.assertIsNone(registry.peek("openai"))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
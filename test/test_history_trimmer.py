@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test cases for the token-budgeted history trimming stage
+"""
+
+import os
+import sys
+import unittest
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from test_agent_workflow import GraphBuilderTestCase
+
+def tool_turn(question, call_id, output):
+    """One user turn in which the agent called a tool and answered"""
+    return [
+        HumanMessage(content=question),
+        AIMessage(content="", tool_calls=[{"name": "get_comprehensive_travel_info", "args": {"place_name": "Goa"}, "id": call_id}]),
+        ToolMessage(content=output, tool_call_id=call_id),
+        AIMessage(content=f"Answer to {question}"),
+    ]
+
+class TestHistoryTrimmer(unittest.TestCase):
+    """Test cases for HistoryTrimmer"""
+
+    def test_within_budget_untouched(self):
+        """Test that short conversations are passed through as-is"""
+        from app.agent.history_trimmer import HistoryTrimmer
+
+        messages = tool_turn("Goa?", "c1", "small output")
+        trimmed, saved = HistoryTrimmer(max_tokens=10_000).trim(messages)
+
+        self.assertIs(trimmed, messages)
+        self.assertEqual(saved, 0)
+
+    def test_stale_tool_output_elided_recent_kept(self):
+        """Test that earlier tool dumps are cut while the latest exchange stays verbatim"""
+        from app.agent.history_trimmer import HistoryTrimmer
+
+        big_output = "Hotel listing. " * 400
+        messages = tool_turn("Plan Goa", "c1", big_output) + tool_turn("Now hotels", "c2", big_output)
+        trimmer = HistoryTrimmer(max_tokens=2500, tool_output_keep_chars=100)
+        trimmed, saved = trimmer.trim(messages)
+
+        self.assertEqual(len(trimmed), len(messages))
+        self.assertIn("elided", trimmed[2].content)
+        self.assertEqual(trimmed[2].tool_call_id, "c1")
+        self.assertEqual(trimmed[4:], messages[4:])
+        self.assertGreater(saved, 1000)
+        self.assertEqual(trimmer.stats()["tokens_saved"], saved)
+
+    def test_oldest_turns_dropped_whole(self):
+        """Test that over-budget history drops whole turns starting from the oldest"""
+        from app.agent.history_trimmer import HistoryTrimmer
+
+        messages = []
+        for i in range(6):
+            messages += tool_turn(f"Question {i} " + "detail " * 100, f"c{i}", "output")
+        trimmed, _ = HistoryTrimmer(max_tokens=600).trim(messages)
+
+        self.assertIsInstance(trimmed[0], HumanMessage)
+        self.assertEqual(trimmed[-4:], messages[-4:])
+        self.assertLess(len(trimmed), len(messages))
+        # Every tool result still follows the AI message that requested it
+        call_ids = {c["id"] for m in trimmed if isinstance(m, AIMessage) for c in m.tool_calls}
+        self.assertTrue(all(m.tool_call_id in call_ids for m in trimmed if isinstance(m, ToolMessage)))
+
+class TestTrimStageInGraph(GraphBuilderTestCase):
+    """Test cases for history trimming in the compiled graph"""
+
+    def test_agent_receives_trimmed_input(self):
+        """Test that the model sees the trimmed view while state keeps full history"""
+        from test_agent_workflow import ScriptedChatModel
+
+        seen_inputs = []
+
+        class RecordingChatModel(ScriptedChatModel):
+            def _generate(self, messages, *args, **kwargs):
+                seen_inputs.append(messages)
+                return super()._generate(messages, *args, **kwargs)
+
+        builder = self.make_graph_builder([])
+        builder.llm_with_tools = RecordingChatModel(responses=[AIMessage(content="Done")])
+        builder.history_trimmer.max_tokens = 300
+        builder.history_trimmer.tool_output_keep_chars = 50
+
+        history = tool_turn("Plan Goa", "c1", "Beach shack. " * 200)
+        output = builder().invoke({"messages": history + [HumanMessage(content="And Paris?")]})
+
+        self.assertEqual(len(output["messages"]), 6)
+        self.assertGreater(output["tokens_saved"], 0)
+        sent_tool_output = [m for m in seen_inputs[0] if isinstance(m, ToolMessage)]
+        self.assertTrue(all("elided" in m.content for m in sent_tool_output))
+
+    def test_trimmed_view_not_checkpointed(self):
+        """Test that a session checkpoint stores the history once, without a trimmed copy"""
+        from langgraph.checkpoint.memory import InMemorySaver
+        from test_agent_workflow import ScriptedChatModel
+
+        builder = self.make_graph_builder([])
+        builder.llm_with_tools = ScriptedChatModel(responses=[AIMessage(content=f"Answer {i}") for i in range(3)])
+        builder.history_trimmer.max_tokens = 10
+        graph = builder(checkpointer=InMemorySaver())
+        run_config = {"configurable": {"thread_id": "s1"}}
+
+        for question in ["Plan Goa", "And Paris?", "And Tokyo?"]:
+            graph.invoke({"messages": [HumanMessage(content=question)]}, run_config)
+
+        values = graph.get_state(run_config).values
+        self.assertEqual(len(values["messages"]), 6)
+        self.assertEqual(set(values), {"messages", "tokens_saved"})
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test cases for the shared upstream HTTP client
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import patch, MagicMock
+
+import httpx
+import requests
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class TestHttpClient(unittest.TestCase):
+    """Test cases for HttpClient"""
+
+    def make_client(self, **kwargs):
+        from app.utils.http_client import HttpClient
+        return HttpClient(max_retries=2, backoff_base=0.01, backoff_max=0.02, **kwargs)
+
+    @patch("app.utils.http_client.get_rate_limiter", return_value=None)
+    @patch("requests.Session.get")
+    def test_retries_retryable_status(self, mock_get, mock_limiter):
+        """Test that a 503 is retried and the eventual 200 is returned"""
+        mock_get.side_effect = [MagicMock(status_code=503), MagicMock(status_code=200)]
+
+        client = self.make_client()
+        response = client.get("https://api.example.com/data", params={"q": "x"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_get.call_args.kwargs["timeout"], (5.0, 10.0))
+        stats = client.stats()["api.example.com"]
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["retries"], 1)
+        self.assertEqual(stats["errors"], 1)
+
+    @patch("app.utils.http_client.get_rate_limiter", return_value=None)
+    @patch("requests.Session.get")
+    def test_client_errors_are_not_retried(self, mock_get, mock_limiter):
+        """Test that a 404 is returned immediately"""
+        mock_get.return_value = MagicMock(status_code=404)
+
+        response = self.make_client().get("https://api.example.com/missing")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch("app.utils.http_client.get_rate_limiter", return_value=None)
+    @patch("requests.Session.get", side_effect=requests.ConnectionError("down"))
+    def test_raises_after_bounded_retries(self, mock_get, mock_limiter):
+        """Test that connection errors are retried max_retries times and then raised"""
+        with self.assertRaises(requests.ConnectionError):
+            self.make_client().get("https://api.example.com/data")
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch("app.utils.http_client.get_rate_limiter", return_value=None)
+    @patch("requests.Session.get")
+    def test_sessions_pooled_per_host(self, mock_get, mock_limiter):
+        """Test that one Session is reused per host and gzip can be turned off"""
+        mock_get.return_value = MagicMock(status_code=200)
+
+        client = self.make_client(gzip=False)
+        client.get("https://a.example.com/1")
+        client.get("https://a.example.com/2")
+        client.get("https://b.example.com/1")
+
+        self.assertEqual(len(client._sessions), 2)
+        self.assertEqual(mock_get.call_args.kwargs["headers"]["Accept-Encoding"], "identity")
+
+    @patch("app.utils.http_client.get_rate_limiter")
+    def test_async_get_retries_and_waits_on_limiter(self, mock_limiter):
+        """Test the async path retries transport errors and paces through the host limiter"""
+        limiter = MagicMock()
+        limiter.aacquire.side_effect = lambda: asyncio.sleep(0)
+        mock_limiter.return_value = limiter
+        responses = [httpx.ConnectError("down"), httpx.Response(200, json={"ok": True})]
+
+        async def fake_get(url, **kwargs):
+            result = responses.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        fake_client = MagicMock()
+        fake_client.get.side_effect = fake_get
+        with patch("app.utils.http_client.get_async_client", return_value=fake_client):
+            client = self.make_client()
+            response = asyncio.run(client.aget("https://api.example.com/data"))
+
+        self.assertEqual(response.json(), {"ok": True})
+        self.assertEqual(limiter.aacquire.call_count, 2)
+        self.assertEqual(client.stats()["api.example.com"]["retries"], 1)
+
+    def test_host_stats_count_every_thread(self):
+        """Test that concurrent callers do not lose counter updates"""
+        from concurrent.futures import ThreadPoolExecutor
+        from app.utils.http_client import HostStats
+
+        stats = HostStats()
+
+        def hammer(_):
+            for _ in range(2000):
+                stats.record(0.001, error=False)
+                stats.record_retry()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(hammer, range(8)))
+
+        self.assertEqual((stats.stats()["requests"], stats.stats()["retries"]), (16000, 16000))
+
+    @patch("app.utils.http_client.get_rate_limiter", return_value=None)
+    def test_async_client_bounded_by_pool_maxsize(self, mock_limiter):
+        """Test that the per-loop AsyncClient uses the configured pool size"""
+        from app.utils import http_client
+
+        async def scenario():
+            client = self.make_client(pool_maxsize=7)
+            with patch("httpx.AsyncClient.get", return_value=httpx.Response(200)):
+                await client.aget("https://api.example.com/data")
+            async_client = http_client._async_clients[asyncio.get_running_loop()]
+            await http_client.aclose_async_client()
+            return async_client
+
+        async_client = asyncio.run(scenario())
+        self.assertEqual(async_client._transport._pool._max_connections, 7)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test cases for the PlaceInfoSearch travel info fan-out
+"""
+
+import asyncio
+import os
+import sys
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+GOA = [{"display_name": "Goa, India", "lat": "15.3", "lon": "74.1", "address": {"country": "India"}}]
+
+class TestTravelInfoFanOut(unittest.TestCase):
+    """Test cases for get_travel_info and aget_travel_info"""
+
+    def setUp(self):
+        """PlaceInfoSearch with an in-memory cache and a mocked HTTP client"""
+        from app.utils.cache import TieredCache, TTLCache
+        from app.utils.place_info_search import PlaceInfoSearch
+
+        self.search = PlaceInfoSearch(leg_timeout=5)
+        self.search.cache = TieredCache(TTLCache())
+        self.search.geocoder.http = MagicMock()
+
+    def slow_results(self, delays):
+        """Fake _search/_asearch results keyed on the query prefix, with per-category delays"""
+        from app.utils.place_record import PlaceRecord
+
+        def pick(query):
+            for prefix, delay in delays.items():
+                if query.startswith(prefix):
+                    return delay, [PlaceRecord(f"{query} result", 15.3, 74.1)]
+            return 0, [PlaceRecord.from_nominatim(place) for place in GOA]
+        return pick
+
+    def test_geocodes_once(self):
+        """Test that the place is geocoded once and shared with the attractions leg"""
+        mock_response = MagicMock(status_code=200)
+        mock_response.json.return_value = GOA
+        search = self.search
+        search.geocoder.http.get.return_value = mock_response
+        mock_get = search.geocoder.http.get
+
+        info = search.get_travel_info("Goa")
+
+        queries = [call.kwargs["params"]["q"] for call in mock_get.call_args_list]
+        self.assertEqual(queries.count("Goa"), 1)
+        self.assertEqual(len(queries), 4)
+        self.assertEqual(info["place_details"].lat, 15.3)
+        self.assertNotIn("timed_out", info)
+
+    def test_unknown_place_geocoded_once(self):
+        """Test that a place the geocoder cannot find is not geocoded again by every leg"""
+        from app.utils.geocoders import FixtureGeocoder
+        from app.utils.poi_index import POIIndex
+
+        search = self.search
+        search.geocoder = FixtureGeocoder({})
+        search.poi_index = POIIndex.from_records([])
+
+        info = search.get_travel_info("Atlantis")
+        ainfo = asyncio.run(search.aget_travel_info("Lemuria"))
+
+        self.assertEqual(search.geocoder.calls, 2)
+        for result in (info, ainfo):
+            self.assertIsNone(result["place_details"])
+            self.assertEqual((result["attractions"], result["restaurants"], result["hotels"]), ([], [], []))
+
+    def test_legs_run_concurrently_with_partial_results(self):
+        """Test that legs overlap and a slow leg is reported instead of failing the lookup"""
+        search = self.search
+        search.leg_timeout = 0.5
+        pick = self.slow_results({"tourist": 0.2, "restaurant": 0.2, "hotel": 2})
+
+        def fake_search(query, limit):
+            delay, results = pick(query)
+            time.sleep(delay)
+            return results
+
+        search._search = fake_search
+        start = time.monotonic()
+        info = search.get_travel_info("Goa")
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(info["timed_out"], ["hotels"])
+        self.assertEqual(info["hotels"], [])
+        self.assertEqual(len(info["restaurants"]), 1)
+        self.assertEqual(len(info["attractions"]), 1)
+
+    def test_async_legs_run_concurrently_with_partial_results(self):
+        """Test the async fan-out with asyncio timeouts"""
+        search = self.search
+        search.leg_timeout = 0.5
+        pick = self.slow_results({"tourist": 0.2, "restaurant": 2, "hotel": 0.2})
+
+        async def fake_asearch(query, limit):
+            delay, results = pick(query)
+            await asyncio.sleep(delay)
+            return results
+
+        search._asearch = fake_asearch
+        start = time.monotonic()
+        info = asyncio.run(search.aget_travel_info("Goa"))
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(info["timed_out"], ["restaurants"])
+        self.assertEqual(len(info["hotels"]), 1)
+        self.assertEqual(info["place_details"].country, "India")
+
+class TestPlaceRecord(unittest.TestCase):
+    """Test cases for the compact place record"""
+
+    def test_projection_and_cache_round_trip(self):
+        """Test that only the used fields are kept and survive the cache row format"""
+        import json
+        from app.utils.place_record import PlaceRecord
+
+        raw = {"display_name": "Goa, India", "lat": "15.3", "lon": "74.1", "class": "boundary",
+               "type": "administrative", "importance": 0.71, "extratags": {"wikidata": "Q1171"},
+               "address": {"state": "Goa", "country": "India", "road": "MG Road", "postcode": "403001"}}
+
+        record = PlaceRecord.from_nominatim(raw)
+
+        self.assertEqual((record.lat, record.lon), (15.3, 74.1))
+        self.assertEqual(record.category, "boundary")
+        self.assertEqual(record.city, "Unknown")
+        self.assertEqual(record.road, "MG Road")
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertEqual(PlaceRecord.from_row(json.loads(json.dumps(record.to_row()))), record)
+
+if __name__ == '__main__':
+    unittest.main()
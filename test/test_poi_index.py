@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test cases for the offline POI index backend
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def point(name, lat, lon, **tags):
+    return {"type": "Feature", "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {"name": name, **tags}}
+
+# Around Panaji, Goa (15.49, 73.82)
+FEATURES = [
+    point("Fort Aguada", 15.492, 73.773, historic="fort"),
+    point("Goa State Museum", 15.497, 73.829, tourism="museum"),
+    point("Fisherman's Wharf", 15.480, 73.815, amenity="restaurant", **{"addr:street": "Dayanand Bandodkar Marg"}),
+    point("Cafe Bodega", 15.500, 73.830, amenity="cafe"),
+    point("Taj Vivanta", 15.494, 73.826, tourism="hotel"),
+    point("Far Away Hotel", 16.500, 74.500, tourism="hotel"),
+    point("Bus Stop", 15.490, 73.820, highway="bus_stop"),
+    {"type": "Feature", "geometry": {"type": "LineString", "coordinates": [[73.8, 15.4], [73.9, 15.5]]},
+     "properties": {"name": "Road", "tourism": "attraction"}},
+]
+
+def build_index(tmp):
+    from app.utils.poi_index import main
+    source = os.path.join(tmp, "extract.geojson")
+    with open(source, "w") as f:
+        json.dump({"type": "FeatureCollection", "features": FEATURES}, f)
+    output = os.path.join(tmp, "pois.npz")
+    main(["build", source, output])
+    return output
+
+class TestPOIIndex(unittest.TestCase):
+    """Test cases for POIIndex"""
+
+    def test_build_and_radius_query(self):
+        """Test that the build command indexes tagged points and queries filter by category and radius"""
+        from app.utils.poi_index import POIIndex
+
+        with tempfile.TemporaryDirectory() as tmp:
+            index = POIIndex.load(build_index(tmp))
+
+        self.assertEqual(len(index), 6)
+        restaurants = index.query(15.49, 73.82, "restaurant", radius_km=5)
+        self.assertEqual([r.name for r in restaurants], ["Fisherman's Wharf", "Cafe Bodega"])
+        self.assertEqual(restaurants[0].road, "Dayanand Bandodkar Marg")
+        self.assertEqual((restaurants[0].lat, restaurants[0].lon), (15.48, 73.815))
+
+        hotels = index.query(15.49, 73.82, "hotel", radius_km=10)
+        self.assertEqual([h.name for h in hotels], ["Taj Vivanta"])
+
+        attractions = index.query(15.49, 73.82, "attraction", radius_km=10)
+        self.assertEqual({a.type for a in attractions}, {"fort", "museum"})
+        self.assertEqual(index.query(0.0, 0.0, "hotel"), [])
+
+    def test_compact_strings_and_nested_output_dir(self):
+        """Test that strings are packed (not padded to the longest) and build creates the output directory"""
+        from app.utils.poi_index import POIIndex, main
+
+        long_name = "A" * 200
+        records = [{"name": long_name if i == 0 else f"Cafe {i}", "lat": 15.0, "lon": 73.0,
+                    "category": "restaurant", "type": "cafe"} for i in range(1000)]
+        index = POIIndex.from_records(records)
+        self.assertLess(index.names.nbytes, 20000)  # a fixed-width array would need 1000 * 200 * 4 bytes
+
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "extract.geojson")
+            with open(source, "w") as f:
+                json.dump({"type": "FeatureCollection", "features": FEATURES}, f)
+            output = os.path.join(tmp, ".poi", "pois.npz")
+            main(["build", source, output])
+            loaded = POIIndex.load(output)
+
+        self.assertEqual(sorted(loaded.names[i] for i in range(len(loaded)))[0], "Cafe Bodega")
+
+    def test_bad_csv_rows_skipped_and_path_kept(self):
+        """Test that rows with malformed coordinates are skipped and save/load agree on a suffix-less path"""
+        from app.utils.poi_index import POIIndex, main
+
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "extract.csv")
+            with open(source, "w") as f:
+                f.write("name,lat,lon,amenity\n"
+                        "Cafe Bodega,15.500,73.830,cafe\n"
+                        "No Coordinates,,73.830,cafe\n"
+                        "Garbled,north,73.830,cafe\n")
+            output = os.path.join(tmp, "pois")
+            with self.assertLogs("WandAgentLogger", level="WARNING") as logs:
+                main(["build", source, output])
+            loaded = POIIndex.load(output)
+
+        self.assertEqual([loaded.names[i] for i in range(len(loaded))], ["Cafe Bodega"])
+        self.assertIn("Skipped 2 POIs", logs.output[0])
+
+    def test_missing_coordinate_fields_skipped(self):
+        """Test that a CSV without lat/lon columns and a Point without coordinates are skipped, not fatal"""
+        from app.utils.poi_index import read_pois
+
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_source = os.path.join(tmp, "extract.csv")
+            with open(csv_source, "w") as f:
+                f.write("name,latitude,longitude,amenity\nCafe Bodega,15.500,73.830,cafe\n")
+            geojson_source = os.path.join(tmp, "extract.geojson")
+            with open(geojson_source, "w") as f:
+                json.dump({"type": "FeatureCollection", "features": [
+                    {"type": "Feature", "geometry": {"type": "Point"}, "properties": {"name": "Nowhere", "tourism": "hotel"}},
+                    point("Taj Vivanta", 15.494, 73.826, tourism="hotel"),
+                ]}, f)
+            with self.assertLogs("WandAgentLogger", level="WARNING") as logs:
+                csv_rows = list(read_pois(csv_source))
+                geojson_rows = list(read_pois(geojson_source))
+
+        self.assertEqual(csv_rows, [])
+        self.assertEqual([row["name"] for row in geojson_rows], ["Taj Vivanta"])
+        self.assertEqual(len(logs.output), 2)
+        self.assertTrue(all("Skipped 1 POIs" in line for line in logs.output))
+
+    def test_query_wraps_across_antimeridian(self):
+        """Test that a search near 180 degrees finds POIs on the other side of the date line"""
+        from app.utils.poi_index import POIIndex
+
+        index = POIIndex.from_records([
+            {"name": "East", "lat": -16.5, "lon": 179.99, "category": "hotel", "type": "hotel"},
+            {"name": "West", "lat": -16.5, "lon": -179.99, "category": "hotel", "type": "hotel"},
+        ])
+
+        self.assertEqual([h.name for h in index.query(-16.5, 179.98, "hotel", radius_km=10)], ["East", "West"])
+        self.assertEqual([h.name for h in index.query(-16.5, -179.98, "hotel", radius_km=10)], ["West", "East"])
+
+    def test_place_search_uses_index_backend(self):
+        """Test that category searches come from the index around the geocoded place"""
+        from app.utils.cache import TieredCache, TTLCache
+        from app.utils.place_info_search import PlaceInfoSearch
+        from app.utils.poi_index import POIIndex
+
+        with tempfile.TemporaryDirectory() as tmp:
+            index = POIIndex.load(build_index(tmp))
+
+        search = PlaceInfoSearch()
+        search.cache = TieredCache(TTLCache())
+        search.poi_index = index
+        search.poi_radius_km = 10
+        response = MagicMock(status_code=200)
+        response.json.return_value = [{"display_name": "Panaji, Goa", "lat": "15.49", "lon": "73.82"}]
+        search.geocoder.http = MagicMock()
+        search.geocoder.http.get.return_value = response
+
+        info = search.get_travel_info("Panaji")
+
+        # Only the geocode reaches Nominatim
+        self.assertEqual(search.geocoder.http.get.call_count, 1)
+        self.assertEqual(info["hotels"][0].name, "Taj Vivanta")
+        self.assertEqual(len(info["restaurants"]), 2)
+        self.assertEqual(len(info["attractions"]), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test cases for provider-side prompt caching support
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+from langchain_core.messages import AIMessage
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from test_agent_workflow import GraphBuilderTestCase
+
+class TestPromptCacheStats(unittest.TestCase):
+    """Test cases for PromptCacheStats"""
+
+    def test_counts_cached_tokens(self):
+        """Test that cache_read from usage metadata is counted as a hit"""
+        from app.utils.prompt_cache import PromptCacheStats
+
+        stats = PromptCacheStats()
+        stats.record(AIMessage(content="a", usage_metadata={
+            "input_tokens": 1000, "output_tokens": 10, "total_tokens": 1010,
+            "input_token_details": {"cache_read": 800}}))
+        stats.record(AIMessage(content="b", usage_metadata={
+            "input_tokens": 1000, "output_tokens": 10, "total_tokens": 1010}))
+        stats.record(AIMessage(content="c"))
+
+        result = stats.stats()
+        self.assertEqual(result["calls"], 3)
+        self.assertEqual(result["cache_hits"], 1)
+        self.assertEqual(result["cached_tokens"], 800)
+        self.assertEqual(result["cached_token_ratio"], 0.4)
+
+class TestContextCache(unittest.TestCase):
+    """Test cases for the explicit context cache"""
+
+    def test_cache_created_once_until_expiry(self):
+        """Test that the cached LLM is reused until the TTL is close"""
+        from app.utils.prompt_cache import ContextCache
+
+        loader = MagicMock()
+        loader.create_context_cache.return_value = "cachedContents/abc"
+        cache = ContextCache(loader, MagicMock(), "system", [], ttl_seconds=3600)
+
+        first, second = cache.get_llm(), cache.get_llm()
+
+        self.assertIs(first, second)
+        loader.create_context_cache.assert_called_once()
+        loader.load_cached_llm.assert_called_once_with("cachedContents/abc")
+
+    def test_creation_failure_falls_back(self):
+        """Test that a failed cache creation returns None and is not retried immediately"""
+        from app.utils.prompt_cache import ContextCache
+
+        loader = MagicMock()
+        loader.create_context_cache.side_effect = ValueError("Cached content is too small")
+        cache = ContextCache(loader, MagicMock(), "system", [], ttl_seconds=3600)
+
+        self.assertIsNone(cache.get_llm())
+        self.assertIsNone(cache.get_llm())
+        loader.create_context_cache.assert_called_once()
+
+class TestAgentPrefix(GraphBuilderTestCase):
+    """Test cases for how the agent sends the static prefix"""
+
+    def test_cached_llm_receives_only_conversation(self):
+        """Test that the system prompt is omitted when it lives in the context cache"""
+
+        builder = self.make_graph_builder([AIMessage(content="uncached")])
+        cached_llm = MagicMock()
+        cached_llm.invoke.return_value = AIMessage(content="cached")
+        builder.context_cache = MagicMock()
+        builder.context_cache.get_llm.return_value = cached_llm
+
+        output = builder().invoke({"messages": [{"role": "user", "content": "Hi"}]})
+
+        self.assertEqual(output["messages"][-1].content, "cached")
+        sent = cached_llm.invoke.call_args[0][0]
+        self.assertEqual([m.content for m in sent], ["Hi"])
+
+    def test_uncached_input_starts_with_system_prompt(self):
+        """Test that the uncached path always sends the same static prefix first"""
+        from app.prompt_library.prompt import SYSTEM_PROMPT
+
+        builder = self.make_graph_builder([])
+        llm, sent = builder._model_input(["conversation"])
+        self.assertIs(sent[0], SYSTEM_PROMPT)
+        self.assertIs(llm, builder.llm_with_tools)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
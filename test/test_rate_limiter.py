@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test cases for the per-host token-bucket rate limiter
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for TokenBucket"""
+
+    def test_only_waits_when_exhausted(self):
+        """Test that the first call is free and back-to-back calls queue behind each other"""
+        from app.utils.rate_limiter import TokenBucket
+
+        bucket = TokenBucket(rate_per_second=1, burst=1)
+        with patch("app.utils.rate_limiter.time.time", return_value=1000.0):
+            self.assertEqual(bucket.reserve(), 0.0)
+            self.assertAlmostEqual(bucket.reserve(), 1.0)
+            self.assertAlmostEqual(bucket.reserve(), 2.0)
+        # After a long idle period the bucket is full again
+        with patch("app.utils.rate_limiter.time.time", return_value=1100.0):
+            self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.stats()["delayed"], 2)
+
+    def test_try_acquire_never_queues(self):
+        """Test that try_acquire only succeeds while tokens are left and does not drive the balance negative"""
+        from app.utils.rate_limiter import TokenBucket
+
+        bucket = TokenBucket(rate_per_second=1, burst=2)
+        with patch("app.utils.rate_limiter.time.time", return_value=1000.0):
+            self.assertTrue(bucket.try_acquire())
+            self.assertTrue(bucket.try_acquire())
+            self.assertFalse(bucket.try_acquire())
+        with patch("app.utils.rate_limiter.time.time", return_value=1001.0):
+            self.assertTrue(bucket.try_acquire())
+        self.assertEqual(bucket.stats()["acquired"], 3)
+
+    def test_state_file_shared_between_buckets(self):
+        """Test that two buckets on the same state file (e.g. two workers) share one budget"""
+        from app.utils import rate_limiter
+        if rate_limiter.fcntl is None:
+            self.skipTest("fcntl not available")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "host.bucket")
+            first = rate_limiter.TokenBucket(rate_per_second=2, burst=1, state_path=path)
+            second = rate_limiter.TokenBucket(rate_per_second=2, burst=1, state_path=path)
+            with patch("app.utils.rate_limiter.time.time", return_value=1000.0):
+                self.assertEqual(first.reserve(), 0.0)
+                self.assertAlmostEqual(second.reserve(), 0.5)
+
+    def test_async_acquire_waits_for_refill(self):
+        """Test that aacquire waits on the event loop for the reserved time"""
+        import time
+        from app.utils.rate_limiter import TokenBucket
+
+        bucket = TokenBucket(rate_per_second=20, burst=1)
+
+        async def run():
+            return [await bucket.aacquire(), await bucket.aacquire()]
+
+        start = time.monotonic()
+        waits = asyncio.run(run())
+
+        self.assertEqual(waits[0], 0.0)
+        self.assertGreater(waits[1], 0.0)
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test cases for stale-while-revalidate and refresh-ahead of shared caches
+"""
+
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class TestRefresher(unittest.TestCase):
+    """Test cases for Refresher"""
+
+    def make_cache(self, stale_seconds=60, refresh_ahead_seconds=0):
+        from app.utils.cache import TieredCache, TTLCache
+        return TieredCache(TTLCache(ttl_seconds=100, stale_seconds=stale_seconds),
+                           refresh_ahead_seconds=refresh_ahead_seconds)
+
+    def make_loader(self, cache, key, value):
+        """Loader that writes a fresh value and signals when it ran"""
+        done = threading.Event()
+
+        def load():
+            cache.set(key, value)
+            done.set()
+
+        return MagicMock(side_effect=load), done
+
+    def test_stale_entry_served_and_reloaded(self):
+        """Test that a stale entry is returned immediately while a background load replaces it"""
+        from app.utils.refresher import Refresher
+
+        cache = self.make_cache()
+        with patch("app.utils.cache.time.time", return_value=1000.0):
+            cache.set("goa", "old")
+        load, done = self.make_loader(cache, "goa", "new")
+        refresher = Refresher("test")
+
+        with patch("app.utils.cache.time.time", return_value=1120.0), \
+                patch("app.utils.refresher.time.time", return_value=1120.0):
+            self.assertEqual(refresher.lookup(cache, "goa", load), "old")
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(cache.get("goa"), "new")
+        self.assertEqual(refresher.stats()["stale_served"], 1)
+
+    def test_only_hot_keys_refreshed_ahead(self):
+        """Test that keys close to expiry are reloaded early only once they have been read min_hits times"""
+        from app.utils.refresher import Refresher
+
+        cache = self.make_cache(refresh_ahead_seconds=30)
+        with patch("app.utils.cache.time.time", return_value=1000.0):
+            cache.set("goa", "old")
+        load, done = self.make_loader(cache, "goa", "new")
+        refresher = Refresher("test", min_hits=2)
+
+        with patch("app.utils.cache.time.time", return_value=1080.0), \
+                patch("app.utils.refresher.time.time", return_value=1080.0):
+            self.assertEqual(refresher.lookup(cache, "goa", load), "old")
+            load.assert_not_called()
+            self.assertEqual(refresher.lookup(cache, "goa", load), "old")
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(load.call_count, 1)
+
+    def test_over_budget_stale_is_a_miss(self):
+        """Test that without refresh budget stale entries are not served and nothing is scheduled"""
+        from app.utils.rate_limiter import TokenBucket
+        from app.utils.refresher import Refresher
+
+        cache = self.make_cache()
+        with patch("app.utils.cache.time.time", return_value=1000.0):
+            cache.set("goa", "old")
+        load = MagicMock()
+        budget = TokenBucket(rate_per_second=0.001, burst=1)
+        budget.try_acquire()
+        refresher = Refresher("test", budget=budget)
+
+        with patch("app.utils.cache.time.time", return_value=1120.0), \
+                patch("app.utils.refresher.time.time", return_value=1120.0):
+            self.assertIsNone(refresher.lookup(cache, "goa", load))
+
+        load.assert_not_called()
+        self.assertEqual(refresher.stats()["over_budget"], 1)
+
+    def test_budget_shared_across_workers(self):
+        """Test that the refresh budget is a state file under rate_limits.state_dir shared by all workers"""
+        import tempfile
+        from app.utils import rate_limiter, refresher
+
+        if rate_limiter.fcntl is None:
+            self.skipTest("fcntl not available")
+        with tempfile.TemporaryDirectory() as tmp:
+            config = {"cache": {"test_shared": {"refresh_budget_per_minute": 6}}, "rate_limits": {"state_dir": tmp}}
+            with patch("app.utils.refresher.load_config", return_value=config):
+                budget = refresher.get_refresher("test_shared").budget
+            refresher._refreshers.pop("test_shared")
+
+            self.assertEqual(budget.state_path, os.path.join(tmp, "refresh-test_shared.bucket"))
+            # Another worker's bucket on the same file sees the token this one took
+            other_worker = rate_limiter.TokenBucket(0.1, burst=1, state_path=budget.state_path)
+            self.assertTrue(budget.try_acquire())
+            self.assertFalse(other_worker.try_acquire())
+
+    def test_currency_rates_served_from_cache(self):
+        """Test that a base currency's rate table is fetched once and then served from cache"""
+        from app.utils.cache import TieredCache, TTLCache
+        from app.utils.currency_converter import CurrencyConverter
+
+        converter = CurrencyConverter()
+        converter.cache = TieredCache(TTLCache())
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"rates": {"EUR": 0.9, "INR": 83.0}}
+        converter.http = MagicMock()
+        converter.http.get.return_value = response
+
+        self.assertEqual(converter.get_exchange_rate("usd", "EUR"), 0.9)
+        self.assertEqual(converter.get_exchange_rate("USD", "INR"), 83.0)
+        self.assertEqual(converter.http.get.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test cases for server-side conversation sessions
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from test_agent_workflow import GraphBuilderTestCase
+
+class TestSessionStore(unittest.TestCase):
+    """Test cases for SessionStore eviction"""
+
+    def make_store(self, **kwargs):
+        from langgraph.checkpoint.memory import InMemorySaver
+        from app.agent.session_store import SessionStore
+
+        return SessionStore(InMemorySaver(), **kwargs)
+
+    def make_graph(self, checkpointer):
+        from langgraph.graph import StateGraph, MessagesState, START, END
+
+        graph_builder = StateGraph(MessagesState)
+        graph_builder.add_node("agent", lambda state: {"messages": [("assistant", "hello")]})
+        graph_builder.add_edge(START, "agent")
+        graph_builder.add_edge("agent", END)
+        return graph_builder.compile(checkpointer=checkpointer)
+
+    def test_lru_eviction_over_max_sessions(self):
+        """Test that the least recently used session is evicted past max_sessions"""
+        async def scenario():
+            store = self.make_store(max_sessions=2)
+            first, second = store.new_session(), store.new_session()
+            async with store.use(first):
+                pass
+            third = store.new_session()
+            async with store.use(third):
+                pass
+            return store, first, second, third
+
+        store, first, second, third = asyncio.run(scenario())
+        self.assertTrue(asyncio.run(store.exists(first)))
+        self.assertFalse(asyncio.run(store.exists(second)))
+        self.assertTrue(asyncio.run(store.exists(third)))
+        self.assertEqual(store.stats()["evicted"], 1)
+
+    def test_sweep_removes_expired_sessions(self):
+        """Test that sessions idle past the TTL are swept"""
+        async def scenario():
+            store = self.make_store(ttl_seconds=60)
+            session_id = store.new_session()
+            with patch('app.agent.session_store.time.time', return_value=10**10):
+                expired = await store.sweep()
+            return store, session_id, expired
+
+        store, session_id, expired = asyncio.run(scenario())
+        self.assertEqual(expired, [session_id])
+        self.assertEqual(store.stats()["active_sessions"], 0)
+
+    def test_session_visible_to_other_worker(self):
+        """Test that a store sharing the checkpointer recognises sessions it never served"""
+        from langgraph.checkpoint.memory import InMemorySaver
+        from app.agent.session_store import SessionStore
+
+        async def scenario():
+            checkpointer = InMemorySaver()
+            graph = self.make_graph(checkpointer)
+
+            worker_a, worker_b = SessionStore(checkpointer), SessionStore(checkpointer)
+            session_id = worker_a.new_session()
+            async with worker_a.use(session_id) as run_config:
+                await graph.ainvoke({"messages": [("user", "hi")]}, config=run_config)
+            return await worker_b.exists(session_id), await worker_b.exists("never-created")
+
+        self.assertEqual(asyncio.run(scenario()), (True, False))
+
+    def test_session_deletable_from_other_worker(self):
+        """Test that a worker that never served a session can still delete it"""
+        from langgraph.checkpoint.memory import InMemorySaver
+        from app.agent.session_store import SessionStore
+
+        async def scenario():
+            checkpointer = InMemorySaver()
+            graph = self.make_graph(checkpointer)
+            worker_a, worker_b = SessionStore(checkpointer), SessionStore(checkpointer)
+            session_id = worker_a.new_session()
+            async with worker_a.use(session_id) as run_config:
+                await graph.ainvoke({"messages": [("user", "hi")]}, config=run_config)
+            deleted = await worker_b.delete(session_id), await worker_b.delete("never-created")
+            return deleted, await checkpointer.aget_tuple(worker_b.config(session_id))
+
+        deleted, checkpoint_tuple = asyncio.run(scenario())
+        self.assertEqual(deleted, (True, False))
+        self.assertIsNone(checkpoint_tuple)
+
+    def test_overflow_keeps_session_active_on_other_worker(self):
+        """Test that LRU eviction re-checks the shared checkpointer before deleting a session"""
+        from langgraph.checkpoint.memory import InMemorySaver
+        from app.agent.session_store import SessionStore
+
+        async def scenario():
+            checkpointer = InMemorySaver()
+            graph = self.make_graph(checkpointer)
+            worker_a, worker_b = SessionStore(checkpointer, max_sessions=2), SessionStore(checkpointer)
+            shared = worker_a.new_session()
+            async with worker_a.use(shared) as run_config:
+                await graph.ainvoke({"messages": [("user", "hi")]}, config=run_config)
+            others = [worker_a.new_session(), worker_a.new_session()]
+            async with worker_b.use(shared) as run_config:
+                await graph.ainvoke({"messages": [("user", "still here")]}, config=run_config)
+            async with worker_a.use(others[1]):
+                pass
+            checkpoint_tuple = await checkpointer.aget_tuple(worker_b.config(shared))
+            return worker_a, shared, others, checkpoint_tuple
+
+        worker_a, shared, others, checkpoint_tuple = asyncio.run(scenario())
+        self.assertIsNotNone(checkpoint_tuple)
+        self.assertEqual(list(worker_a._last_used), [shared, others[1]])
+        self.assertEqual(worker_a.stats()["evicted"], 1)
+
+    def test_load_existing_orders_by_checkpoint_time(self):
+        """Test that threads left by a previous process keep their real last activity"""
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        from app.agent.session_store import SessionStore
+
+        async def scenario():
+            async with AsyncSqliteSaver.from_conn_string(":memory:") as checkpointer:
+                graph = self.make_graph(checkpointer)
+                for thread_id in ["oldest", "middle", "newest"]:
+                    await graph.ainvoke({"messages": [("user", "hi")]}, config={"configurable": {"thread_id": thread_id}})
+                store = SessionStore(checkpointer, max_sessions=2)
+                await store.load_existing()
+                remaining = await checkpointer.aget_tuple({"configurable": {"thread_id": "oldest"}})
+                return store, remaining, await store._last_checkpoint_time("newest")
+
+        store, remaining, newest_time = asyncio.run(scenario())
+        self.assertEqual(list(store._last_used), ["middle", "newest"])
+        self.assertEqual(store._last_used["newest"], newest_time)
+        self.assertIsNone(remaining)
+
+class TestSessionEndpoints(GraphBuilderTestCase):
+    """Test cases for /session/query using the in-memory checkpointer"""
+
+    def test_session_keeps_history_server_side(self):
+        """Test that a follow-up turn sees the earlier turn without the client resending it"""
+        from fastapi.testclient import TestClient
+        from langchain_core.messages import AIMessage
+        from app import main
+        from test_agent_workflow import ScriptedChatModel
+
+        seen_inputs = []
+
+        class RecordingChatModel(ScriptedChatModel):
+            def _generate(self, messages, *args, **kwargs):
+                seen_inputs.append([message.content for message in messages])
+                return super()._generate(messages, *args, **kwargs)
+
+        llm = RecordingChatModel(responses=[AIMessage(content="Goa is lovely"), AIMessage(content="4 days is ideal")])
+        builder = self.make_graph_builder([])
+        builder.llm_with_tools = llm
+
+        with patch.dict(main.config, {"sessions": {"backend": "memory"}}), \
+             patch.object(main.graph_registry, "warm_up", return_value=[]), \
+             patch.object(main.graph_registry, "get_builder", return_value=builder):
+            with TestClient(main.app) as client:
+                first = client.post("/session/query", json={"message": "Trip to Goa?"}).json()
+                second = client.post("/session/query", json={"message": "How long?", "session_id": first["session_id"]}).json()
+                missing = client.post("/session/query", json={"message": "Hi", "session_id": "unknown"})
+                deleted = client.delete(f"/session/{first['session_id']}")
+
+        self.assertEqual(first["answer"], "Goa is lovely")
+        self.assertEqual(second, {"answer": "4 days is ideal", "session_id": first["session_id"]})
+        # Second model call saw the first turn restored from the checkpointer (after the system prompt)
+        self.assertEqual(seen_inputs[1][1:], ["Trip to Goa?", "Goa is lovely", "How long?"])
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(deleted.status_code, 200)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
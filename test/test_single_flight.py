@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test cases for single-flight coalescing of upstream lookups
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for SingleFlight"""
+
+    def test_concurrent_sync_calls_share_one_execution(self):
+        """Test that threads asking for the same key wait for the leader's result"""
+        from app.utils.single_flight import SingleFlight
+
+        flight = SingleFlight()
+        started = threading.Event()
+        executions = []
+
+        def fetch():
+            executions.append(1)
+            started.set()
+            time.sleep(0.2)
+            return {"rates": {"INR": 83.0}}
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            leader = pool.submit(flight.do, "USD", fetch)
+            started.wait()
+            followers = [pool.submit(flight.do, "USD", fetch) for _ in range(4)]
+            results = [leader.result()] + [f.result() for f in followers]
+
+        self.assertEqual(len(executions), 1)
+        self.assertTrue(all(r == {"rates": {"INR": 83.0}} for r in results))
+        self.assertEqual(flight.stats()["coalesced"], 4)
+        self.assertEqual(flight.stats()["in_flight"], 0)
+
+    def test_sync_error_shared_and_not_remembered(self):
+        """Test that followers see the leader's exception and the next call runs again"""
+        from app.utils.single_flight import SingleFlight
+
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do("k", MagicMock(side_effect=ValueError("boom")))
+        self.assertEqual(flight.do("k", lambda: 42), 42)
+        self.assertEqual(flight.stats()["executions"], 2)
+
+    def test_concurrent_async_calls_share_one_execution(self):
+        """Test that coroutines asking for the same key await one upstream call"""
+        from app.utils.single_flight import SingleFlight
+
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch(place):
+            calls.append(place)
+            await asyncio.sleep(0.05)
+            return {"name": place}
+
+        async def run():
+            same = [flight.ado("goa", fetch, "Goa") for _ in range(10)]
+            other = flight.ado("paris", fetch, "Paris")
+            return await asyncio.gather(*same, other)
+
+        results = asyncio.run(run())
+
+        self.assertEqual(sorted(calls), ["Goa", "Paris"])
+        self.assertEqual(results[0], {"name": "Goa"})
+        self.assertEqual(results[-1], {"name": "Paris"})
+        self.assertEqual(flight.stats()["coalesced"], 9)
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        """Test that a leader hitting its timeout stops waiting while a follower still gets the result"""
+        from app.utils.single_flight import SingleFlight
+
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch(place):
+            calls.append(place)
+            await asyncio.sleep(0.1)
+            return {"name": place}
+
+        async def run():
+            leader = asyncio.ensure_future(asyncio.wait_for(flight.ado("goa", fetch, "Goa"), timeout=0.02))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.ado("goa", fetch, "Goa"))
+            with self.assertRaises(asyncio.TimeoutError):
+                await leader
+            return await follower
+
+        self.assertEqual(asyncio.run(run()), {"name": "Goa"})
+        self.assertEqual(calls, ["Goa"])
+        self.assertEqual(flight.stats()["in_flight"], 0)
+
+    def test_weather_lookups_coalesced(self):
+        """Test that concurrent identical weather lookups reach the upstream once"""
+        from app.utils.cache import TieredCache, TTLCache
+        from app.utils.single_flight import SingleFlight
+        from app.utils.weather_info import WeatherForecastTool
+
+        weather = WeatherForecastTool(api_key="test")
+        weather.flights = SingleFlight()
+        weather.cache = TieredCache(TTLCache())
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"name": "Goa"}
+
+        async def slow_get(url, params=None):
+            await asyncio.sleep(0.05)
+            return response
+
+        weather.http = MagicMock()
+        weather.http.aget.side_effect = slow_get
+
+        async def run():
+            return await asyncio.gather(*(weather.aget_current_weather(p) for p in ("Goa", "goa ", "GOA")))
+
+        results = asyncio.run(run())
+
+        self.assertEqual(weather.http.aget.call_count, 1)
+        self.assertEqual([r["name"] for r in results], ["Goa"] * 3)
+
+if __name__ == '__main__':
+    unittest.main()
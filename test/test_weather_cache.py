@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Test cases for the time-bucketed weather cache
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class WeatherTestCase(unittest.TestCase):
+    """Builds a WeatherForecastTool with a private in-memory cache and a mocked HTTP client"""
+
+    def setUp(self):
+        from app.utils.cache import TieredCache, TTLCache
+        from app.utils.weather_info import WeatherForecastTool
+
+        self.weather = WeatherForecastTool(api_key="test")
+        self.weather.cache = TieredCache(TTLCache())
+        self.weather.endpoint_ttls = {"weather": 600, "forecast": 10800}
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"name": "Goa", "list": []}
+        self.weather.http = MagicMock()
+        self.weather.http.get.return_value = response
+
+    def make_place_search(self, geocoder):
+        from app.utils.cache import TieredCache, TTLCache
+        from app.utils.place_info_search import PlaceInfoSearch
+
+        place_search = PlaceInfoSearch(geocoder=geocoder)
+        place_search.cache = TieredCache(TTLCache())
+        return place_search
+
+class TestWeatherCache(WeatherTestCase):
+    """Test cases for WeatherForecastTool caching"""
+
+    def test_same_bucket_served_from_cache(self):
+        """Test that repeat lookups within a bucket do not call OpenWeather"""
+        weather = self.weather
+        with patch("app.utils.weather_info.time.time", return_value=6000.0):
+            weather.get_current_weather("Goa")
+        with patch("app.utils.weather_info.time.time", return_value=6599.0):
+            result = weather.get_current_weather(" goa")
+
+        self.assertEqual(result["name"], "Goa")
+        self.assertEqual(weather.http.get.call_count, 1)
+        self.assertEqual(weather.cache.stats()["memory"]["hits"], 1)
+
+    def test_next_bucket_and_endpoint_ttls(self):
+        """Test that current weather refreshes every bucket while the forecast bucket is longer"""
+        weather = self.weather
+        with patch("app.utils.weather_info.time.time", return_value=10800.0):
+            weather.get_current_weather("Goa")
+            weather.get_forecast_weather("Goa")
+        with patch("app.utils.weather_info.time.time", return_value=11400.0):
+            weather.get_current_weather("Goa")
+            weather.get_forecast_weather("Goa")
+
+        endpoints = [call.args[0].rsplit("/", 1)[1] for call in weather.http.get.call_args_list]
+        self.assertEqual(endpoints, ["weather", "forecast", "weather"])
+
+    def test_entries_expire_at_bucket_end(self):
+        """Test that the cache entry expires when the bucket ends rather than a full TTL later"""
+        weather = self.weather
+        with patch("app.utils.weather_info.time.time", return_value=6500.0):
+            weather.get_current_weather("Goa")
+
+        expires_at, _ = next(iter(weather.cache.memory._entries.values()))
+        self.assertEqual(expires_at, 6600.0)
+
+    def test_errors_not_cached(self):
+        """Test that a failed upstream call is retried on the next lookup"""
+        weather = self.weather
+        weather.http.get.return_value = MagicMock(status_code=500)
+
+        self.assertEqual(weather.get_current_weather("Goa"), {})
+        weather.get_current_weather("Goa")
+        self.assertEqual(weather.http.get.call_count, 2)
+
+class TestCoordinateWeather(WeatherTestCase):
+    """Test cases for coordinate-based lookups that reuse the place search geocodes"""
+
+    def test_names_resolved_through_place_search(self):
+        """Test that already geocoded names become lat/lon and aliases share one weather cache entry"""
+        from app.utils.geocoders import FixtureGeocoder
+
+        goa = [{"display_name": "Goa, India", "lat": "15.3", "lon": "74.1"}]
+        geocoder = FixtureGeocoder({"Goa": goa, "Goa, India": goa})
+        place_search = self.make_place_search(geocoder)
+        weather = self.weather
+        weather.place_search = place_search
+        # The place tools geocode the destination first
+        place_search.get_place_details("Goa")
+        place_search.get_place_details("Goa, India")
+
+        weather.get_current_weather("Goa")
+        weather.get_current_weather("Goa, India")
+        weather.get_current_weather("goa")
+
+        params = weather.http.get.call_args.kwargs["params"]
+        self.assertEqual((params["lat"], params["lon"]), (15.3, 74.1))
+        self.assertNotIn("q", params)
+        self.assertEqual(weather.http.get.call_count, 1)
+        self.assertEqual(geocoder.calls, 2)  # weather lookups never reach the geocoder
+
+    def test_uncached_name_does_not_wait_for_geocoder(self):
+        """Test that a name missing from the geocode cache goes straight to OpenWeather's q= lookup"""
+        from app.utils.geocoders import FixtureGeocoder
+
+        geocoder = FixtureGeocoder({"Goa": [{"display_name": "Goa, India", "lat": "15.3", "lon": "74.1"}]})
+        weather = self.weather
+        weather.place_search = self.make_place_search(geocoder)
+
+        weather.get_current_weather("Goa")
+
+        self.assertEqual(weather.http.get.call_args.kwargs["params"]["q"], "Goa")
+        self.assertEqual(geocoder.calls, 0)
+
+    def test_explicit_coordinates_and_name_fallback(self):
+        """Test that coordinates can be passed directly and unknown names fall back to q="""
+        from app.utils.geocoders import FixtureGeocoder
+
+        weather = self.weather
+        weather.place_search = self.make_place_search(FixtureGeocoder({}))
+
+        weather.get_forecast_weather(lat=48.8566, lon=2.3522)
+        self.assertEqual(weather.http.get.call_args.kwargs["params"]["lat"], 48.8566)
+
+        weather.get_forecast_weather("Atlantis")
+        self.assertEqual(weather.http.get.call_args.kwargs["params"]["q"], "Atlantis")
+
+class TestMultiCityWeather(WeatherTestCase):
+    """Test cases for batch weather lookups"""
+
+    def make_batch_weather(self):
+        from app.utils.geocoders import FixtureGeocoder
+
+        geocoder = FixtureGeocoder({
+            "Goa": [{"display_name": "Goa, India", "lat": "15.3", "lon": "74.1"}],
+            "Pune": [{"display_name": "Pune, India", "lat": "18.5", "lon": "73.9"}],
+        })
+        place_search = self.make_place_search(geocoder)
+        place_search.geocode_many(["Goa", "Pune"])  # geocoded earlier by the place tools
+        self.weather.place_search = place_search
+        return self.weather, geocoder
+
+    def test_batch_current_and_forecast_in_input_order(self):
+        """Test that every location gets current weather and a forecast, using cached geocodes, in input order"""
+        weather, geocoder = self.make_batch_weather()
+
+        results = weather.get_weather_many(["Pune", "Goa", "12.97,77.59", "Pune"], days=2)
+
+        self.assertEqual(list(results), ["Pune", "Goa", "12.97,77.59"])
+        self.assertEqual(set(results["Goa"]), {"current", "daily"})
+        self.assertEqual(geocoder.calls, 1)  # only the warm-up batch
+        endpoints = sorted(call.args[0].rsplit("/", 1)[1] for call in weather.http.get.call_args_list)
+        self.assertEqual(endpoints, ["forecast"] * 3 + ["weather"] * 3)
+        locations = {(call.kwargs["params"].get("lat"), call.kwargs["params"].get("lon"))
+                     for call in weather.http.get.call_args_list}
+        self.assertEqual(locations, {(18.5, 73.9), (15.3, 74.1), (12.97, 77.59)})
+
+    def test_async_batch_uses_cache(self):
+        """Test that the async batch shares the weather cache with single lookups and can skip forecasts"""
+        import asyncio
+        weather, _ = self.make_batch_weather()
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"main": {"temp": 30}}
+        weather.http.aget = MagicMock(side_effect=lambda *args, **kwargs: asyncio.sleep(0, result=response))
+
+        weather.get_current_weather("Goa")
+        results = asyncio.run(weather.aget_weather_many(["Goa", "Pune"], days=0))
+
+        self.assertEqual(list(results), ["Goa", "Pune"])
+        self.assertEqual(results["Goa"]["daily"], [])
+        self.assertEqual(weather.http.get.call_count, 1)
+        self.assertEqual(weather.http.aget.call_count, 1)
+
+    def test_tool_formats_one_table(self):
+        """Test that the multi-city tool returns current conditions and a row per city and day"""
+        from app.tools.weather_info_tool import WeatherInfoTool
+
+        daily = [{"date": "2024-01-01", "temp_min": 20.0, "temp_max": 30.0, "temp_mean": 25.0,
+                  "precipitation_probability": 10, "precipitation_mm": 0.0, "condition": "clear sky"}]
+        current = {"main": {"temp": 28.5}, "weather": [{"description": "haze"}]}
+        tool = WeatherInfoTool.__new__(WeatherInfoTool)
+        lines = tool._format_multi_city({"Goa": {"current": current, "daily": daily},
+                                         "Atlantis": {"current": {}, "daily": []}}, days=1).splitlines()
+
+        self.assertEqual(lines[0], "Weather for 2 cities")
+        self.assertIn("Goa | 28.5 | haze", lines)
+        self.assertIn("Atlantis | Could not fetch weather", lines)
+        self.assertIn("Goa | 2024-01-01 | 20.0-30.0 | 25.0 | 10% | clear sky", lines)
+        self.assertIn("Atlantis | Could not fetch forecast", lines)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,8 @@
 import os
 from dotenv import load_dotenv
 from app.agent.agentic_workflow import GraphBuilder
-from langgraph.studio import visualize
+from app.utils.config_loader import load_config
+from app.utils.graph_image_cache import GraphImageCache
 
 # Load environment variables from .env if present
 load_dotenv()
@@ -9,8 +10,15 @@ load_dotenv()
 def main():
     # You can change the provider if needed ("groq" or "openai")
     graph = GraphBuilder(model_provider=os.getenv("MODEL_PROVIDER", "groq"))()
-    print("Launching LangGraph Studio for visualization...")
-    visualize(graph)
+
+    # Shares the on-disk render cache with the API's /graph endpoint
+    cache_dir = load_config().get("graph_image", {}).get("cache_dir")
+    topology_key, png_graph = GraphImageCache(cache_dir=cache_dir).get_png(graph)
+
+    output_path = os.getenv("GRAPH_OUTPUT", "my_graph.png")
+    with open(output_path, "wb") as f:
+        f.write(png_graph)
+    print(f"Graph {topology_key[:12]} saved as '{output_path}'")
 
 if __name__ == "__main__":
     main()